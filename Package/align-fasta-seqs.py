@@ -12,6 +12,11 @@
 '''
 This program aligns a FASTA sequence file using the MAFFT aligner and plots the
 alignment using pyMSAviz. Besides, it generates and plots the phylogenetic tree.
+The FASTA sequence file can also be a container file with a FASTA entry per sequence
+identification; then the alignments and trees are saved in container files, and
+their plots are drawn when they are viewed. A list of FASTA sequence files or the
+entries of a container file are aligned by a pool of processes, and a failed or
+interrupted run can be restarted aligning only the files or entries not aligned yet.
 
 WARNING: The MAFFT software must be installed and accessible.
 
@@ -29,10 +34,13 @@ Licence: GNU General Public Licence Version 3.
 #-------------------------------------------------------------------------------
 
 import argparse
+import concurrent.futures
+import contextlib
 import os
 import shutil
 import subprocess
 import sys
+import tempfile
 
 from Bio import Phylo
 
@@ -46,6 +54,11 @@ matplotlib.use('Agg')
 
 #-------------------------------------------------------------------------------
 
+# data of every process of the pool that aligns FASTA sequence files
+alignment_process_dict = {}
+
+#-------------------------------------------------------------------------------
+
 def main():
     '''
     Main line of the program.
@@ -60,7 +73,12 @@ def main():
     check_args(args)
 
     # align the FASTA sequence file and plot the alignment
-    align_fasta_seqs(args.fasta_seq_file, args.tree_generation)
+    if args.fasta_seq_list_file is not None:
+        align_fasta_seq_list(args.fasta_seq_list_file, args.tree_generation, args.threads)
+    elif args.container == 'Y':
+        align_fasta_seqs_container(args.fasta_seq_file, args.tree_generation, args.threads)
+    else:
+        align_fasta_seqs(args.fasta_seq_file, args.tree_generation)
 
 #-------------------------------------------------------------------------------
 
@@ -76,8 +94,11 @@ def build_parser():
     usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
     parser = argparse.ArgumentParser(usage=usage)
     parser._optionals.title = 'Arguments'    #pylint: disable=protected-access
-    parser.add_argument('--seqs', dest='fasta_seq_file', help='Path of the FASTA sequence file (mandatory).')
+    parser.add_argument('--seqs', dest='fasta_seq_file', help='Path of the FASTA sequence file (mandatory when --seqs-list is not indicated).')
+    parser.add_argument('--seqs-list', dest='fasta_seq_list_file', help='Path of a file with the paths of several FASTA sequence files, one per line (mandatory when --seqs is not indicated).')
+    parser.add_argument('--container', dest='container', help=f'The FASTA sequence file is a container file written by get-protein-fasta-files.py: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_CONTAINER}.')
     parser.add_argument('--tree', dest='tree_generation', help=f'Generation and plot of the the guide tree: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_TREE_GENERATION}.')
+    parser.add_argument('--threads', dest='threads', help=f'Number of processes that align the FASTA sequence files of --seqs-list or the entries of a container file; default: {genlib.Const.DEFAULT_THREADS}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {genlib.get_verbose_code_list_text()}; default: {genlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {genlib.get_trace_code_list_text()}; default: {genlib.Const.DEFAULT_TRACE}.')
 
@@ -94,13 +115,33 @@ def check_args(args):
     # initialize the control variable
     OK = True
 
-    # check "fasta_seq_file"
-    if args.fasta_seq_file is None:
-        genlib.Message.print('error', '*** The FASTA sequence file is not indicated in the input arguments.')
+    # check "fasta_seq_file" and "fasta_seq_list_file"
+    if args.fasta_seq_file is None and args.fasta_seq_list_file is None:
+        genlib.Message.print('error', '*** The FASTA sequence file or the FASTA sequence file list is not indicated in the input arguments.')
         OK = False
-    elif not os.path.isfile(args.fasta_seq_file):
+    elif args.fasta_seq_file is not None and args.fasta_seq_list_file is not None:
+        genlib.Message.print('error', '*** The FASTA sequence file and the FASTA sequence file list can not be indicated together.')
+        OK = False
+    elif args.fasta_seq_file is not None and not os.path.isfile(args.fasta_seq_file):
         genlib.Message.print('error', f'*** The file {args.fasta_seq_file} does not exist.')
         OK = False
+    elif args.fasta_seq_list_file is not None and not os.path.isfile(args.fasta_seq_list_file):
+        genlib.Message.print('error', f'*** The file {args.fasta_seq_list_file} does not exist.')
+        OK = False
+
+    # check "container"
+    if args.container is None:
+        args.container = genlib.Const.DEFAULT_CONTAINER
+    elif not genlib.check_code(args.container, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** container has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+    args.container = args.container.upper()
+    if OK and args.container == 'Y' and args.fasta_seq_file is None:
+        genlib.Message.print('error', '*** container can be Y only when the FASTA sequence file is indicated.')
+        OK = False
+    elif OK and args.container == 'Y' and not genlib.is_container_file(args.fasta_seq_file):
+        genlib.Message.print('error', f'*** The file {args.fasta_seq_file} is not a container file.')
+        OK = False
 
     # check "tree_generation"
     if args.tree_generation is None:
@@ -111,6 +152,15 @@ def check_args(args):
     if args.tree_generation.upper() == 'Y':
         genlib.Message.set_verbose_status(True)
 
+    # check "threads"
+    if args.threads is None:
+        args.threads = genlib.Const.DEFAULT_THREADS
+    elif not genlib.check_int(args.threads, minimum=1):
+        genlib.Message.print('error', '*** The threads number has to be an integer number greater than or equal to 1.')
+        OK = False
+    else:
+        args.threads = int(args.threads)
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = genlib.Const.DEFAULT_VERBOSE
@@ -136,10 +186,11 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def align_fasta_seqs(fasta_seq_file, tree_generation):
+def align_fasta_seqs(fasta_seq_file, tree_generation, plot_generation='Y'):
     '''
     Align a FASTA sequence file using the MAFFT aligner and plots the alignment using pyMSAviz.
-    Besides, generate and plot the phylogenetic tree.
+    Besides, generate and plot the phylogenetic tree. The plots are not drawn when "plot_generation"
+    is N.
     '''
 
     # get the sequence number in the FASTA sequence file
@@ -163,14 +214,10 @@ def align_fasta_seqs(fasta_seq_file, tree_generation):
         genlib.Message.print('info', 'The copy is done.')
 
     # plot the sequence alignment using pyMSAviz
-    alignment_plot_file = f'{fasta_seq_file}.aln.pdf'
-    try:
+    if plot_generation == 'Y':
         genlib.Message.print('info', 'Plotting the alignment ...')
-        alignment_plot = MsaViz(alignment_file, format='fasta', wrap_length=80, sort=False, color_scheme='Flower', show_count=True, show_consensus=False)
-        alignment_plot.savefig(alignment_plot_file)
+        plot_alignment(alignment_file, f'{fasta_seq_file}.aln.pdf')
         genlib.Message.print('info', 'Plot is done.')
-    except Exception as e:
-        raise genlib.ProgramException(e, 'M001', 'pymsaviz', e)
 
     # when the guide tree must be generated
     if tree_generation  == 'Y':
@@ -187,11 +234,234 @@ def align_fasta_seqs(fasta_seq_file, tree_generation):
                 raise genlib.ProgramException('', 'M001', 'mafft', result.stderr)
 
             # plot the guide tree
-            tree = Phylo.read(f'{fasta_seq_file}.tree', 'newick')
-            Phylo.draw(tree, do_show=False)
-            tree_plot_file = f'{fasta_seq_file}.tree.pdf'
-            plt.savefig(tree_plot_file)
-            plt.close()
+            if plot_generation == 'Y':
+                plot_tree(f'{fasta_seq_file}.tree', f'{fasta_seq_file}.tree.pdf')
+
+#-------------------------------------------------------------------------------
+
+def align_fasta_seq_list(fasta_seq_list_file, tree_generation, threads):
+    '''
+    Align the FASTA sequence files whose paths are in a list file (one per line) and plot their
+    alignments and guide trees using a pool of "threads" processes. The paths of the files aligned
+    are appended to the file "<fasta_seq_list_file>.done", so when the run is restarted, only
+    the files not aligned yet (including the failed ones) are aligned.
+    '''
+
+    # get the FASTA sequence file list
+    try:
+        with open(fasta_seq_list_file, mode='r', encoding='iso-8859-1') as fasta_seq_list_file_id:
+            fasta_seq_file_list = [record.strip() for record in fasta_seq_list_file_id if record.strip() != '']
+    except Exception as e:
+        raise genlib.ProgramException(e, 'F001', fasta_seq_list_file) from e
+
+    # get the FASTA sequence files aligned in a previous run
+    done_file = f'{fasta_seq_list_file}.done'
+    done_file_set = set()
+    if os.path.isfile(done_file):
+        with open(done_file, mode='r', encoding='iso-8859-1') as done_file_id:
+            done_file_set = {record.strip() for record in done_file_id}
+
+    # get the FASTA sequence files to align
+    pending_file_list = [fasta_seq_file for fasta_seq_file in fasta_seq_file_list if fasta_seq_file not in done_file_set]
+    genlib.Message.print('info', f'{len(fasta_seq_file_list)} FASTA sequence files are listed; {len(fasta_seq_file_list) - len(pending_file_list)} of them were aligned in a previous run.')
+
+    # initialize the list of failed files
+    failed_file_list = []
+
+    # open the file of the FASTA sequence files aligned
+    try:
+        done_file_id = open(done_file, mode='a', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise genlib.ProgramException(e, 'F003', done_file) from e
+
+    # create the pool of processes and submit the alignment of each FASTA sequence file
+    with concurrent.futures.ProcessPoolExecutor(max_workers=threads, initializer=initialize_alignment_process) as executor:
+        future_dict = {executor.submit(align_fasta_seqs_process, fasta_seq_file, tree_generation): fasta_seq_file for fasta_seq_file in pending_file_list}
+
+        # record every FASTA sequence file as it is aligned
+        for (counter, future) in enumerate(concurrent.futures.as_completed(future_dict), start=1):
+            error_text = future.result()
+            if error_text is None:
+                done_file_id.write(f'{future_dict[future]}\n')
+                done_file_id.flush()
+            else:
+                failed_file_list.append(future_dict[future])
+                genlib.Message.print('error', f'*** The file {future_dict[future]} is not aligned: {error_text}')
+            print_alignment_progress(counter, len(pending_file_list), len(failed_file_list))
+
+    # close the file of the FASTA sequence files aligned
+    done_file_id.close()
+
+    # check the failed files
+    if failed_file_list:
+        raise genlib.ProgramException('', 'M001', 'mafft', f'{len(failed_file_list)} FASTA sequence files are not aligned. Run again the program to align them')
+    genlib.Message.print('info', f'The {len(fasta_seq_file_list)} FASTA sequence files are aligned.')
+
+#-------------------------------------------------------------------------------
+
+def align_fasta_seqs_container(container_file, tree_generation, threads):
+    '''
+    Align each FASTA entry of a container file using the MAFFT aligner with a pool of "threads"
+    processes and save the alignments and the guide trees in the container files "<container_file>.aln"
+    and "<container_file>.tree" (the latter only when "tree_generation" is Y; the plots are drawn
+    when they are viewed). The entries already aligned in a previous run are not aligned again.
+    '''
+
+    # open the FASTA container file and the alignment and tree container files
+    # (the tree of an entry is written before its alignment, so an entry is aligned when it is in the alignment container)
+    with genlib.IndexedContainer(container_file) as fasta_container, \
+         genlib.ContainerWriter(f'{container_file}.aln', append=True) as alignment_container, \
+         (genlib.ContainerWriter(f'{container_file}.tree', append=True) if tree_generation == 'Y' else contextlib.nullcontext()) as tree_container, \
+         tempfile.TemporaryDirectory() as temp_dir:
+
+        # get the entries to align
+        pending_entry_id_list = [entry_id for entry_id in fasta_container.keys() if entry_id not in alignment_container]
+        genlib.Message.print('info', f'{len(fasta_container)} entries are in {container_file}; {len(fasta_container) - len(pending_entry_id_list)} of them were aligned in a previous run.')
+
+        # initialize the failed entry counter
+        failed_entry_counter = 0
+
+        # create the pool of processes and submit the alignment of each entry
+        with concurrent.futures.ProcessPoolExecutor(max_workers=threads, initializer=initialize_alignment_process) as executor:
+            future_list = [executor.submit(align_container_entry_process, container_file, entry_id, tree_generation, temp_dir) for entry_id in pending_entry_id_list]
+
+            # save the alignment and the guide tree of every entry as it is aligned
+            for (counter, future) in enumerate(concurrent.futures.as_completed(future_list), start=1):
+                (entry_id, alignment_text, tree_text, error_text) = future.result()
+                if error_text is None:
+                    if tree_container is not None and tree_text is not None:
+                        tree_container.write_entry(entry_id, tree_text)
+                    alignment_container.write_entry(entry_id, alignment_text)
+                else:
+                    failed_entry_counter += 1
+                    genlib.Message.print('error', f'*** The entry {entry_id} of {container_file} is not aligned: {error_text}')
+                print_alignment_progress(counter, len(pending_entry_id_list), failed_entry_counter)
+
+    # check the failed entries
+    if failed_entry_counter > 0:
+        raise genlib.ProgramException('', 'M001', 'mafft', f'{failed_entry_counter} entries of {container_file} are not aligned. Run again the program to align them')
+    genlib.Message.print('info', f'The {len(pending_entry_id_list)} pending entries of {container_file} are aligned.')
+
+#-------------------------------------------------------------------------------
+
+def initialize_alignment_process():
+    '''
+    Initialize a process of the pool that aligns FASTA sequence files.
+    '''
+
+    # the messages of every alignment are not printed, the progress is printed by the main process
+    genlib.Message.set_verbose_status(False)
+    sys.stdout = open(os.devnull, mode='w', encoding='utf-8')    # pylint: disable=consider-using-with
+
+#-------------------------------------------------------------------------------
+
+def align_fasta_seqs_process(fasta_seq_file, tree_generation):
+    '''
+    Align a FASTA sequence file and plot the alignment and the guide tree in a process of the pool.
+    Return None when the alignment is done or the error text otherwise.
+    '''
+
+    try:
+        align_fasta_seqs(fasta_seq_file, tree_generation)
+    except (Exception, SystemExit) as e:
+        return get_error_text(e)
+
+    return None
+
+#-------------------------------------------------------------------------------
+
+def align_container_entry_process(container_file, entry_id, tree_generation, temp_dir):
+    '''
+    Align an entry of a FASTA container file in a process of the pool.
+    Return the entry identification, the alignment text, the guide tree text (None when it is
+    not generated) and the error text (None when the alignment is done).
+    '''
+
+    # set the temporal FASTA sequence file of the entry and its alignment and tree files
+    fasta_seq_file = f'{temp_dir}{os.sep}{entry_id}-{os.path.basename(container_file)}'
+    alignment_file = f'{fasta_seq_file}.aln'
+    tree_file = f'{fasta_seq_file}.tree'
+
+    # align the entry (the FASTA container file is opened once per process)
+    try:
+        if container_file not in alignment_process_dict:
+            alignment_process_dict[container_file] = genlib.IndexedContainer(container_file)
+        alignment_process_dict[container_file].extract(entry_id, fasta_seq_file)
+        align_fasta_seqs(fasta_seq_file, tree_generation, plot_generation='N')
+        alignment_text = read_text_file(alignment_file)
+        tree_text = read_text_file(tree_file) if os.path.isfile(tree_file) else None
+        error_text = None
+    except (Exception, SystemExit) as e:
+        (alignment_text, tree_text, error_text) = (None, None, get_error_text(e))
+
+    # remove the temporal files
+    for file_path in [fasta_seq_file, alignment_file, tree_file]:
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+    return (entry_id, alignment_text, tree_text, error_text)
+
+#-------------------------------------------------------------------------------
+
+def get_error_text(e):
+    '''
+    Get the text of an error raised aligning a FASTA sequence file.
+    '''
+
+    if isinstance(e, subprocess.CalledProcessError):
+        return f'mafft returned error {e.returncode}: {(e.stderr or "").strip()}'
+    if isinstance(e, (genlib.ProgramException, SystemExit)):
+        return 'see the previous error messages'
+
+    return str(e)
+
+#-------------------------------------------------------------------------------
+
+def print_alignment_progress(counter, total, failed_counter):
+    '''
+    Print the progress of the alignments every 1% of them and at the end.
+    '''
+
+    if counter == total or counter % max(1, total // 100) == 0:
+        genlib.Message.print('info', f'Processed alignments: {counter} of {total} ({failed_counter} failed)')
+
+#-------------------------------------------------------------------------------
+
+def plot_alignment(alignment_file, alignment_plot_file):
+    '''
+    Plot a sequence alignment using pyMSAviz.
+    '''
+
+    try:
+        alignment_plot = MsaViz(alignment_file, format='fasta', wrap_length=80, sort=False, color_scheme='Flower', show_count=True, show_consensus=False)
+        alignment_plot.savefig(alignment_plot_file)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'M001', 'pymsaviz', e)
+
+#-------------------------------------------------------------------------------
+
+def plot_tree(tree_file, tree_plot_file):
+    '''
+    Plot a guide tree in Newick format.
+    '''
+
+    tree = Phylo.read(tree_file, 'newick')
+    Phylo.draw(tree, do_show=False)
+    plt.savefig(tree_plot_file)
+    plt.close()
+
+#-------------------------------------------------------------------------------
+
+def read_text_file(file_path):
+    '''
+    Read the whole text of a file.
+    '''
+
+    try:
+        with open(file_path, mode='r', encoding='iso-8859-1') as file_id:
+            return file_id.read()
+    except Exception as e:
+        raise genlib.ProgramException(e, 'F001', file_path) from e
 
 #-------------------------------------------------------------------------------
 
@@ -54,6 +54,7 @@ from PyQt5.QtWidgets import QWidget              # pylint: disable=no-name-in-mo
 
 import dialogs
 import genlib
+import sqllib
 
 #-------------------------------------------------------------------------------
 
@@ -995,9 +996,8 @@ class FormRunAnnotationPipeline(QWidget):
         complete_functional_annotation_file = f'./{genlib.get_complete_functional_annotation_file_name()}'
         besthit_functional_annotation_file = f'./{genlib.get_besthit_functional_annotation_file_name()}'
 
-        # set the annotation file head
-        # -- head = '1i qseqid;sseqid;pident;length;mismatch;gapopen;qstart;qend;sstart;send;evalue;bitscore;algorithm;protein_description;protein_species;tair10_ortholog_seq_id;tair10_description;qlobata_gene_id;interpro_goterms;panther_goterms;metacyc_pathways;reactome_pathways;eggnog_ortholog_seq_id;eggnog_ortholog_species;eggnog_ogs;cog_category;eggnog_description;eggnog_goterms;ec;kegg_kos;kegg_pathways;kegg_modules;kegg_reactions;kegg_rclasses;brite;kegg_tc;cazy;pfams'
-        head = '1i qseqid;sseqid;pident;length;mismatch;gapopen;qstart;qend;sstart;send;evalue;bitscore;algorithm;protein_description;protein_species;tair10_ortholog_seq_id;tair10_description;qlobata_gene_id;interpro_goterms;panther_goterms;metacyc_pathways;eggnog_ortholog_seq_id;eggnog_ortholog_species;eggnog_ogs;cog_category;eggnog_description;eggnog_goterms;ec;kegg_kos;kegg_pathways;kegg_modules;kegg_reactions;kegg_rclasses;brite;kegg_tc;cazy;pfams'
+        # set the database with the annotation results
+        annotation_results_db = f'./{genlib.get_annotation_results_db_name()}'
 
         # set the script path
         script_path = f'{directory}/{script_name}'
@@ -1357,6 +1357,8 @@ class FormRunAnnotationPipeline(QWidget):
                 file_id.write(f'                --transcripts_geneid={transcripts_geneid_file} \\\n')
                 file_id.write(f'                --complete_annotations={complete_functional_annotation_file} \\\n')
                 file_id.write(f'                --besthit_annotations={besthit_functional_annotation_file} \\\n')
+                file_id.write(f'                --annotations-db={annotation_results_db} \\\n')
+                file_id.write(f'                --threads={threads} \\\n')
                 file_id.write( '                --verbose=N \\\n')
                 file_id.write( '                --trace=N\n')
                 file_id.write( '        RC=$?\n')
@@ -1367,60 +1369,6 @@ class FormRunAnnotationPipeline(QWidget):
                 file_id.write( '    fi\n')
                 file_id.write( '}\n')
                 file_id.write( '#-------------------------------------------------------------------------------\n')
-                file_id.write('function sort_functional_annotations\n')
-                file_id.write( '{\n')
-                file_id.write( '    echo "$SEP"\n')
-                file_id.write( '    echo "Sorting functional annotations files ..."\n')
-                file_id.write(f'    cd {current_run_dir}\n')
-                file_id.write( '    STEP_STATUS=$STATUS_DIR/sort-annotations.ok\n')
-                file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
-                file_id.write( '        echo "This step was previously run."\n')
-                file_id.write( '    else\n')
-                file_id.write( '        /usr/bin/time \\\n')
-                file_id.write( '            sort \\\n')
-                file_id.write(f'                --output={complete_functional_annotation_file} \\\n')
-                file_id.write(f'                {complete_functional_annotation_file}\n')
-                file_id.write( '        RC=$?\n')
-                file_id.write( '        if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
-                file_id.write( '        /usr/bin/time \\\n')
-                file_id.write( '            sort \\\n')
-                file_id.write(f'                --output={besthit_functional_annotation_file} \\\n')
-                file_id.write(f'                {besthit_functional_annotation_file}\n')
-                file_id.write( '        RC=$?\n')
-                file_id.write( '        if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
-                file_id.write( '        echo "Files are sorted."\n')
-                file_id.write( '        touch $STEP_STATUS\n')
-                file_id.write( '    fi\n')
-                file_id.write( '}\n')
-                file_id.write( '#-------------------------------------------------------------------------------\n')
-                file_id.write('function add_heads\n')
-                file_id.write( '{\n')
-                file_id.write( '    echo "$SEP"\n')
-                file_id.write( '    echo "Adding head to annotations files ..."\n')
-                file_id.write(f'    cd {current_run_dir}\n')
-                file_id.write( '    STEP_STATUS=$STATUS_DIR/add-head.ok\n')
-                file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
-                file_id.write( '        echo "This step was previously run."\n')
-                file_id.write( '    else\n')
-                file_id.write( '        /usr/bin/time \\\n')
-                file_id.write( '            sed \\\n')
-                file_id.write( '                --in-place \\\n')
-                file_id.write(f'                "{head}" \\\n')
-                file_id.write(f'                {complete_functional_annotation_file}\n')
-                file_id.write( '        RC=$?\n')
-                file_id.write( '        if [ $RC -ne 0 ]; then manage_error sed $RC; fi\n')
-                file_id.write( '        /usr/bin/time \\\n')
-                file_id.write( '            sed \\\n')
-                file_id.write( '                --in-place \\\n')
-                file_id.write(f'                "{head}" \\\n')
-                file_id.write(f'                {besthit_functional_annotation_file}\n')
-                file_id.write( '        RC=$?\n')
-                file_id.write( '        if [ $RC -ne 0 ]; then manage_error sed $RC; fi\n')
-                file_id.write( '        echo "Heads are added."\n')
-                file_id.write( '        touch $STEP_STATUS\n')
-                file_id.write( '    fi\n')
-                file_id.write( '}\n')
-                file_id.write( '#-------------------------------------------------------------------------------\n')
                 file_id.write('function calculate_functional_annotation_stats\n')
                 file_id.write( '{\n')
                 file_id.write( '    echo "$SEP"\n')
@@ -1435,6 +1383,7 @@ class FormRunAnnotationPipeline(QWidget):
                 file_id.write(f'            {app_dir}/calculate-functional-annotation-stats.py \\\n')
                 file_id.write(f'                --db={functional_annotations_db_path} \\\n')
                 file_id.write(f'                --annotations={complete_functional_annotation_file} \\\n')
+                file_id.write(f'                --annotations-db={annotation_results_db} \\\n')
                 file_id.write(f'                --outdir={current_run_dir} \\\n')
                 file_id.write( '                --verbose=N \\\n')
                 file_id.write( '                --trace=N\n')
@@ -1459,6 +1408,7 @@ class FormRunAnnotationPipeline(QWidget):
                 file_id.write( '        /usr/bin/time \\\n')
                 file_id.write(f'            {app_dir}/build-external-inputs.py \\\n')
                 file_id.write(f'                --annotations={complete_functional_annotation_file} \\\n')
+                file_id.write(f'                --annotations-db={annotation_results_db} \\\n')
                 file_id.write(f'                --outdir={current_run_dir} \\\n')
                 file_id.write( '                --verbose=N \\\n')
                 file_id.write( '                --trace=N\n')
@@ -1513,8 +1463,6 @@ class FormRunAnnotationPipeline(QWidget):
                 file_id.write( 'align_transcriptome_2_qlobata_genes\n')
                 file_id.write( 'get_transcripts_geneid\n')
                 file_id.write( 'concat_functional_annotations\n')
-                file_id.write( 'sort_functional_annotations\n')
-                file_id.write( 'add_heads\n')
                 file_id.write( 'calculate_functional_annotation_stats\n')
                 file_id.write( 'build_external_inputs\n')
                 file_id.write( 'end\n')
@@ -3108,26 +3056,46 @@ class FormBrowseAnnotationResults(QWidget):
         # initialize the functional annotation dictionary
         functional_annotation_dict = {}
 
-        # open the functional annotation file
-        if functional_annotation_file.endswith('.gz'):
-            try:
-                functional_annotation_file_id = gzip.open(functional_annotation_file, mode='rt', encoding='iso-8859-1', newline='\n')
-            except Exception as e:
-                raise genlib.ProgramException(e, 'F002', functional_annotation_file)
-        else:
-            try:
-                functional_annotation_file_id = open(functional_annotation_file, mode='r', encoding='iso-8859-1', newline='\n')
-            except Exception as e:
-                raise genlib.ProgramException(e, 'F001', functional_annotation_file)
+        # build the data list
+        # -- data_list = ['qseqid', 'sseqid', 'pident', 'length', 'mismatch', 'gapopen', 'qstart', 'qend', 'sstart', 'send', 'evalue', 'bitscore', 'algorithm', 'protein_description', 'protein_species', 'tair10_ortholog_seq_id', 'tair10_description', ' 'qlobata_gene_id', 'interpro_goterms', 'panther_goterms', 'metacyc_pathways', 'reactome_pathways', 'eggnog_ortholog_seq_id', 'eggnog_ortholog_species', 'eggnog_ogs', 'cog_category', 'eggnog_description', 'eggnog_goterms', 'ec', 'kegg_kos', 'kegg_pathways', 'kegg_modules', 'kegg_reactions', 'kegg_rclasses', 'brite', 'kegg_tc', 'cazy', 'pfams']
+        data_list = ['qseqid', 'sseqid', 'pident', 'evalue', 'algorithm', 'protein_description', 'protein_species', 'tair10_ortholog_seq_id', 'tair10_description', 'qlobata_gene_id', 'interpro_goterms', 'panther_goterms', 'metacyc_pathways', 'eggnog_ortholog_seq_id', 'eggnog_ortholog_species', 'eggnog_ogs', 'cog_category', 'eggnog_description', 'eggnog_goterms', 'ec', 'kegg_kos', 'kegg_pathways', 'kegg_modules', 'kegg_reactions', 'kegg_rclasses', 'brite', 'kegg_tc', 'cazy', 'pfams']
+
+        # initialize the functional annotation file identification and the iterator of hit data dictionaries
+        functional_annotation_file_id = None
+        hit_data_dict_iterator = None
+
+        # get the hits with the columns shown from the annotation results database of the run when the file is loaded in it
+        annotation_results_db = f'{os.path.dirname(functional_annotation_file)}{os.sep}{genlib.get_annotation_results_db_name()}'
+        if os.path.isfile(annotation_results_db):
+            (annotation_results_conn, dataset) = sqllib.connect_annotation_results_db(annotation_results_db, functional_annotation_file)
+            if dataset != '':
+                hit_data_dict_iterator = sqllib.get_annotation_hit_data_dicts(annotation_results_conn, dataset, data_list)
+
+        # otherwise, open the functional annotation file
+        if hit_data_dict_iterator is None:
+            if functional_annotation_file.endswith('.gz'):
+                try:
+                    functional_annotation_file_id = gzip.open(functional_annotation_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                except Exception as e:
+                    raise genlib.ProgramException(e, 'F002', functional_annotation_file)
+            else:
+                try:
+                    functional_annotation_file_id = open(functional_annotation_file, mode='r', encoding='iso-8859-1', newline='\n')
+                except Exception as e:
+                    raise genlib.ProgramException(e, 'F001', functional_annotation_file)
 
         # initialize the annotation counter
         annotation_counter = 0
 
         # read the first record of the functional annotation file (header)
-        (record, key, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, annotation_counter)
+        if functional_annotation_file_id is not None:
+            (record, key, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, annotation_counter)
 
         # read the secord record of the functional annotation file (first data record)
-        (record, key, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, annotation_counter)
+        if hit_data_dict_iterator is not None:
+            (record, key, data_dict) = sqllib.read_annotation_hit_record(hit_data_dict_iterator)
+        else:
+            (record, key, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, annotation_counter)
         genlib.Message.print('trace', f'key: {key} - record: {record}')
 
         # while there are records
@@ -3184,11 +3152,16 @@ class FormBrowseAnnotationResults(QWidget):
             functional_annotation_dict[key] = {'qseqid': qseqid, 'sseqid': sseqid, 'pident': pident, 'evalue': evalue, 'algorithm': algorithm, 'protein_description': protein_description, 'protein_species': protein_species, 'tair10_ortholog_seq_id': tair10_ortholog_seq_id, 'tair10_description': tair10_description, 'qlobata_gene_id': qlobata_gene_id, 'interpro_goterms': interpro_goterms, 'panther_goterms': panther_goterms, 'metacyc_pathways': metacyc_pathways, 'eggnog_ortholog_seq_id': eggnog_ortholog_seq_id, 'eggnog_ortholog_species': eggnog_ortholog_species, 'eggnog_ogs': eggnog_ogs, 'cog_category': cog_category, 'eggnog_description': eggnog_description, 'eggnog_goterms': eggnog_goterms, 'ec': ec, 'kegg_kos': kegg_kos, 'kegg_pathways': kegg_pathways, 'kegg_modules': kegg_modules, 'kegg_reactions': kegg_reactions, 'kegg_rclasses': kegg_rclasses, 'brite': brite, 'kegg_tc': kegg_tc, 'cazy': cazy, 'pfams': pfams}
 
             # read the next record
-            (record, key, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, annotation_counter)
+            if hit_data_dict_iterator is not None:
+                (record, key, data_dict) = sqllib.read_annotation_hit_record(hit_data_dict_iterator)
+            else:
+                (record, key, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, annotation_counter)
 
-        # build the data list
-        # -- data_list = ['qseqid', 'sseqid', 'pident', 'length', 'mismatch', 'gapopen', 'qstart', 'qend', 'sstart', 'send', 'evalue', 'bitscore', 'algorithm', 'protein_description', 'protein_species', 'tair10_ortholog_seq_id', 'tair10_description', ' 'qlobata_gene_id', 'interpro_goterms', 'panther_goterms', 'metacyc_pathways', 'reactome_pathways', 'eggnog_ortholog_seq_id', 'eggnog_ortholog_species', 'eggnog_ogs', 'cog_category', 'eggnog_description', 'eggnog_goterms', 'ec', 'kegg_kos', 'kegg_pathways', 'kegg_modules', 'kegg_reactions', 'kegg_rclasses', 'brite', 'kegg_tc', 'cazy', 'pfams']
-        data_list = ['qseqid', 'sseqid', 'pident', 'evalue', 'algorithm', 'protein_description', 'protein_species', 'tair10_ortholog_seq_id', 'tair10_description', 'qlobata_gene_id', 'interpro_goterms', 'panther_goterms', 'metacyc_pathways', 'eggnog_ortholog_seq_id', 'eggnog_ortholog_species', 'eggnog_ogs', 'cog_category', 'eggnog_description', 'eggnog_goterms', 'ec', 'kegg_kos', 'kegg_pathways', 'kegg_modules', 'kegg_reactions', 'kegg_rclasses', 'brite', 'kegg_tc', 'cazy', 'pfams']
+        # close the functional annotation file or the connection to the annotation results database
+        if functional_annotation_file_id is not None:
+            functional_annotation_file_id.close()
+        else:
+            annotation_results_conn.close()
 
         # build the data dictionary
         data_dict = {}
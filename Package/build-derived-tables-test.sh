@@ -0,0 +1,56 @@
+#!/bin/bash
+
+#-------------------------------------------------------------------------------
+
+# This script executes a test of the program build-derived-tables.py
+# in a Linux environment.
+#
+# This software has been developed by:
+#
+#    GI en Desarrollo de Especies y Comunidades Leñosas (WooSp)
+#    Dpto. Sistemas y Recursos Naturales
+#    ETSI Montes, Forestal y del Medio Natural
+#    Universidad Politecnica de Madrid
+#    https://github.com/ggfhf/
+#
+# Licence: GNU General Public Licence Version 3.
+
+#-------------------------------------------------------------------------------
+
+# Control parameters
+
+if [ -n "$*" ]; then echo 'This script does not have parameters'; exit 1; fi
+
+#-------------------------------------------------------------------------------
+
+# Set run environment
+
+APP_DIR=$QUERCUSTOA
+DATA_DIR=$APP_DIR/data
+OUTPUT_DIR=$APP_DIR/output
+
+if [ ! -d "$OUTPUT_DIR" ]; then mkdir --parents $OUTPUT_DIR; fi
+
+INITIAL_DIR=$(pwd)
+cd $APP_DIR
+
+#-------------------------------------------------------------------------------
+
+# Run the program build-derived-tables.py
+
+/usr/bin/time \
+    ./build-derived-tables.py \
+        --db=$DATA_DIR/functional-annotations.db \
+        --verbose=Y  \
+        --trace=N
+if [ $? -ne 0 ]; then echo 'Script ended with errors.'; exit 1; fi
+
+#-------------------------------------------------------------------------------
+
+# End
+
+cd $INITIAL_DIR
+
+exit 0
+
+#-------------------------------------------------------------------------------
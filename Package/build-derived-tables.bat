@@ -0,0 +1,58 @@
+@echo off
+
+rem ----------------------------------------------------------------------------
+
+rem This script runs the program build-derived-tables.py in a Windows environment.
+rem
+rem This software has been developed by:
+rem
+rem     GI en Desarrollo de Especies y Comunidades Leñosas (WooSp)
+rem     Dpto. Sistemas y Recursos Naturales
+rem     ETSI Montes, Forestal y del Medio Natural
+rem     Universidad Politecnica de Madrid
+rem     https://github.com/ggfhf/
+rem
+rem Licence: GNU General Public Licence Version 3.
+
+rem ----------------------------------------------------------------------------
+
+rem Set run environment
+
+setlocal EnableDelayedExpansion
+
+set ERROR=0
+
+set PYTHON=python.exe
+set PYTHON_OPTIONS=
+set ARGV=
+set PYTHONPATH=.
+
+set APP_DIR=C:\Users\FMM\Documents\ProyectosVS\quercusTOA\quercusTOA
+
+set INITIAL_DIR=%cd%
+cd %APP_DIR%
+
+rem ----------------------------------------------------------------------------
+
+rem Execute the program build-derived-tables.py
+
+%PYTHON% %PYTHON_OPTIONS% build-derived-tables.py %* %ARGV%
+if %ERRORLEVEL% neq 0 (set RC=%ERRORLEVEL% & set ERROR=1 & goto END)
+
+rem ----------------------------------------------------------------------------
+
+:END
+
+cd %INITIAL_DIR%
+
+if %ERROR% equ 0 (
+    rem -- exit 0
+)
+
+if %ERROR% equ 1 (
+    echo *** ERROR: The program ended with return code %RC%.
+    rem -- pause
+    rem -- exit %RC%
+)
+
+rem ----------------------------------------------------------------------------
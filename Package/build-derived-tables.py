@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# pylint: disable=broad-except
+# pylint: disable=invalid-name
+# pylint: disable=line-too-long
+# pylint: disable=multiple-statements
+# pylint: disable=too-many-lines
+# pylint: disable=unnecessary-pass
+
+#-------------------------------------------------------------------------------
+
+'''
+This program builds the tables derived from the functional annotations database of quercusTOA
+(Quercus Taxonomy-oriented Annotation). Their data never change for a given database, so they
+are built only once after the database is downloaded.
+
+This software has been developed by:
+
+    GI en Desarrollo de Especies y Comunidades Leñosas (WooSp)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+import genlib
+import sqllib
+
+#-------------------------------------------------------------------------------
+
+def main():
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    genlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # enable the SQL instrumentation
+    if args.profile_sql.upper() == 'Y':
+        sqllib.enable_sql_profiling(os.path.basename(__file__))
+
+    # connect to the functional annotations database
+    conn = sqllib.connect_database(args.functional_annotations_database)
+
+    # build the derived tables
+    build_derived_tables(conn)
+
+    # close connection to the functional annotations database
+    conn.close()
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program builds the tables derived from the functional annotations database.'
+    text = f'{genlib.get_app_short_name()} v{genlib.get_app_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'    #pylint: disable=protected-access
+    parser.add_argument('--db', dest='functional_annotations_database', help='Path of the functional annotations database (mandatory).')
+    parser.add_argument('--profile-sql', dest='profile_sql', help=f'Record the calls, latencies and rows of the database accesses, print a summary at exit and save it as JSON in the current directory: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_PROFILE_SQL} (Y when the environment variable {genlib.get_sql_profile_env_var()} is Y).')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {genlib.get_verbose_code_list_text()}; default: {genlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {genlib.get_trace_code_list_text()}; default: {genlib.Const.DEFAULT_TRACE}.')
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "functional_annotations_database"
+    if args.functional_annotations_database is None:
+        genlib.Message.print('error', '*** The functional annotations database is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.functional_annotations_database):
+        genlib.Message.print('error', f'*** The file {args.functional_annotations_database} does not exist.')
+        OK = False
+
+    # check "profile_sql"
+    if args.profile_sql is None:
+        args.profile_sql = genlib.get_sql_profile_default()
+    elif not genlib.check_code(args.profile_sql, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** profile_sql has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = genlib.Const.DEFAULT_VERBOSE
+    elif not genlib.check_code(args.verbose, genlib.get_verbose_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** verbose has to be {genlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        genlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = genlib.Const.DEFAULT_TRACE
+    elif not genlib.check_code(args.trace, genlib.get_trace_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** trace has to be {genlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        genlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise genlib.ProgramException('', 'P001')
+
+#-------------------------------------------------------------------------------
+
+def build_derived_tables(conn):
+    '''
+    Build the tables derived from the functional annotations database.
+    '''
+
+    # build the table "cluster_annotation_summary"
+    genlib.Message.print('info', 'Building the table "cluster_annotation_summary" ...')
+    row_count = sqllib.build_cluster_annotation_summary(conn)
+    genlib.Message.print('info', f'The table "cluster_annotation_summary" is built with {row_count} rows.')
+
+    # build the tables "cluster_species_names" and "cluster_species"
+    genlib.Message.print('info', 'Building the tables "cluster_species_names" and "cluster_species" ...')
+    row_count = sqllib.build_cluster_species(conn)
+    genlib.Message.print('info', f'The table "cluster_species" is built with {row_count} rows.')
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main()
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
@@ -31,6 +31,7 @@ import os
 import sys
 
 import genlib
+import sqllib
 
 #-------------------------------------------------------------------------------
 
@@ -47,8 +48,15 @@ def main():
     args = parser.parse_args()
     check_args(args)
 
+    # enable the SQL instrumentation
+    if args.profile_sql.upper() == 'Y':
+        sqllib.enable_sql_profiling(os.path.basename(__file__))
+
+    # connect to the annotation results database and get the dataset where the annotation file is loaded
+    (annotation_results_conn, dataset) = sqllib.connect_annotation_results_db(args.annotation_results_db, args.annotation_file)
+
     # calculate functional statistics
-    build_external_inputs(args.annotation_file, args.output_dir)
+    build_external_inputs(args.annotation_file, annotation_results_conn, dataset, args.output_dir)
 
 #-------------------------------------------------------------------------------
 
@@ -64,7 +72,9 @@ def build_parser():
     parser = argparse.ArgumentParser(usage=usage)
     parser._optionals.title = 'Arguments'    #pylint: disable=protected-access
     parser.add_argument('--annotations', dest='annotation_file', help='Path of annotation file in CSV format (mandatory).')
+    parser.add_argument('--annotations-db', dest='annotation_results_db', help='Path of the annotation results database where the annotation file is loaded (optional; the annotation file is read when it is not indicated or the file is not loaded).')
     parser.add_argument('--outdir', dest='output_dir', help='Path of the directory to save input files to external applications (mandatory).')
+    parser.add_argument('--profile-sql', dest='profile_sql', help=f'Record the calls, latencies and rows of the database accesses, print a summary at exit and save it as JSON in the current directory: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_PROFILE_SQL} (Y when the environment variable {genlib.get_sql_profile_env_var()} is Y).')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {genlib.get_verbose_code_list_text()}; default: {genlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {genlib.get_trace_code_list_text()}; default: {genlib.Const.DEFAULT_TRACE}.')
 
@@ -89,11 +99,23 @@ def check_args(args):
         genlib.Message.print('error', f'*** The file {args.annotation_file} does not exist.')
         OK = False
 
+    # check "annotation_results_db"
+    if args.annotation_results_db is not None and not os.path.isfile(args.annotation_results_db):
+        genlib.Message.print('error', f'*** The file {args.annotation_results_db} does not exist.')
+        OK = False
+
     # check "output_dir"
     if args.output_dir is None:
         genlib.Message.print('error', '*** The directory to save input files to external applications is not indicated in the input arguments.')
         OK = False
 
+    # check "profile_sql"
+    if args.profile_sql is None:
+        args.profile_sql = genlib.get_sql_profile_default()
+    elif not genlib.check_code(args.profile_sql, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** profile_sql has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = genlib.Const.DEFAULT_VERBOSE
@@ -118,11 +140,34 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def build_external_inputs(annotation_file, output_dir):
+def build_external_inputs(annotation_file, annotation_results_conn, dataset, output_dir):
     '''
     Build files to input in external applications such as agriGO or REVIGO.
     '''
 
+    # get the dictionaries from the annotation results database when the annotation file is loaded in it
+    if dataset != '':
+        agrigo_input_dict = sqllib.get_annotation_seq_term_dict(annotation_results_conn, dataset, 'annotation_goterms')
+        (revigo_input_dict, _) = sqllib.get_annotation_term_seqnum_dict(annotation_results_conn, dataset, 'annotation_goterms')
+    else:
+        (agrigo_input_dict, revigo_input_dict) = build_external_input_dicts(annotation_file)
+
+    # write input file to agriGO
+    write_agrigo_input_file(agrigo_input_dict, output_dir)
+
+    # write input file to REVIGO
+    write_revigo_input_file(revigo_input_dict, output_dir)
+
+    # show OK message
+    genlib.Message.print('info', f'The input files to external applications are save in {output_dir}.')
+
+#-------------------------------------------------------------------------------
+
+def build_external_input_dicts(annotation_file):
+    '''
+    Build the dictionaries of the input files to external applications from the annotation file.
+    '''
+
     # initialize dictionaries
     agrigo_input_dict = {}
     revigo_input_dict = {}
@@ -142,15 +187,14 @@ def build_external_inputs(annotation_file, output_dir):
     # initialize the annotation counter
     annotation_counter = 0
 
-    # read the first record of the annotation file (header)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
+    # create the reader of the annotation file that decodes only the columns used
+    annotation_reader = genlib.read_functional_annotation_records(annotation_file, annotation_file_id, column_list=['qseqid', 'interpro_goterms', 'panther_goterms', 'eggnog_goterms'])
 
-    # read the secord record of the annotation file (first data record)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-    genlib.Message.print('trace', f'key: {key} - record: {record}')
+    # read the first data record of the annotation file
+    data_dict = next(annotation_reader, None)
 
     # while there are records
-    while record != '':
+    while data_dict is not None:
 
         # initialize the old sequence identification
         old_seq_id = data_dict['qseqid']
@@ -161,7 +205,7 @@ def build_external_inputs(annotation_file, output_dir):
         eggnog_goterm_id_list = []
 
         # while there are records and the same sequence identification
-        while record != '' and data_dict['qseqid'] == old_seq_id:
+        while data_dict is not None and data_dict['qseqid'] == old_seq_id:
 
             # add 1 to the annotation counter
             annotation_counter += 1
@@ -178,8 +222,7 @@ def build_external_inputs(annotation_file, output_dir):
             genlib.Message.print('verbose', f'\rProcessed annotations: {annotation_counter}')
 
             # read the next record of the annotation file
-            (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-            genlib.Message.print('trace', f'key: {key} - record: {record}')
+            data_dict = next(annotation_reader, None)
 
         # get the list with unique GO term identifications
         goterm_id_set = set(interpro_goterm_id_list + panther_goterm_id_list + eggnog_goterm_id_list)
@@ -205,14 +248,8 @@ def build_external_inputs(annotation_file, output_dir):
     # close annotation file
     annotation_file_id.close()
 
-    # write input file to agriGO
-    write_agrigo_input_file(agrigo_input_dict, output_dir)
-
-    # write input file to REVIGO
-    write_revigo_input_file(revigo_input_dict, output_dir)
-
-    # show OK message
-    genlib.Message.print('info', f'The input files to external applications are save in {output_dir}.')
+    # return the dictionaries
+    return agrigo_input_dict, revigo_input_dict
 
 #-------------------------------------------------------------------------------
 
@@ -52,20 +52,71 @@ def main():
     args = parser.parse_args()
     check_args(args)
 
+    # enable the SQL instrumentation
+    if args.profile_sql.upper() == 'Y':
+        sqllib.enable_sql_profiling(os.path.basename(__file__))
+
     # connect to the SQLite database
-    conn = sqllib.connect_database(args.sqlite_database)
+    conn = sqllib.connect_database(args.sqlite_database, read_only=True, immutable=True)
+
+    # open the cache of the species background term counts and remove the entries of previous versions of the database
+    background_cache = genlib.DiskCache(args.background_cache_dir, args.background_cache_size if args.background_cache_dir != 'NONE' else 0)
+    database_key_dict = {'database': os.path.abspath(args.sqlite_database), 'fingerprint': genlib.get_database_fingerprint(args.sqlite_database)}
+    background_cache.invalidate(lambda key_dict: key_dict['database'] == database_key_dict['database'] and key_dict['fingerprint'] != database_key_dict['fingerprint'])
+
+    # the species backgrounds can not be only built when the cache is disabled because its directory can not be used
+    if args.background_only.upper() == 'Y' and background_cache.max_size <= 0:
+        genlib.Message.print('error', f'*** The species backgrounds can not be saved because the cache directory {args.background_cache_dir} can not be used.')
+        raise genlib.ProgramException('', 'F003', args.background_cache_dir)
+
+    # get the list of the species names replacing the code of every species by the species names of the database
+    species_name_list = []
+    for species_name in args.species_name_list:
+        for item_species_name in (sqllib.get_mmseqs2_species_list(conn) if species_name == genlib.get_every_species_code() else [species_name]):
+            if item_species_name not in species_name_list:
+                species_name_list.append(item_species_name)
+
+    # build the backgrounds of all the species reading the database once per ontology
+    species_background_dict = build_species_background_dict(conn, background_cache, database_key_dict, species_name_list)
+
+    # only build the species backgrounds in the cache to be shared by later runs
+    if args.background_only.upper() == 'Y':
+        for species_name in species_name_list:
+            for (ontology, (_, species_seqs_wterms)) in species_background_dict[species_name].items():
+                genlib.Message.print('info', f'The {species_name} background of {ontology} has {species_seqs_wterms} sequences with terms.')
+        genlib.Message.print('info', f'Species background cache: {background_cache.get_stats_text()}.')
+        return
+
+    # connect to the annotation results database and get the dataset where the annotation file is loaded
+    (annotation_results_conn, dataset) = sqllib.connect_annotation_results_db(args.annotation_results_db, args.annotation_file)
+
+    # build the annotation term dictionaries of all the ontologies reading the annotation file once
+    annotation_term_data_dict = build_annotation_term_dicts(args.annotation_file, annotation_results_conn, dataset)
+
+    for species_name in species_name_list:
+
+        # set the enrichment analysis file paths of the species (when there are several species, the species name is added to the paths)
+        if len(species_name_list) == 1:
+            (goea_file, mpea_file, koea_file, kpea_file) = (args.goea_file, args.mpea_file, args.koea_file, args.kpea_file)
+        else:
+            (goea_file, mpea_file, koea_file, kpea_file) = [genlib.get_species_file_path(file, species_name) for file in (args.goea_file, args.mpea_file, args.koea_file, args.kpea_file)]
+            genlib.Message.print('info', f'Calculating the enrichment analyses of {species_name} ...')
+
+        # calculate the GO term enrichment analysis
+        calculate_goterm_enrichment_analysis(conn, annotation_term_data_dict['annotation_goterms'], species_background_dict[species_name]['goterms'], args.fdr_method, args.min_seqnum_annotations, args.min_seqnum_species, goea_file)
 
-    # calculate the GO term enrichment analysis
-    calculate_goterm_enrichment_analysis(conn, args.annotation_file, args.species_name, args.fdr_method, args.min_seqnum_annotations, args.min_seqnum_species, args.goea_file)
+        # calculate the Metacyc pathway enrichment analysis
+        calculate_metacyc_pathway_enrichment_analysis(conn, annotation_term_data_dict['annotation_metacyc_pathways'], species_background_dict[species_name]['metacyc_pathways'], args.fdr_method, args.min_seqnum_annotations, args.min_seqnum_species, mpea_file)
 
-    # calculate the Metacyc pathway enrichment analysis
-    calculate_metacyc_pathway_enrichment_analysis(conn, args.annotation_file, args.species_name, args.fdr_method, args.min_seqnum_annotations, args.min_seqnum_species, args.mpea_file)
+        # calculate the KEGG KO enrichment analysis
+        calculate_kegg_ko_enrichment_analysis(conn, annotation_term_data_dict['annotation_kegg_kos'], species_background_dict[species_name]['kegg_kos'], args.fdr_method, args.min_seqnum_annotations, args.min_seqnum_species, koea_file)
 
-    # calculate the KEGG KO enrichment analysis
-    calculate_kegg_ko_enrichment_analysis(conn, args.annotation_file, args.species_name, args.fdr_method, args.min_seqnum_annotations, args.min_seqnum_species, args.koea_file)
+        # calculate the KEGG pathway enrichment analysis
+        calculate_kegg_pathway_enrichment_analysis(conn, annotation_term_data_dict['annotation_kegg_pathways'], species_background_dict[species_name]['kegg_pathways'], args.fdr_method, args.min_seqnum_annotations, args.min_seqnum_species, kpea_file)
 
-    # calculate the KEGG pathway enrichment analysis
-    calculate_kegg_pathway_enrichment_analysis(conn, args.annotation_file, args.species_name, args.fdr_method, args.min_seqnum_annotations, args.min_seqnum_species, args.kpea_file)
+    # print the statistics of the cache of the species background term counts
+    if background_cache.max_size > 0:
+        genlib.Message.print('info', f'Species background cache: {background_cache.get_stats_text()}.')
 
 #-------------------------------------------------------------------------------
 
@@ -82,8 +133,9 @@ def build_parser():
     parser = argparse.ArgumentParser(usage=usage)
     parser._optionals.title = 'Arguments'    #pylint: disable=protected-access
     parser.add_argument('--db', dest='sqlite_database', help='Path of the SQLite database (mandatory).')
-    parser.add_argument('--annotations', dest='annotation_file', help='Path of annotation file in CSV format (mandatory).')
-    parser.add_argument('--species', dest='species_name', help=f'The species name or "{genlib.get_all_species_code()}" (mandatory).')
+    parser.add_argument('--annotations', dest='annotation_file', help='Path of annotation file in CSV format (mandatory unless only the species backgrounds are built).')
+    parser.add_argument('--annotations-db', dest='annotation_results_db', help='Path of the annotation results database where the annotation file is loaded (optional; the annotation file is read when it is not indicated or the file is not loaded).')
+    parser.add_argument('--species', dest='species_name', help=f'The species name, "{genlib.get_all_species_code()}" or a list of them separated by commas where "{genlib.get_every_species_code()}" is every species of the database; with several species, the species name is added to the enrichment analysis file names (mandatory).')
     parser.add_argument('--method', dest='fdr_method', help=f'Method used in FDR calcutation: {genlib.get_fdr_method_code_list_text()}; default: {genlib.Const.DEFAULT_FDR_METHOD}.')
     parser.add_argument('--msqannot', dest='min_seqnum_annotations', help=f'Minimum sequence number in annotation; default: {genlib.Const.DEFAULT_MIN_SEQNUM_ANNOTATIONS}.')
     parser.add_argument('--msqspec', dest='min_seqnum_species', help=f'Minimum sequence number in species; default: {genlib.Const.DEFAULT_MIN_SEQNUM_SPECIES}.')
@@ -91,6 +143,10 @@ def build_parser():
     parser.add_argument('--mpea', dest='mpea_file', help='Path of the Metacyc pathway enrichment analysis file (mandatory).')
     parser.add_argument('--koea', dest='koea_file', help='Path of the KEGG KO enrichment analysis file (mandatory).')
     parser.add_argument('--kpea', dest='kpea_file', help='Path of the KEGG pathway enrichment analysis file (mandatory).')
+    parser.add_argument('--background-cache', dest='background_cache_dir', help=f'Path of the directory where the species background term counts are cached between runs or NONE; default: the directory {genlib.get_background_cache_dir_name()} of the SQLite database directory.')
+    parser.add_argument('--background-cache-size', dest='background_cache_size', help=f'Maximum number of entries (database, species and ontology) of the species background cache; default: {genlib.Const.DEFAULT_BACKGROUND_CACHE_SIZE}.')
+    parser.add_argument('--background-only', dest='background_only', help=f'Only build the species backgrounds of all the ontologies in the background cache to be shared by later runs (the annotation and enrichment analysis files are not used): {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_BACKGROUND_ONLY}.')
+    parser.add_argument('--profile-sql', dest='profile_sql', help=f'Record the calls, latencies and rows of the database accesses, print a summary at exit and save it as JSON in the current directory: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_PROFILE_SQL} (Y when the environment variable {genlib.get_sql_profile_env_var()} is Y).')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {genlib.get_verbose_code_list_text()}; default: {genlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {genlib.get_trace_code_list_text()}; default: {genlib.Const.DEFAULT_TRACE}.')
 
@@ -113,18 +169,38 @@ def check_args(args):
         OK = False
         OK = False
 
+    # check "background_only"
+    if args.background_only is None:
+        args.background_only = genlib.Const.DEFAULT_BACKGROUND_ONLY
+    elif not genlib.check_code(args.background_only, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** background_only has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+        args.background_only = 'N'
+    background_only = args.background_only.upper() == 'Y'
+
     # check "annotation_file"
     if args.annotation_file is None:
-        genlib.Message.print('error', '*** The annotation file is not indicated in the input arguments.')
-        OK = False
+        if not background_only:
+            genlib.Message.print('error', '*** The annotation file is not indicated in the input arguments.')
+            OK = False
     elif not os.path.isfile(args.annotation_file):
         genlib.Message.print('error', f'*** The file {args.annotation_file} does not exist.')
         OK = False
 
+    # check "annotation_results_db"
+    if args.annotation_results_db is not None and not os.path.isfile(args.annotation_results_db):
+        genlib.Message.print('error', f'*** The file {args.annotation_results_db} does not exist.')
+        OK = False
+
     # check "species"
     if args.species_name is None:
         genlib.Message.print('error', '*** The species is not indicated in the input arguments.')
         OK = False
+    else:
+        args.species_name_list = list(dict.fromkeys(species_name.strip() for species_name in args.species_name.split(',')))
+        if '' in args.species_name_list:
+            genlib.Message.print('error', f'*** The species list {args.species_name} has an empty species name.')
+            OK = False
 
     # check "fdr_method"
     if args.fdr_method is None:
@@ -154,25 +230,56 @@ def check_args(args):
         args.min_seqnum_species = int(args.min_seqnum_species)
 
     # check "goea_file"
-    if args.goea_file is None:
+    if args.goea_file is None and not background_only:
         genlib.Message.print('error', '*** The GO term enrichment analysis file is not indicated in the input arguments.')
         OK = False
 
     # check "mpea_file"
-    if args.mpea_file is None:
+    if args.mpea_file is None and not background_only:
         genlib.Message.print('error', '*** The Metacyc pathway enrichment analysis file is not indicated in the input arguments.')
         OK = False
 
     # check "koea_file"
-    if args.koea_file is None:
+    if args.koea_file is None and not background_only:
         genlib.Message.print('error', '*** The KEGG KO enrichment analysis file is not indicated in the input arguments.')
         OK = False
 
     # check "kpea_file"
-    if args.kpea_file is None:
+    if args.kpea_file is None and not background_only:
         genlib.Message.print('error', '*** The KEGG pathway enrichment analysis file is not indicated in the input arguments.')
         OK = False
 
+    # check "background_cache_dir"
+    if args.background_cache_dir is None:
+        if args.sqlite_database is not None:
+            args.background_cache_dir = f'{os.path.dirname(os.path.abspath(args.sqlite_database))}{os.sep}{genlib.get_background_cache_dir_name()}'
+    elif args.background_cache_dir.upper() == 'NONE':
+        args.background_cache_dir = 'NONE'
+    elif os.path.isfile(args.background_cache_dir):
+        genlib.Message.print('error', f'*** {args.background_cache_dir} is a file.')
+        OK = False
+
+    # check "background_cache_size"
+    if args.background_cache_size is None:
+        args.background_cache_size = genlib.Const.DEFAULT_BACKGROUND_CACHE_SIZE
+    elif not genlib.check_int(args.background_cache_size, minimum=0):
+        genlib.Message.print('error', 'The maximum number of entries of the species background cache has to be an integer number greater than or equal to 0.')
+        OK = False
+    else:
+        args.background_cache_size = int(args.background_cache_size)
+
+    # check that the species backgrounds can be cached when only they are built
+    if background_only and (args.background_cache_dir == 'NONE' or args.background_cache_size == 0):
+        genlib.Message.print('error', '*** The species background cache is disabled and only the species backgrounds are built.')
+        OK = False
+
+    # check "profile_sql"
+    if args.profile_sql is None:
+        args.profile_sql = genlib.get_sql_profile_default()
+    elif not genlib.check_code(args.profile_sql, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** profile_sql has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = genlib.Const.DEFAULT_VERBOSE
@@ -197,19 +304,201 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def calculate_goterm_enrichment_analysis(conn, annotation_file, species_name, fdr_method, min_seqnum_annotations, min_seqnum_species, goea_file):
+def build_annotation_term_dicts(annotation_file, annotation_results_conn, dataset):
+    '''
+    Build the annotation term dictionaries of GO terms, Metacyc pathways, KEGG KOs and KEGG pathways
+    and the counters of annotation sequences with terms reading the annotations file once (or from
+    the annotation results database when the file is loaded in it). The result is a dictionary keyed
+    by the term table of the annotation results database.
+    '''
+
+    # get the functional annotation columns of the terms of each table
+    term_column_dict = sqllib.get_annotation_term_column_dict()
+
+    # get the dictionaries from the annotation results database when the annotation file is loaded in it
+    if dataset != '':
+        return {table_name: sqllib.get_annotation_term_seqnum_dict(annotation_results_conn, dataset, table_name) for table_name in term_column_dict}
+
+    # initialize the annotation term dictionaries and the counters of annotations sequences with terms
+    annotation_term_dict_dict = {table_name: {} for table_name in term_column_dict}
+    annotation_seqs_wterms_dict = {table_name: 0 for table_name in term_column_dict}
+
+    # open the annotation file
+    if annotation_file.endswith('.gz'):
+        try:
+            annotation_file_id = gzip.open(annotation_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F002', annotation_file) from e
+    else:
+        try:
+            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F001', annotation_file) from e
+
+    # initialize the annotation counter
+    annotation_counter = 0
+
+    # create the reader of the annotation file that decodes only the columns used
+    column_list = ['qseqid'] + [column for table_column_list in term_column_dict.values() for column in table_column_list]
+    annotation_reader = genlib.read_functional_annotation_records(annotation_file, annotation_file_id, column_list=column_list)
+
+    # read the first data record of the annotation file
+    data_dict = next(annotation_reader, None)
+
+    # while there are records
+    while data_dict is not None:
+
+        # set the old sequence identification
+        old_seq_id = data_dict['qseqid']
+
+        # initialize the term identification sets corresponding to the sequence
+        term_id_set_dict = {table_name: set() for table_name in term_column_dict}
+
+        # while there are records and the same sequence identification
+        while data_dict is not None and data_dict['qseqid'] == old_seq_id:
+
+            # add 1 to the annotation counter
+            annotation_counter += 1
+
+            # extract the term identifications of each table and add them into its term identification set
+            # terms format: "term_id1|term_id2|...|term_idn"
+            for (table_name, table_column_list) in term_column_dict.items():
+                for column in table_column_list:
+                    if data_dict[column] != '' and data_dict[column] != '-':
+                        term_id_set_dict[table_name].update(data_dict[column].split('|'))
+
+            genlib.Message.print('verbose', f'\rProcessed annotations: {annotation_counter}')
+
+            # read the next record of the annotation file
+            data_dict = next(annotation_reader, None)
+
+        # increase the term identifications per sequence in the annotation term dictionaries and the counters of annotations sequences with terms
+        for (table_name, term_id_set) in term_id_set_dict.items():
+            if term_id_set:
+                annotation_term_dict = annotation_term_dict_dict[table_name]
+                for term_id in sorted(term_id_set):
+                    annotation_term_dict[term_id] = annotation_term_dict.get(term_id, 0) + 1
+                annotation_seqs_wterms_dict[table_name] += 1
+
+    genlib.Message.print('verbose', '\n')
+
+    # print summary
+    genlib.Message.print('info', f'{annotation_counter} records read in annotation file.')
+
+    # close annotation file
+    annotation_file_id.close()
+
+    # return the annotation term dictionaries and the counters of annotation sequences with terms
+    return {table_name: (annotation_term_dict_dict[table_name], annotation_seqs_wterms_dict[table_name]) for table_name in term_column_dict}
+
+#-------------------------------------------------------------------------------
+
+def calculate_fisher_exact_greater_pvalues(annotation_seqs_count_list, annotation_seqs_wterms, species_seqs_count_list, species_seqs_wterms):
+    '''
+    Calculate at once the p-values of the one-sided ("greater") Fisher's exact test of the tables
+    [[annotation_seqs_count, annotation_seqs_wterms], [species_seqs_count, species_seqs_wterms]]
+    of a list of terms. The p-values are identical to the ones of scipy.stats.fisher_exact with
+    alternative='greater' because the same hypergeometric distribution function is evaluated on
+    arrays. A p-value that is not a number is returned as N/A.
+    '''
+
+    # build the arrays of the tables
+    a = np.asarray(annotation_seqs_count_list, dtype=np.int64)
+    b = np.full(a.shape, annotation_seqs_wterms, dtype=np.int64)
+    c = np.asarray(species_seqs_count_list, dtype=np.int64)
+    d = np.full(a.shape, species_seqs_wterms, dtype=np.int64)
+
+    # calculate the p-values (the p-value is 1 when a row or a column of the table is zero)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pvalue_array = np.minimum(stats.hypergeom.cdf(b, a + b + c + d, a + b, b + d), 1.0)
+    pvalue_array[(a + c == 0) | (b + d == 0) | (a + b == 0) | (c + d == 0)] = 1.0
+
+    # return the p-value list
+    return [genlib.get_na() if np.isnan(pvalue) else pvalue for pvalue in pvalue_array]
+
+#-------------------------------------------------------------------------------
+
+def get_ontology_background_list():
+    '''
+    Get the list of the ontologies of the species backgrounds with the function that gets the terms
+    of each cluster from the database and the function that builds the species term dictionary.
+    '''
+
+    return [('goterms', sqllib.get_goterms_per_cluster_dict, build_species_goterm_dict), ('metacyc_pathways', sqllib.get_metacyc_pathways_per_cluster_dict, build_species_metacyc_pathway_dict), ('kegg_kos', sqllib.get_kegg_kos_per_cluster_dict, build_species_kegg_ko_dict), ('kegg_pathways', sqllib.get_kegg_pathways_per_cluster_dict, build_species_kegg_pathway_dict)]
+
+#-------------------------------------------------------------------------------
+
+def build_species_background_dict(conn, background_cache, database_key_dict, species_name_list):
+    '''
+    Build the dictionary of the species backgrounds (the species term dictionary and the counter
+    of species sequences with terms of each ontology) of every species of a list. The backgrounds
+    are got from the cache of the species background term counts; when several of them are not
+    cached, the terms of each cluster of an ontology are read from the database once and split
+    by species, and the built backgrounds are saved in the cache.
+    '''
+
+    # initialize the species background dictionary
+    species_background_dict = {species_name: {} for species_name in species_name_list}
+
+    # initialize the dictionary of the cluster identifications of each species
+    species_cluster_ids_dict = None
+
+    for (ontology, get_per_cluster_dict_function, build_function) in get_ontology_background_list():
+
+        # get the species backgrounds from the cache
+        uncached_species_name_list = []
+        for species_name in species_name_list:
+            background_dict = background_cache.get(database_key_dict | {'species': species_name, 'ontology': ontology})
+            if background_dict is not None:
+                genlib.Message.print('info', f'The {species_name} background of {ontology} is got from the cache.')
+                species_background_dict[species_name][ontology] = (background_dict['term_counts'], background_dict['seq_count'])
+            else:
+                uncached_species_name_list.append(species_name)
+
+        # when only a species is not cached, get the terms of its clusters
+        if len(uncached_species_name_list) == 1:
+            per_cluster_dict_of_species = {uncached_species_name_list[0]: get_per_cluster_dict_function(conn, uncached_species_name_list[0])}
+
+        # when several species are not cached, get the terms of all the clusters once and split them by species
+        elif len(uncached_species_name_list) > 1:
+            per_cluster_dict = get_per_cluster_dict_function(conn, genlib.get_all_species_code())
+            if species_cluster_ids_dict is None:
+                species_cluster_ids_dict = sqllib.get_species_cluster_ids_dict(conn, [species_name for species_name in species_name_list if species_name != genlib.get_all_species_code()])
+            per_cluster_dict_of_species = {}
+            for species_name in uncached_species_name_list:
+                if species_name == genlib.get_all_species_code():
+                    per_cluster_dict_of_species[species_name] = per_cluster_dict
+                else:
+                    cluster_id_set = species_cluster_ids_dict[species_name]
+                    per_cluster_dict_of_species[species_name] = {cluster_id: data_dict for (cluster_id, data_dict) in per_cluster_dict.items() if cluster_id in cluster_id_set}
+
+        else:
+            per_cluster_dict_of_species = {}
+
+        # build the species backgrounds that are not cached and save them in the cache
+        for (species_name, per_cluster_dict) in per_cluster_dict_of_species.items():
+            (species_term_dict, species_seqs_wterms) = build_function(species_name, per_cluster_dict)
+            background_cache.put(database_key_dict | {'species': species_name, 'ontology': ontology}, {'term_counts': species_term_dict, 'seq_count': species_seqs_wterms})
+            species_background_dict[species_name][ontology] = (species_term_dict, species_seqs_wterms)
+
+    # return the species background dictionary
+    return species_background_dict
+
+#-------------------------------------------------------------------------------
+
+def calculate_goterm_enrichment_analysis(conn, annotation_goterm_data, species_goterm_data, fdr_method, min_seqnum_annotations, min_seqnum_species, goea_file):
     '''
     calculates the GO term enrichment analysis from a annotation file and the quercusTOA database.
     '''
 
-    # build the annotation GO term dictionary
-    (annotation_goterm_dict, annotation_seqs_wgoterms) = build_annotation_goterm_dict(annotation_file)
+    # get the annotation GO term dictionary and the counter of annotation sequences with GO terms
+    (annotation_goterm_dict, annotation_seqs_wgoterms) = annotation_goterm_data
 
     # get the list of GO term identifications involved in the study
     goterm_id_list = sorted(annotation_goterm_dict.keys())
 
-    # build the species GOterm dictionary
-    (species_goterm_dict, species_seqs_wgoterms) = build_species_goterm_dict(conn, species_name, goterm_id_list)
+    # get the species GO term dictionary and the counter of species sequences with GO terms
+    (species_goterm_dict, species_seqs_wgoterms) = species_goterm_data
 
     # get the Gene Ontololy dictionary
     gene_ontology_dict = sqllib.get_go_ontology_dict(conn, goterm_id_list)
@@ -235,20 +524,16 @@ def calculate_goterm_enrichment_analysis(conn, annotation_file, species_name, fd
             enrichment = genlib.get_na()
         calcultations_dict[goterm_id]['enrichment'] = enrichment
 
-        # calculate the p-value
-        if enrichment != genlib.get_na():
-            # -- _, pvalue = stats.fisher_exact([[annotation_seqs_count, annotation_seqs_wgoterms], [species_seqs_count, species_seqs_wgoterms]], alternative='two-sided')
-            _, pvalue = stats.fisher_exact([[annotation_seqs_count, annotation_seqs_wgoterms], [species_seqs_count, species_seqs_wgoterms]], alternative='greater')
-            # -- pvalue = stats.hypergeom.sf(annotation_seqs_count, species_seqs_wgoterms, species_seqs_count, annotation_seqs_wgoterms, loc=0)
-            if np.isnan(pvalue):
-                pvalue = genlib.get_na()
-        else:
-            pvalue = genlib.get_na()
-        calcultations_dict[goterm_id]['pvalue'] = pvalue
-
-        # initilize the FDR data to N/A
+        # initilize the p-value and the FDR data to N/A
+        calcultations_dict[goterm_id]['pvalue'] = genlib.get_na()
         calcultations_dict[goterm_id]['fdr'] = genlib.get_na()
 
+    # calculate the p-values of the GO terms with enrichment at once
+    tested_goterm_id_list = [goterm_id for goterm_id in goterm_id_list if calcultations_dict[goterm_id]['enrichment'] != genlib.get_na()]
+    pvalue_list = calculate_fisher_exact_greater_pvalues([calcultations_dict[goterm_id]['annotation_seqs_count'] for goterm_id in tested_goterm_id_list], annotation_seqs_wgoterms, [calcultations_dict[goterm_id]['species_seqs_count'] for goterm_id in tested_goterm_id_list], species_seqs_wgoterms)
+    for (goterm_id, pvalue) in zip(tested_goterm_id_list, pvalue_list):
+        calcultations_dict[goterm_id]['pvalue'] = pvalue
+
     # get the GO term identification list sorted by the p-value
     temp_goterm_id_list = []    # each item is [GO term, p-value]
     for goterm_id in goterm_id_list:
@@ -325,102 +610,9 @@ def calculate_goterm_enrichment_analysis(conn, annotation_file, species_name, fd
 
 #-------------------------------------------------------------------------------
 
-def build_annotation_goterm_dict(annotation_file):
-    '''
-    Build the annotation GO term dictionary from the annotations file.
-    '''
-
-    # initialize annotation GO term dictionary
-    annotation_goterm_dict = {}
-
-    # initialize the counter of annotations sequences with GO terms
-    annotation_seqs_wgoterms = 0
-
-    # open the annotation file
-    if annotation_file.endswith('.gz'):
-        try:
-            annotation_file_id = gzip.open(annotation_file, mode='rt', encoding='iso-8859-1')
-        except Exception:
-            raise genlib.ProgramException('F002', annotation_file) from None
-    else:
-        try:
-            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
-        except Exception:
-            raise genlib.ProgramException('F001', annotation_file) from None
-
-    # initialize the annotation counter
-    annotation_counter = 0
-
-    # read the first record of the annotation file (header)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-
-    # read the secord record of the annotation file (first data record)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-    genlib.Message.print('trace', f'key: {key} - record: {record}')
-
-    # while there are records
-    while record != '':
-
-        # set the old sequence identification
-        old_seq_id = data_dict['qseqid']
-
-        # initialize the list of GO term identifications corresponding to the sequence
-        goterm_id_list = []
-
-        # while there are records and the same sequence identification
-        while record != '' and data_dict['qseqid'] == old_seq_id:
-
-            # add 1 to the annotation counter
-            annotation_counter += 1
-
-            # extract the GO term identifications and add them into the GO term identification list
-            # goterms format: "goterm_id1|goterm_id2|...|gotermo_idn"
-            if data_dict['interpro_goterms'] != '' and data_dict['interpro_goterms'] != '-':
-                interpro_goterm_id_list = data_dict['interpro_goterms'].split('|')
-                goterm_id_list.extend(interpro_goterm_id_list)
-            if data_dict['panther_goterms'] != '' and  data_dict['panther_goterms'] != '-':
-                panther_goterm_id_list = data_dict['panther_goterms'].split('|')
-                goterm_id_list.extend(panther_goterm_id_list)
-            if data_dict['eggnog_goterms'] != '' and  data_dict['eggnog_goterms'] != '-':
-                eggnog_goterm_id_list = data_dict['eggnog_goterms'].split('|')
-                goterm_id_list.extend(eggnog_goterm_id_list)
-
-            genlib.Message.print('verbose', f'\rProcessed annotations: {annotation_counter}')
-
-            # read the next record of the annotation file
-            (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-            genlib.Message.print('trace', f'key: {key} - record: {record}')
-
-        # get the list of GO term identifications without duplicates
-        goterm_id_set = set(goterm_id_list)
-        goterm_id_list = sorted(goterm_id_set)
-
-        # increase the GO term identifications per sequence in the annotation GOterm dictionary
-        if goterm_id_list != []:
-            for goterm_id in goterm_id_list:
-                counter = annotation_goterm_dict.get(goterm_id, 0)
-                annotation_goterm_dict[goterm_id] = counter + 1
-
-        # increase the counter of annotations sequences with GO terms
-        if goterm_id_list != []:
-            annotation_seqs_wgoterms += 1
-
-    genlib.Message.print('verbose', '\n')
-
-    # print summary
-    genlib.Message.print('info', f'{annotation_counter} records read in annotation file.')
-
-    # close annotation file
-    annotation_file_id.close()
-
-    # return the annotation GO term dictionary
-    return annotation_goterm_dict, annotation_seqs_wgoterms
-
-#-------------------------------------------------------------------------------
-
-def build_species_goterm_dict(conn, species_name, goterm_id_list):
+def build_species_goterm_dict(species_name, goterms_per_cluster_dict):
     '''
-    Build the species GO term dictionary from the annotations file.
+    Build the species GO term dictionary from the GO terms of each cluster of the species.
     '''
 
     # initialize the species GO term dictionary
@@ -429,9 +621,6 @@ def build_species_goterm_dict(conn, species_name, goterm_id_list):
     # initialize the counter of species sequences with GO terms
     species_seqs_wgoterms = 0
 
-    # get the dictionary of the GO terms of each cluster corresponding to the species
-    goterms_per_cluster_dict = sqllib.get_goterms_per_cluster_dict(conn, species_name)
-
     # initialize the species cluster counter
     species_cluster_counter = 0
 
@@ -481,19 +670,19 @@ def build_species_goterm_dict(conn, species_name, goterm_id_list):
 
 #-------------------------------------------------------------------------------
 
-def calculate_metacyc_pathway_enrichment_analysis(conn, annotation_file, species_name, fdr_method, min_seqnum_annotations, min_seqnum_species, mpea_file):
+def calculate_metacyc_pathway_enrichment_analysis(conn, annotation_metacyc_pathway_data, species_metacyc_pathway_data, fdr_method, min_seqnum_annotations, min_seqnum_species, mpea_file):
     '''
     calculates the Metacyc pathway enrichment analysis from a annotation file and the quercusTOA database.
     '''
 
-    # build the annotation Metacyc pathway dictionary
-    (annotation_metacyc_pathway_dict, annotation_seqs_wmetacycpathways) = build_annotation_metacyc_pathway_dict(annotation_file)
+    # get the annotation Metacyc pathway dictionary and the counter of annotation sequences with Metacyc pathways
+    (annotation_metacyc_pathway_dict, annotation_seqs_wmetacycpathways) = annotation_metacyc_pathway_data
 
     # get the list of Metacyc pathway identifications involved in the study
     metacyc_pathway_id_list = sorted(annotation_metacyc_pathway_dict.keys())
 
-    # build the species Metacyc pathway dictionary
-    (species_metacyc_pathway_dict, species_seqs_wmetacycpathways) = build_species_metacyc_pathway_dict(conn, species_name, metacyc_pathway_id_list)
+    # get the species Metacyc pathway dictionary and the counter of species sequences with Metacyc pathways
+    (species_metacyc_pathway_dict, species_seqs_wmetacycpathways) = species_metacyc_pathway_data
 
     # initialize the calculations dictionary
     calcultations_dict = genlib.NestedDefaultDict()
@@ -516,20 +705,16 @@ def calculate_metacyc_pathway_enrichment_analysis(conn, annotation_file, species
             enrichment = genlib.get_na()
         calcultations_dict[metacyc_pathway_id]['enrichment'] = enrichment
 
-        # calculate the p-value
-        if enrichment != genlib.get_na():
-            # -- _, pvalue = stats.fisher_exact([[annotation_seqs_count, annotation_seqs_wmetacycpathways], [species_seqs_count, species_seqs_wmetacycpathways]], alternative='two-sided'))
-            _, pvalue = stats.fisher_exact([[annotation_seqs_count, annotation_seqs_wmetacycpathways], [species_seqs_count, species_seqs_wmetacycpathways]], alternative='greater')
-            # -- pvalue = stats.hypergeom.sf(annotation_seqs_count, species_seqs_wmetacycpathways, species_seqs_count, annotation_seqs_wmetacycpathways, loc=0)
-            if np.isnan(pvalue):
-                pvalue = genlib.get_na()
-        else:
-            pvalue = genlib.get_na()
-        calcultations_dict[metacyc_pathway_id]['pvalue'] = pvalue
-
-        # initilize the FDR data to N/A
+        # initilize the p-value and the FDR data to N/A
+        calcultations_dict[metacyc_pathway_id]['pvalue'] = genlib.get_na()
         calcultations_dict[metacyc_pathway_id]['fdr'] = genlib.get_na()
 
+    # calculate the p-values of the Metacyc pathways with enrichment at once
+    tested_metacyc_pathway_id_list = [metacyc_pathway_id for metacyc_pathway_id in metacyc_pathway_id_list if calcultations_dict[metacyc_pathway_id]['enrichment'] != genlib.get_na()]
+    pvalue_list = calculate_fisher_exact_greater_pvalues([calcultations_dict[metacyc_pathway_id]['annotation_seqs_count'] for metacyc_pathway_id in tested_metacyc_pathway_id_list], annotation_seqs_wmetacycpathways, [calcultations_dict[metacyc_pathway_id]['species_seqs_count'] for metacyc_pathway_id in tested_metacyc_pathway_id_list], species_seqs_wmetacycpathways)
+    for (metacyc_pathway_id, pvalue) in zip(tested_metacyc_pathway_id_list, pvalue_list):
+        calcultations_dict[metacyc_pathway_id]['pvalue'] = pvalue
+
     # get the Metacyc pathway identification list sorted by the p-value
     temp_metacyc_pathway_id_list = []    # each item is [Metacyc pathway, p-value]
     for metacyc_pathway_id in metacyc_pathway_id_list:
@@ -602,95 +787,9 @@ def calculate_metacyc_pathway_enrichment_analysis(conn, annotation_file, species
 
 #-------------------------------------------------------------------------------
 
-def build_annotation_metacyc_pathway_dict(annotation_file):
-    '''
-    Build the annotation Metacyc pathways dictionary from the annotations file.
-    '''
-
-    # initialize annotation Metacyc pathway dictionary
-    annotation_metacyc_pathway_dict = {}
-
-    # initialize the counter of annotations sequences with Metacyc pathways
-    annotation_seqs_wmetacycpathways = 0
-
-    # open the annotation file
-    if annotation_file.endswith('.gz'):
-        try:
-            annotation_file_id = gzip.open(annotation_file, mode='rt', encoding='iso-8859-1')
-        except Exception:
-            raise genlib.ProgramException('F002', annotation_file) from None
-    else:
-        try:
-            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
-        except Exception:
-            raise genlib.ProgramException('F001', annotation_file) from None
-
-    # initialize the annotation counter
-    annotation_counter = 0
-
-    # read the first record of the annotation file (header)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-
-    # read the secord record of the annotation file (first data record)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-    genlib.Message.print('trace', f'key: {key} - record: {record}')
-
-    # while there are records
-    while record != '':
-
-        # set the old sequence identification
-        old_seq_id = data_dict['qseqid']
-
-        # initialize the list of Metacyc pathway identifications corresponding to the sequence
-        metacyc_pathway_id_list = []
-
-        # while there are records and the same sequence identification
-        while record != '' and data_dict['qseqid'] == old_seq_id:
-
-            # add 1 to the annotation counter
-            annotation_counter += 1
-
-            # extract the Metacyc pathway identifications and add them into the Metacyc pathway identification list
-            # Metacyc pathway format: "metacyc_pathway_id1|metacyc_pathway_id2|...|metacyc_pathway_idn"
-            if data_dict['metacyc_pathways'] != '' and data_dict['metacyc_pathways'] != '-':
-                metacyc_pathway_id_list.extend(data_dict['metacyc_pathways'].split('|'))
-
-            genlib.Message.print('verbose', f'\rProcessed annotations: {annotation_counter}')
-
-            # read the next record of the annotation file
-            (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-            genlib.Message.print('trace', f'key: {key} - record: {record}')
-
-        # get the list of Metacyc pathway identifications without duplicates
-        metacyc_pathway_id_set = set(metacyc_pathway_id_list)
-        metacyc_pathway_id_list = sorted(metacyc_pathway_id_set)
-
-        # increase the Metacyc pathway identifications per sequence in the annotation Metacyc pathway dictionary
-        if metacyc_pathway_id_list != []:
-            for metacyc_pathway_id in metacyc_pathway_id_list:
-                counter = annotation_metacyc_pathway_dict.get(metacyc_pathway_id, 0)
-                annotation_metacyc_pathway_dict[metacyc_pathway_id] = counter + 1
-
-        # increase the counter of annotations sequences with Metacyc pathways
-        if metacyc_pathway_id_list != []:
-            annotation_seqs_wmetacycpathways += 1
-
-    genlib.Message.print('verbose', '\n')
-
-    # print summary
-    genlib.Message.print('info', f'{annotation_counter} records read in annotation file.')
-
-    # close annotation file
-    annotation_file_id.close()
-
-    # return the annotation Metacyc pathway dictionary
-    return annotation_metacyc_pathway_dict, annotation_seqs_wmetacycpathways
-
-#-------------------------------------------------------------------------------
-
-def build_species_metacyc_pathway_dict(conn, species_name, metacyc_pathway_id_list):
+def build_species_metacyc_pathway_dict(species_name, metacyc_pathways_per_cluster_dict):
     '''
-    Build the species Metacyc pathway dictionary from the annotations file.
+    Build the species Metacyc pathway dictionary from the Metacyc pathways of each cluster of the species.
     '''
 
     # initialize the species Metacyc pathway dictionary
@@ -699,9 +798,6 @@ def build_species_metacyc_pathway_dict(conn, species_name, metacyc_pathway_id_li
     # initialize the counter of species sequences with Metacyc pathways
     species_seqs_wmetacycpataways = 0
 
-    # get the dictionary of the Metacyc pathways of each cluster corresponding to the species
-    metacyc_pathways_per_cluster_dict = sqllib.get_metacyc_pathways_per_cluster_dict(conn, species_name)
-
     # initialize the species cluster counter
     species_cluster_counter = 0
 
@@ -744,19 +840,19 @@ def build_species_metacyc_pathway_dict(conn, species_name, metacyc_pathway_id_li
 
 #-------------------------------------------------------------------------------
 
-def calculate_kegg_ko_enrichment_analysis(conn, annotation_file, species_name, fdr_method, min_seqnum_annotations, min_seqnum_species, koea_file):
+def calculate_kegg_ko_enrichment_analysis(conn, annotation_kegg_ko_data, species_kegg_ko_data, fdr_method, min_seqnum_annotations, min_seqnum_species, koea_file):
     '''
     calculates the KO enrichment analysis from a annotation file and the quercusTOA database.
     '''
 
-    # build the annotation KEGG KO dictionary
-    (annotation_kegg_ko_dict, annotation_seqs_wkeggkos) = build_annotation_kegg_ko_dict(annotation_file)
+    # get the annotation KEGG KO dictionary and the counter of annotation sequences with KEGG KOs
+    (annotation_kegg_ko_dict, annotation_seqs_wkeggkos) = annotation_kegg_ko_data
 
     # get the list of KEGG KO identifications involved in the study
     kegg_ko_id_list = sorted(annotation_kegg_ko_dict.keys())
 
-    # build the species KEGG KO dictionary
-    (species_kegg_ko_dict, species_seqs_seqs_wkeggkos) = build_species_kegg_ko_dict(conn, species_name, kegg_ko_id_list)
+    # get the species KEGG KO dictionary and the counter of species sequences with KEGG KOs
+    (species_kegg_ko_dict, species_seqs_seqs_wkeggkos) = species_kegg_ko_data
 
     # initialize the calculations dictionary
     calcultations_dict = genlib.NestedDefaultDict()
@@ -779,20 +875,16 @@ def calculate_kegg_ko_enrichment_analysis(conn, annotation_file, species_name, f
             enrichment = genlib.get_na()
         calcultations_dict[kegg_ko_id]['enrichment'] = enrichment
 
-        # calculate the p-value
-        if enrichment != genlib.get_na():
-            # -- _, pvalue = stats.fisher_exact([[annotation_seqs_count, annotation_seqs_wkeggkos], [species_seqs_count, species_seqs_wkeggkos]], alternative='two-sided'))
-            _, pvalue = stats.fisher_exact([[annotation_seqs_count, annotation_seqs_wkeggkos], [species_seqs_count, species_seqs_seqs_wkeggkos]], alternative='greater')
-            # -- pvalue = stats.hypergeom.sf(annotation_seqs_count, species_seqs_wkeggkos, species_seqs_count, annotation_seqs_wkeggkos, loc=0)
-            if np.isnan(pvalue):
-                pvalue = genlib.get_na()
-        else:
-            pvalue = genlib.get_na()
-        calcultations_dict[kegg_ko_id]['pvalue'] = pvalue
-
-        # initilize the FDR data to N/A
+        # initilize the p-value and the FDR data to N/A
+        calcultations_dict[kegg_ko_id]['pvalue'] = genlib.get_na()
         calcultations_dict[kegg_ko_id]['fdr'] = genlib.get_na()
 
+    # calculate the p-values of the KEGG KOs with enrichment at once
+    tested_kegg_ko_id_list = [kegg_ko_id for kegg_ko_id in kegg_ko_id_list if calcultations_dict[kegg_ko_id]['enrichment'] != genlib.get_na()]
+    pvalue_list = calculate_fisher_exact_greater_pvalues([calcultations_dict[kegg_ko_id]['annotation_seqs_count'] for kegg_ko_id in tested_kegg_ko_id_list], annotation_seqs_wkeggkos, [calcultations_dict[kegg_ko_id]['species_seqs_count'] for kegg_ko_id in tested_kegg_ko_id_list], species_seqs_seqs_wkeggkos)
+    for (kegg_ko_id, pvalue) in zip(tested_kegg_ko_id_list, pvalue_list):
+        calcultations_dict[kegg_ko_id]['pvalue'] = pvalue
+
     # get the KEGG KO identification list sorted by the p-value
     temp_kegg_ko_id_list = []    # each item is [KEGG KO, p-value]
     for kegg_ko_id in kegg_ko_id_list:
@@ -865,95 +957,9 @@ def calculate_kegg_ko_enrichment_analysis(conn, annotation_file, species_name, f
 
 #-------------------------------------------------------------------------------
 
-def build_annotation_kegg_ko_dict(annotation_file):
+def build_species_kegg_ko_dict(species_name, kegg_kos_per_cluster_dict):
     '''
-    Build the annotation KEGG KO dictionary from the annotations file.
-    '''
-
-    # initialize annotation KO dictionary
-    annotation_kegg_ko_dict = {}
-
-    # initialize the counter of annotations sequences with KEGG KOs
-    annotation_seqs_wkeggkos = 0
-
-    # open the annotation file
-    if annotation_file.endswith('.gz'):
-        try:
-            annotation_file_id = gzip.open(annotation_file, mode='rt', encoding='iso-8859-1')
-        except Exception:
-            raise genlib.ProgramException('F002', annotation_file) from None
-    else:
-        try:
-            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
-        except Exception:
-            raise genlib.ProgramException('F001', annotation_file) from None
-
-    # initialize the annotation counter
-    annotation_counter = 0
-
-    # read the first record of the annotation file (header)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-
-    # read the secord record of the annotation file (first data record)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-    genlib.Message.print('trace', f'key: {key} - record: {record}')
-
-    # while there are records
-    while record != '':
-
-        # set the old sequence identification
-        old_seq_id = data_dict['qseqid']
-
-        # initialize the list of KEGG KO identifications corresponding to the sequence
-        kegg_ko_id_list = []
-
-        # while there are records and the same sequence identification
-        while record != '' and data_dict['qseqid'] == old_seq_id:
-
-            # add 1 to the annotation counter
-            annotation_counter += 1
-
-            # extract the KEGG KO identifications and add them into the KEGG KO identification list
-            # KO format: "kegg_ko_id1|kegg_ko_id2|...|kegg_ko_idn"
-            if data_dict['kegg_kos'] != '' and data_dict['kegg_kos'] != '-':
-                kegg_ko_id_list.extend(data_dict['kegg_kos'].split('|'))
-
-            genlib.Message.print('verbose', f'\rProcessed annotations: {annotation_counter}')
-
-            # read the next record of the annotation file
-            (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-            genlib.Message.print('trace', f'key: {key} - record: {record}')
-
-        # get the list of KEE KO identifications without duplicates
-        kegg_ko_id_set = set(kegg_ko_id_list)
-        kegg_ko_id_list = sorted(kegg_ko_id_set)
-
-        # increase the KEGG KO identifications per sequence in the annotation KEGG KO dictionary
-        if kegg_ko_id_list != []:
-            for kegg_ko_id in kegg_ko_id_list:
-                counter = annotation_kegg_ko_dict.get(kegg_ko_id, 0)
-                annotation_kegg_ko_dict[kegg_ko_id] = counter + 1
-
-        # increase the counter of annotations sequences with KEGG KOs
-        if kegg_ko_id_list != []:
-            annotation_seqs_wkeggkos += 1
-
-    genlib.Message.print('verbose', '\n')
-
-    # print summary
-    genlib.Message.print('info', f'{annotation_counter} records read in annotation file.')
-
-    # close annotation file
-    annotation_file_id.close()
-
-    # return the KEGG KO dictionary
-    return annotation_kegg_ko_dict, annotation_seqs_wkeggkos
-
-#-------------------------------------------------------------------------------
-
-def build_species_kegg_ko_dict(conn, species_name, kegg_ko_id_list):
-    '''
-    Build the species KEGG KO dictionary from the annotations file.
+    Build the species KEGG KO dictionary from the KEGG KOs of each cluster of the species.
     '''
 
     # initialize the species KEGG KO dictionary
@@ -962,9 +968,6 @@ def build_species_kegg_ko_dict(conn, species_name, kegg_ko_id_list):
     # initialize the counter of species sequences with KEGG KOs
     species_seqs_wkeggkos = 0
 
-    # get the dictionary of the KEGG KOs of each cluster corresponding to the species
-    kegg_kos_per_cluster_dict = sqllib.get_kegg_kos_per_cluster_dict(conn, species_name)
-
     # initialize the species cluster counter
     species_cluster_counter = 0
 
@@ -1007,19 +1010,19 @@ def build_species_kegg_ko_dict(conn, species_name, kegg_ko_id_list):
 
 #-------------------------------------------------------------------------------
 
-def calculate_kegg_pathway_enrichment_analysis(conn, annotation_file, species_name, fdr_method, min_seqnum_annotations, min_seqnum_species, kpea_file):
+def calculate_kegg_pathway_enrichment_analysis(conn, annotation_kegg_pathway_data, species_kegg_pathway_data, fdr_method, min_seqnum_annotations, min_seqnum_species, kpea_file):
     '''
     calculates the KEGG pathway enrichment analysis from a annotation file and the quercusTOA database.
     '''
 
-    # build the annotation KEGG pathway dictionary
-    (annotation_kegg_pathway_dict, annotation_seqs_wkeggpathways) = build_annotation_kegg_pathway_dict(annotation_file)
+    # get the annotation KEGG pathway dictionary and the counter of annotation sequences with KEGG pathways
+    (annotation_kegg_pathway_dict, annotation_seqs_wkeggpathways) = annotation_kegg_pathway_data
 
     # get the list of KEGG pathway identifications involved in the study
     kegg_pathway_id_list = sorted(annotation_kegg_pathway_dict.keys())
 
-    # build the species KEGG pathway dictionary
-    (species_kegg_pathway_dict, species_seqs_wkeggpathways) = build_species_kegg_pathway_dict(conn, species_name, kegg_pathway_id_list)
+    # get the species KEGG pathway dictionary and the counter of species sequences with KEGG pathways
+    (species_kegg_pathway_dict, species_seqs_wkeggpathways) = species_kegg_pathway_data
 
     # initialize the calculations dictionary
     calcultations_dict = genlib.NestedDefaultDict()
@@ -1042,20 +1045,16 @@ def calculate_kegg_pathway_enrichment_analysis(conn, annotation_file, species_na
             enrichment = genlib.get_na()
         calcultations_dict[kegg_pathway_id]['enrichment'] = enrichment
 
-        # calculate the p-value
-        if enrichment != genlib.get_na():
-            # -- _, pvalue = stats.fisher_exact([[annotation_seqs_count, annotation_seqs_wkeggpathways], [species_seqs_count, species_seqs_wkeggpathways]], alternative='two-sided'))
-            _, pvalue = stats.fisher_exact([[annotation_seqs_count, annotation_seqs_wkeggpathways], [species_seqs_count, species_seqs_wkeggpathways]], alternative='greater')
-            # -- pvalue = stats.hypergeom.sf(annotation_seqs_count, species_seqs_wkeggpathways, species_seqs_count, annotation_seqs_wkeggpathways, loc=0)
-            if np.isnan(pvalue):
-                pvalue = genlib.get_na()
-        else:
-            pvalue = genlib.get_na()
-        calcultations_dict[kegg_pathway_id]['pvalue'] = pvalue
-
-        # initilize the FDR data to N/A
+        # initilize the p-value and the FDR data to N/A
+        calcultations_dict[kegg_pathway_id]['pvalue'] = genlib.get_na()
         calcultations_dict[kegg_pathway_id]['fdr'] = genlib.get_na()
 
+    # calculate the p-values of the KEGG pathways with enrichment at once
+    tested_kegg_pathway_id_list = [kegg_pathway_id for kegg_pathway_id in kegg_pathway_id_list if calcultations_dict[kegg_pathway_id]['enrichment'] != genlib.get_na()]
+    pvalue_list = calculate_fisher_exact_greater_pvalues([calcultations_dict[kegg_pathway_id]['annotation_seqs_count'] for kegg_pathway_id in tested_kegg_pathway_id_list], annotation_seqs_wkeggpathways, [calcultations_dict[kegg_pathway_id]['species_seqs_count'] for kegg_pathway_id in tested_kegg_pathway_id_list], species_seqs_wkeggpathways)
+    for (kegg_pathway_id, pvalue) in zip(tested_kegg_pathway_id_list, pvalue_list):
+        calcultations_dict[kegg_pathway_id]['pvalue'] = pvalue
+
     # get the KEGG pathway identification list sorted by the p-value
     temp_kegg_pathway_id_list = []    # each item is [KEGG pathway, p-value]
     for kegg_pathway_id in kegg_pathway_id_list:
@@ -1128,95 +1127,9 @@ def calculate_kegg_pathway_enrichment_analysis(conn, annotation_file, species_na
 
 #-------------------------------------------------------------------------------
 
-def build_annotation_kegg_pathway_dict(annotation_file):
-    '''
-    Build the annotation KEGG pathways dictionary from the annotations file.
-    '''
-
-    # initialize annotation KEGG pathway dictionary
-    annotation_kegg_pathway_dict = {}
-
-    # initialize the counter of annotations sequences with KEGG pathways
-    annotation_seqs_wkeggpathways = 0
-
-    # open the annotation file
-    if annotation_file.endswith('.gz'):
-        try:
-            annotation_file_id = gzip.open(annotation_file, mode='rt', encoding='iso-8859-1')
-        except Exception:
-            raise genlib.ProgramException('F002', annotation_file) from None
-    else:
-        try:
-            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
-        except Exception:
-            raise genlib.ProgramException('F001', annotation_file) from None
-
-    # initialize the annotation counter
-    annotation_counter = 0
-
-    # read the first record of the annotation file (header)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-
-    # read the secord record of the annotation file (first data record)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-    genlib.Message.print('trace', f'key: {key} - record: {record}')
-
-    # while there are records
-    while record != '':
-
-        # set the old sequence identification
-        old_seq_id = data_dict['qseqid']
-
-        # initialize the list of KEGG pathway identifications corresponding to the sequence
-        kegg_pathway_id_list = []
-
-        # while there are records and the same sequence identification
-        while record != '' and data_dict['qseqid'] == old_seq_id:
-
-            # add 1 to the annotation counter
-            annotation_counter += 1
-
-            # extract the KEGG pathway identifications and add them into the KEGG pathway identification list
-            # KEGG pathway format: "kegg_pathway_id1|kegg_pathway_id2|...|kegg_pathway_idn"
-            if data_dict['kegg_pathways'] != '' and data_dict['kegg_pathways'] != '-':
-                kegg_pathway_id_list.extend(data_dict['kegg_pathways'].split('|'))
-
-            genlib.Message.print('verbose', f'\rProcessed annotations: {annotation_counter}')
-
-            # read the next record of the annotation file
-            (record, key, data_dict) = genlib.read_functional_annotation_record(annotation_file, annotation_file_id, annotation_counter)
-            genlib.Message.print('trace', f'key: {key} - record: {record}')
-
-        # get the list of KEGG pathway identifications without duplicates
-        kegg_pathway_id_set = set(kegg_pathway_id_list)
-        kegg_pathway_id_list = sorted(kegg_pathway_id_set)
-
-        # increase the KEGG pathway identifications per sequence in the annotation KEGG pathway dictionary
-        if kegg_pathway_id_list != []:
-            for kegg_pathway_id in kegg_pathway_id_list:
-                counter = annotation_kegg_pathway_dict.get(kegg_pathway_id, 0)
-                annotation_kegg_pathway_dict[kegg_pathway_id] = counter + 1
-
-        # increase the counter of annotations sequences with KEGG pathways
-        if kegg_pathway_id_list != []:
-            annotation_seqs_wkeggpathways += 1
-
-    genlib.Message.print('verbose', '\n')
-
-    # print summary
-    genlib.Message.print('info', f'{annotation_counter} records read in annotation file.')
-
-    # close annotation file
-    annotation_file_id.close()
-
-    # return the annotation KEGG pathway dictionary
-    return annotation_kegg_pathway_dict, annotation_seqs_wkeggpathways
-
-#-------------------------------------------------------------------------------
-
-def build_species_kegg_pathway_dict(conn, species_name, kegg_pathway_id_list):
+def build_species_kegg_pathway_dict(species_name, kegg_pathways_per_cluster_dict):
     '''
-    Build the species KEGG pathway dictionary from the annotations file.
+    Build the species KEGG pathway dictionary from the KEGG pathways of each cluster of the species.
     '''
 
     # initialize the species KEGG pathway dictionary
@@ -1225,9 +1138,6 @@ def build_species_kegg_pathway_dict(conn, species_name, kegg_pathway_id_list):
     # initialize the counter of species sequences with KEGG pathways
     species_seqs_wkeggpataways = 0
 
-    # get the dictionary of the KEGG pathways of each cluster corresponding to the species
-    kegg_pathways_per_cluster_dict = sqllib.get_kegg_pathways_per_cluster_dict(conn, species_name)
-
     # initialize the species cluster counter
     species_cluster_counter = 0
 
@@ -48,11 +48,18 @@ def main():
     args = parser.parse_args()
     check_args(args)
 
+    # enable the SQL instrumentation
+    if args.profile_sql.upper() == 'Y':
+        sqllib.enable_sql_profiling(os.path.basename(__file__))
+
     # connect to the SQLite database
-    conn = sqllib.connect_database(args.sqlite_database)
+    conn = sqllib.connect_database(args.sqlite_database, read_only=True, immutable=True)
+
+    # connect to the annotation results database and get the dataset where the functional annotation file is loaded
+    (annotation_results_conn, dataset) = sqllib.connect_annotation_results_db(args.annotation_results_db, args.functional_annotation_file)
 
     # calculate functional annotation statistics
-    calculate_functional_stats(conn, args.functional_annotation_file, args.output_dir)
+    calculate_functional_stats(conn, args.functional_annotation_file, annotation_results_conn, dataset, args.output_dir)
 
 #-------------------------------------------------------------------------------
 
@@ -69,7 +76,9 @@ def build_parser():
     parser._optionals.title = 'Arguments'    #pylint: disable=protected-access
     parser.add_argument('--db', dest='sqlite_database', help='Path of the SQLite database (mandatory).')
     parser.add_argument('--annotations', dest='functional_annotation_file', help='Path of functional annotation file in CSV format (mandatory).')
+    parser.add_argument('--annotations-db', dest='annotation_results_db', help='Path of the annotation results database where the functional annotation file is loaded (optional; the functional annotation file is read when it is not indicated or the file is not loaded).')
     parser.add_argument('--outdir', dest='output_dir', help='Path of the directory to save statistics files (mandatory).')
+    parser.add_argument('--profile-sql', dest='profile_sql', help=f'Record the calls, latencies and rows of the database accesses, print a summary at exit and save it as JSON in the current directory: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_PROFILE_SQL} (Y when the environment variable {genlib.get_sql_profile_env_var()} is Y).')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {genlib.get_verbose_code_list_text()}; default: {genlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {genlib.get_trace_code_list_text()}; default: {genlib.Const.DEFAULT_TRACE}.')
 
@@ -99,11 +108,23 @@ def check_args(args):
         genlib.Message.print('error', f'*** The file {args.functional_annotation_file} does not exist.')
         OK = False
 
+    # check "annotation_results_db"
+    if args.annotation_results_db is not None and not os.path.isfile(args.annotation_results_db):
+        genlib.Message.print('error', f'*** The file {args.annotation_results_db} does not exist.')
+        OK = False
+
     # check "output_dir"
     if args.output_dir is None:
         genlib.Message.print('error', '*** The directory to save statistics files is not indicated in the input arguments.')
         OK = False
 
+    # check "profile_sql"
+    if args.profile_sql is None:
+        args.profile_sql = genlib.get_sql_profile_default()
+    elif not genlib.check_code(args.profile_sql, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** profile_sql has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = genlib.Const.DEFAULT_VERBOSE
@@ -128,9 +149,10 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def calculate_functional_stats(conn, functional_annotation_file, output_dir):
+def calculate_functional_stats(conn, functional_annotation_file, annotation_results_conn, dataset, output_dir):
     '''
-    Calculate functional annotation statistics.
+    Calculate functional annotation statistics from the functional annotation file (or from
+    the annotation results database when the file is loaded in it).
     '''
 
     # initialize the statistics dictionaries
@@ -138,8 +160,18 @@ def calculate_functional_stats(conn, functional_annotation_file, output_dir):
     go_stats_dict = {}
     seq_num_per_goterm_id_num_stats_dict = {}
 
-    # open the functional annotation file
-    if functional_annotation_file.endswith('.gz'):
+    # set the columns used
+    column_list = ['qseqid', 'sseqid', 'pident', 'evalue', 'protein_species', 'interpro_goterms', 'panther_goterms', 'eggnog_goterms']
+
+    # initialize the functional annotation file identification
+    functional_annotation_file_id = None
+
+    # get the hits from the annotation results database when the file is loaded in it
+    if dataset != '':
+        functional_annotation_reader = sqllib.get_annotation_hit_data_dicts(annotation_results_conn, dataset, column_list)
+
+    # otherwise, open the functional annotation file
+    elif functional_annotation_file.endswith('.gz'):
         try:
             functional_annotation_file_id = gzip.open(functional_annotation_file, mode='rt', encoding='iso-8859-1')
         except Exception:
@@ -150,18 +182,18 @@ def calculate_functional_stats(conn, functional_annotation_file, output_dir):
         except Exception:
             raise genlib.ProgramException('F001', functional_annotation_file) from None
 
+    # create the reader of the functional annotation file that decodes only the columns used
+    if functional_annotation_file_id is not None:
+        functional_annotation_reader = genlib.read_functional_annotation_records(functional_annotation_file, functional_annotation_file_id, column_list=column_list)
+
     # initialize the annotation counter
     annotation_counter = 0
 
-    # read the first record of the functional annotation file (header)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, annotation_counter)
-
-    # read the secord record of the functional annotation file (first data record)
-    (record, key, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, annotation_counter)
-    genlib.Message.print('trace', f'key: {key} - record: {record}')
+    # read the first data record of the functional annotation file
+    data_dict = next(functional_annotation_reader, None)
 
     # while there are records
-    while record != '':
+    while data_dict is not None:
 
         # initialize the old sequence identifications
         old_qseqid = data_dict['qseqid']
@@ -179,7 +211,7 @@ def calculate_functional_stats(conn, functional_annotation_file, output_dir):
         goterm_ids_per_seq_list = []
 
         # while there are records and the same sequence identification
-        while record != '' and data_dict['qseqid'] == old_qseqid:
+        while data_dict is not None and data_dict['qseqid'] == old_qseqid:
 
             # if the sequence matched is not a potential lncRNA
             if data_dict['sseqid'] != genlib.get_potential_lncrn():
@@ -230,8 +262,7 @@ def calculate_functional_stats(conn, functional_annotation_file, output_dir):
             genlib.Message.print('verbose', f'\rProcessed functional annotations: {annotation_counter}')
 
             # read the next record of the functional annotation file
-            (record, key, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, annotation_counter)
-            genlib.Message.print('trace', f'key: {key} - record: {record}')
+            data_dict = next(functional_annotation_reader, None)
 
         # if the old sequence matched is not a potential lncRNA
         if old_sseqid != genlib.get_potential_lncrn():
@@ -257,7 +288,8 @@ def calculate_functional_stats(conn, functional_annotation_file, output_dir):
     genlib.Message.print('info', f'{annotation_counter} records read in functional annotation file.')
 
     # close functional annotation file
-    functional_annotation_file_id.close()
+    if functional_annotation_file_id is not None:
+        functional_annotation_file_id.close()
 
     # build phylogenic statistics files
     build_phylogenic_data_frecuency(species_stats_dict, output_dir, stats_code='species')
@@ -269,6 +301,7 @@ def calculate_functional_stats(conn, functional_annotation_file, output_dir):
     # show OK message
     genlib.Message.print('info', f'The statistics files are save in {output_dir}.')
 
+
 #-------------------------------------------------------------------------------
 
 def build_x_per_y_stats(stats_dict, output_dir, stats_code):
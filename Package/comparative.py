@@ -157,6 +157,17 @@ class FormSearchSeqsHomology(QWidget):
         self.combobox_fasta_type.currentIndexChanged.connect(self.check_inputs)
         self.combobox_fasta_type.setFixedWidth(fontmetrics.width('9'*22))
 
+        # create and configure "label_container"
+        label_container = QLabel()
+        label_container.setText('Consolidated\noutput')
+        label_container.setFixedWidth(fontmetrics.width('9'*14))
+
+        # create and configure "combobox_container"
+        self.combobox_container = QComboBox()
+        self.combobox_container.setToolTip('Save the homologous sequences, alignments and trees of every sequence in indexed container files instead of several files per sequence.')
+        self.combobox_container.currentIndexChanged.connect(self.check_inputs)
+        self.combobox_container.setFixedWidth(fontmetrics.width('9'*6))
+
         # create and configure "radiobutton_seqs_list"
         self.radiobutton_seqs_list = QRadioButton()
         self.radiobutton_seqs_list.setText('FASTA\nsequences')
@@ -194,6 +205,7 @@ class FormSearchSeqsHomology(QWidget):
         gridlayout_data.setRowMinimumHeight(0, 40)
         gridlayout_data.setRowMinimumHeight(1, 40)
         gridlayout_data.setRowMinimumHeight(2, 40)
+        gridlayout_data.setRowMinimumHeight(3, 40)
         gridlayout_data.setColumnStretch(0,1)
         gridlayout_data.setColumnStretch(1,1)
         gridlayout_data.setColumnStretch(2,1)
@@ -210,6 +222,8 @@ class FormSearchSeqsHomology(QWidget):
         gridlayout_data.addWidget(self.radiobutton_fasta_file, 2, 0, 1, 1)
         gridlayout_data.addWidget(self.lineedit_fasta_file, 2, 1, 1, 4)
         gridlayout_data.addWidget(self.pushbutton_search_fasta_file, 2, 5, 1, 1)
+        gridlayout_data.addWidget(label_container, 3, 0, 1, 1)
+        gridlayout_data.addWidget(self.combobox_container, 3, 1, 1, 1, alignment=Qt.AlignLeft)
 
         # create and configure "groupbox_data"
         groupbox_data = QGroupBox()
@@ -280,6 +294,9 @@ class FormSearchSeqsHomology(QWidget):
         # populate data in "combobox_fasta_type"
         self.combobox_fasta_type_populate()
 
+        # populate data in "combobox_container"
+        self.combobox_container_populate()
+
         # set initial value in "plaintextedit_seqs_list"
         self.plaintextedit_seqs_list.setPlaceholderText('')
 
@@ -397,6 +414,19 @@ class FormSearchSeqsHomology(QWidget):
 
     #---------------
 
+    def combobox_container_populate(self):
+        '''
+        Populate data in "combobox_container".
+        '''
+
+        # populate data in "combobox_container"
+        self.combobox_container.addItems(genlib.get_yn_code_list())
+
+        # set the default value
+        self.combobox_container.setCurrentText(genlib.Const.DEFAULT_CONTAINER)
+
+    #---------------
+
     def lineedit_fasta_file_editing_finished(self):
         '''
         Perform necessary actions after finishing editing "lineedit_fasta_file"
@@ -481,6 +511,9 @@ class FormSearchSeqsHomology(QWidget):
             # get the FASTA type
             fasta_type = self.combobox_fasta_type.currentText()
 
+            # get the consolidated output indicator
+            container = self.combobox_container.currentText()
+
             # get the FASTA file
             fasta_sequences = ''
             fasta_file = ''
@@ -492,7 +525,7 @@ class FormSearchSeqsHomology(QWidget):
                     fasta_file = genlib.windows_path_2_wsl_path(fasta_file)
 
             # create and execute "DialogProcess"
-            process = dialogs.DialogProcess(self, self.head, self.search_seqs_homology, threads, fasta_type, self.fasta_source, fasta_sequences, fasta_file)
+            process = dialogs.DialogProcess(self, self.head, self.search_seqs_homology, threads, fasta_type, container, self.fasta_source, fasta_sequences, fasta_file)
             process.exec()
 
         # close the windows
@@ -512,7 +545,7 @@ class FormSearchSeqsHomology(QWidget):
 
    #---------------
 
-    def search_seqs_homology(self, process, threads, fasta_type, fasta_source, fasta_sequences, fasta_file):
+    def search_seqs_homology(self, process, threads, fasta_type, container, fasta_source, fasta_sequences, fasta_file):
         '''
         Run a search of sequences homology.
         '''
@@ -570,7 +603,7 @@ class FormSearchSeqsHomology(QWidget):
             process.write(f'{genlib.get_separator()}\n')
             script_name = f'{genlib.get_process_search_seqs_homology_code()}-process.sh'
             process.write(f'Building the process script {script_name} ...\n')
-            (OK, _) = self.build_search_seqs_homology_script(temp_dir, script_name, current_run_dir, threads, fasta_type, fasta_source, fasta_sequences, fasta_file)
+            (OK, _) = self.build_search_seqs_homology_script(temp_dir, script_name, current_run_dir, threads, fasta_type, container, fasta_source, fasta_sequences, fasta_file)
             if OK:
                 process.write('The file is built.\n')
             else:
@@ -654,7 +687,7 @@ class FormSearchSeqsHomology(QWidget):
 
     #---------------
 
-    def build_search_seqs_homology_script(self, directory, script_name, current_run_dir, threads, fasta_type, fasta_source, fasta_sequences, fasta_file):
+    def build_search_seqs_homology_script(self, directory, script_name, current_run_dir, threads, fasta_type, container, fasta_source, fasta_sequences, fasta_file):
         '''
         Build the script to run a homology relationships pipeline.
         '''
@@ -755,6 +788,7 @@ class FormSearchSeqsHomology(QWidget):
                 file_id.write(f'        echo "[Search parameters]" > {params_file}\n')
                 file_id.write(f'        echo "fasta_type = {fasta_type}" >> {params_file}\n')
                 file_id.write(f'        echo "fasta_file = {fasta_file}" >> {params_file}\n')
+                file_id.write(f'        echo "container = {container}" >> {params_file}\n')
                 file_id.write(f'        echo "codan_model = {codan_model}" >> {params_file}\n')
                 file_id.write(f'        echo "alignment_tool = {alignment_tool}" >> {params_file}\n')
                 file_id.write(f'        echo "evalue = {evalue}" >> {params_file}\n')
@@ -947,6 +981,7 @@ class FormSearchSeqsHomology(QWidget):
                     file_id.write(f'                --analysis={fasta_file} \\\n')
                 file_id.write(f'                --consensus={quercus_sequence_file} \\\n')
                 file_id.write(f'                --outdir={seqs_alignments_dir} \\\n')
+                file_id.write(f'                --container={container} \\\n')
                 file_id.write( '                --verbose=N \\\n')
                 file_id.write( '                --trace=N\n')
                 file_id.write( '        RC=$?\n')
@@ -967,24 +1002,23 @@ class FormSearchSeqsHomology(QWidget):
                 file_id.write( '        echo "This step was previously run."\n')
                 file_id.write( '    else\n')
                 file_id.write(f'        source {miniforge3_bin_dir}/activate {genlib.get_mafft_environment()}\n')
-                file_id.write(f'        FASTA_FILE_LIST={seqs_alignments_dir}/fasta_file_list.txt\n')
-                file_id.write(f'        ls {seqs_alignments_dir}/*.fasta > $FASTA_FILE_LIST\n')
-                file_id.write( '        while read FASTA_FILE; do\n')
-                file_id.write( '            ALIGNMENT_FILE=`echo $FASTA_FILE | sed "s/.fasta/.aln/g"`\n')
-                file_id.write( '            if [[ "$FASTA_FILE" == *homologous-proteins.fasta ]]; then\n')
-                file_id.write( '                TREE=Y\n')
-                file_id.write( '            else\n')
-                file_id.write( '                TREE=N\n')
-                file_id.write( '            fi\n')
-                file_id.write( '            /usr/bin/time \\\n')
-                file_id.write(f'                {app_dir}/align-fasta-seqs.py \\\n')
-                file_id.write( '                    --seqs=$FASTA_FILE \\\n')
-                file_id.write( '                    --tree=$TREE \\\n')
-                file_id.write( '                    --verbose=N \\\n')
-                file_id.write( '                    --trace=N\n')
-                file_id.write( '            RC=$?\n')
-                file_id.write( '            if [ $RC -ne 0 ]; then manage_error align-fasta-seqs.py $RC; fi\n')
-                file_id.write( '        done < $FASTA_FILE_LIST\n')
+                for (fasta_file_name, tree) in [(genlib.get_homologous_proteins_file_name(), 'Y'), (genlib.get_homologous_genes_file_name(), 'N')]:
+                    if container != 'Y':
+                        file_id.write(f'        FASTA_FILE_LIST={seqs_alignments_dir}/{fasta_file_name}-list.txt\n')
+                        file_id.write(f'        find {seqs_alignments_dir} -maxdepth 1 -name "*-{fasta_file_name}" | sort > $FASTA_FILE_LIST\n')
+                    file_id.write( '        /usr/bin/time \\\n')
+                    file_id.write(f'            {app_dir}/align-fasta-seqs.py \\\n')
+                    if container == 'Y':
+                        file_id.write(f'                --seqs={seqs_alignments_dir}/{fasta_file_name} \\\n')
+                        file_id.write( '                --container=Y \\\n')
+                    else:
+                        file_id.write( '                --seqs-list=$FASTA_FILE_LIST \\\n')
+                    file_id.write(f'                --tree={tree} \\\n')
+                    file_id.write(f'                --threads={threads} \\\n')
+                    file_id.write( '                --verbose=N \\\n')
+                    file_id.write( '                --trace=N\n')
+                    file_id.write( '        RC=$?\n')
+                    file_id.write( '        if [ $RC -ne 0 ]; then manage_error align-fasta-seqs.py $RC; fi\n')
                 file_id.write( '        conda deactivate\n')
                 file_id.write( '        echo "FASTA files are aligned."\n')
                 file_id.write( '        touch $STEP_STATUS\n')
@@ -2490,11 +2524,14 @@ class FormGetProteinIdsHomology(QWidget):
         # initialize the homology relationships dictionary
         homology_relationships_dict = genlib.NestedDefaultDict()
 
+        # get the homology graphs (protein isoforms with the data of their orthologous proteins) of the reference protein identifications
+        homology_graph_per_protein_dict = sqllib.get_protein_homology_graph_dict_many(self.comparative_genomics_database_conn, reference_protein_ids_list)
+
         # for each identification in the list of reference protein identifications
         for reference_protein_id in sorted(reference_protein_ids_list):
 
             # get the list of protein isoforms corresponding to the reference protein identification
-            mmseqs2_protein_isoforms_list = sqllib.get_mmseqs2_protein_isoforms_list(self.comparative_genomics_database_conn, '', [reference_protein_id])
+            mmseqs2_protein_isoforms_list = homology_graph_per_protein_dict.get(reference_protein_id, [])
 
             # build the list of protein isoforms identification corresponding to the reference protein identification
             reference_protein_isoform_ids_list = []
@@ -2513,11 +2550,11 @@ class FormGetProteinIdsHomology(QWidget):
                     protein_isoform_ids = '|'.join(sorted(reference_protein_isoform_ids_list_reviewed))
                     homology_relationships_dict[f'{reference_protein_id}-{species_id}-{gene_id}'] = {'reference_protein_id': reference_protein_id, 'species_id': species_id, 'species_name': species_name, 'gene_id':gene_id, 'protein_isoform_ids': protein_isoform_ids}
 
-                # for each identification in the list of protein isoforms corresponding to the reference protein identification
-                for reference_protein_isoform_id in reference_protein_isoform_ids_list:
+                # for each protein isoform corresponding to the reference protein identification
+                for protein_isoform_data in mmseqs2_protein_isoforms_list:
 
                     # get data of the orthologous proteins
-                    orthologous_protein_data_list = sqllib.get_orthologous_protein_data_list(self.comparative_genomics_database_conn, reference_protein_isoform_id)
+                    orthologous_protein_data_list = protein_isoform_data['orthologous_protein_data_list']
 
                     # check if there are data of orthologous proteins:
                     if orthologous_protein_data_list:
@@ -2591,6 +2628,16 @@ class FormGetProteinIdsHomology(QWidget):
                 protein_isoform_ids = homology_relationships_dict[key]['protein_isoform_ids']
                 homology_relationships_file_id.write(f'{reference_protein_id};{species_id};{gene_id};{protein_isoform_ids}\n')
 
+        # get the sequences and data of the reference proteins and of the protein isoforms
+        reference_protein_id_list = [data['reference_protein_id'] for data in homology_relationships_dict.values()]
+        protein_isoform_id_list = [protein_isoform_id for data in homology_relationships_dict.values() for protein_isoform_id in data['protein_isoform_ids'].split('|')]
+        protein_seq_per_protein_dict = sqllib.get_protein_seq_dict_many(self.sequences_database_conn, reference_protein_id_list + protein_isoform_id_list)
+        protein_data_per_protein_dict = sqllib.get_mmseqs2_protein_data_dict_many(self.comparative_genomics_database_conn, reference_protein_id_list)
+
+        # get the sequences of the genes of the reference proteins and of the homologous genes
+        gene_id_list = [data['gene_id'] for data in protein_data_per_protein_dict.values()] + [data['gene_id'] for data in homology_relationships_dict.values()]
+        gene_seq_per_gene_dict = sqllib.get_gene_seq_dict_many(self.sequences_database_conn, gene_id_list)
+
         # open the homology relationships file
         try:
             homology_relationships_file_id = open(homology_relationships_file, mode='r', encoding='iso-8859-1')
@@ -2628,19 +2675,19 @@ class FormGetProteinIdsHomology(QWidget):
                 raise genlib.ProgramException(e, 'F003', gene_seq_fasta_file)
 
             # get the sequence of the protein identification
-            protein_id_seq_dict = sqllib.get_protein_seq_dict(self.sequences_database_conn, w_seq_id)
+            protein_id_seq_dict = protein_seq_per_protein_dict[w_seq_id]
 
             # write the sequence of the protein identification in the the protein sequence FASTA file
             protein_seq_fasta_file_id.write(f'>{w_seq_id}[{protein_id_seq_dict['species_id']}]\n')
             protein_seq_fasta_file_id.write(f'{protein_id_seq_dict['seq']}\n')
 
             # get the gene identification and species corresponding to que protein identification
-            protein_data_dict = sqllib.get_mmseqs2_protein_data_dict(self.comparative_genomics_database_conn, w_seq_id)
+            protein_data_dict = protein_data_per_protein_dict[w_seq_id]
             protein_gene_id = protein_data_dict['gene_id']
             species_id = protein_data_dict['species_id']
 
             # get the gene sequence data of protein identification
-            gene_seq_dict = sqllib.get_gene_seq_dict(self.sequences_database_conn, protein_gene_id)
+            gene_seq_dict = gene_seq_per_gene_dict[protein_gene_id]
             gene_seq = gene_seq_dict['seq']
 
             # write the gene sequence of the protein identification in the  the protein FASTA sequence file
@@ -2660,7 +2707,7 @@ class FormGetProteinIdsHomology(QWidget):
                 for protein_isoform_id in sorted(protein_isoform_id_list):
 
                     # get the protein isoform sequence data
-                    protein_isoform_seq_dict = sqllib.get_protein_seq_dict(self.sequences_database_conn, protein_isoform_id)
+                    protein_isoform_seq_dict = protein_seq_per_protein_dict[protein_isoform_id]
                     protein_isoform_seq = protein_isoform_seq_dict['seq']
 
                     # write the protein isoform sequence in the protein sequence FASTA file
@@ -2670,7 +2717,7 @@ class FormGetProteinIdsHomology(QWidget):
                     # print(f"homology_relationships_data_dict['gene_id']: {homology_relationships_data_dict['gene_id']}")
 
                     # get the gene sequence data of protein isoform
-                    gene_seq_dict = sqllib.get_gene_seq_dict(self.sequences_database_conn, homology_relationships_data_dict['gene_id'])
+                    gene_seq_dict = gene_seq_per_gene_dict[homology_relationships_data_dict['gene_id']]
                     gene_isoform_seq = gene_seq_dict['seq']
 
                     # print(f"gene_isoform_seq: {gene_isoform_seq}")
@@ -0,0 +1,107 @@
+@echo off
+
+rem ----------------------------------------------------------------------------
+
+rem This script executes a test of the program concat-functional-annotations.py
+rem in a Windows environment: the functional annotation files got resolving the
+rem cluster annotation data one by one (--batch-size=0) and in batches have to
+rem be equal.
+
+rem This software has been developed by:
+rem
+rem     GI en Desarrollo de Especies y Comunidades Leñosas (WooSp)
+rem     Dpto. Sistemas y Recursos Naturales
+rem     ETSI Montes, Forestal y del Medio Natural
+rem     Universidad Politecnica de Madrid
+rem     https://github.com/ggfhf/
+rem
+rem Licence: GNU General Public Licence Version 3.
+
+rem ----------------------------------------------------------------------------
+
+rem Control parameters
+
+if not "%*" == "" (set ERROR=1 & goto END)
+
+rem ----------------------------------------------------------------------------
+
+rem Set run environment
+
+setlocal EnableDelayedExpansion
+
+set ERROR=0
+
+set PYTHON=python.exe
+set PYTHON_OPTIONS=
+set PYTHONPATH=.
+
+set APP_DIR=C:\Users\FMM\Documents\ProyectosVS\quercusTOA\quercusTOA
+set DATA_DIR=%APP_DIR%\data
+set OUTPUT_DIR=%APP_DIR%\output
+
+if not exist %OUTPUT_DIR% (mkdir %OUTPUT_DIR%)
+
+set INITIAL_DIR=%cd%
+cd %APP_DIR%
+
+rem ----------------------------------------------------------------------------
+
+rem Execute the program concat-functional-annotations.py resolving the cluster annotation data
+rem one by one (point mode) and in batches (batch mode)
+
+for %%M in (point batch) do (
+    if "%%M" == "point" (set BATCH_SIZE=0) else (set BATCH_SIZE=5000)
+    python.exe %PYTHON_OPTIONS% concat-functional-annotations.py ^
+        --db=%DATA_DIR%\quercusTOA.db ^
+        --blastp-alignments=%DATA_DIR%\blastp-Quercus-alignments.csv ^
+        --blastx-alignments=%DATA_DIR%\blastx-Quercus-alignments.csv ^
+        --blastn-alignments=%DATA_DIR%\blastn-lncRNA-alignments.csv ^
+        --transcripts_geneid=%DATA_DIR%\transcripts-geneid.csv ^
+        --complete_annotations=%OUTPUT_DIR%\complete_functional-annotations-%%M.csv ^
+        --besthit_annotations=%OUTPUT_DIR%\besthit_functional-annotations-%%M.csv ^
+        --batch-size=!BATCH_SIZE! ^
+        --threads=1 ^
+        --verbose=N ^
+        --trace=N
+    if !ERRORLEVEL! neq 0 (set RC=!ERRORLEVEL! & set ERROR=2 & goto END)
+)
+
+rem ----------------------------------------------------------------------------
+
+rem Compare the functional annotation files of both modes
+
+for %%T in (complete besthit) do (
+    fc /b %OUTPUT_DIR%\%%T_functional-annotations-point.csv %OUTPUT_DIR%\%%T_functional-annotations-batch.csv > nul
+    if !ERRORLEVEL! neq 0 (set ERROR=3 & goto END)
+)
+echo The functional annotation files of both modes are equal.
+
+rem ----------------------------------------------------------------------------
+
+:END
+
+cd %INITIAL_DIR%
+
+if %ERROR% equ 0 (
+    rem -- exit 0
+)
+
+if %ERROR% equ 1 (
+    echo *** ERROR: This script does not have input parameters.
+    rem -- pause
+    rem -- exit %RC%
+)
+
+if %ERROR% equ 2 (
+    echo *** ERROR: The program ended with return code %RC%.
+    rem -- pause
+    rem -- exit %RC%
+)
+
+if %ERROR% equ 3 (
+    echo *** ERROR: The functional annotation files of both modes are different.
+    rem -- pause
+    rem -- exit 1
+)
+
+rem ----------------------------------------------------------------------------
@@ -0,0 +1,80 @@
+#!/bin/bash
+
+#-------------------------------------------------------------------------------
+
+# This script executes a test of the program concat-functional-annotations.py
+# in a Linux environment: the functional annotation files got resolving the
+# cluster annotation data one by one (--batch-size=0) and in batches have to
+# be equal.
+#
+# This software has been developed by:
+#
+#    GI en Desarrollo de Especies y Comunidades Leñosas (WooSp)
+#    Dpto. Sistemas y Recursos Naturales
+#    ETSI Montes, Forestal y del Medio Natural
+#    Universidad Politecnica de Madrid
+#    https://github.com/ggfhf/
+#
+# Licence: GNU General Public Licence Version 3.
+
+#-------------------------------------------------------------------------------
+
+# Control parameters
+
+if [ -n "$*" ]; then echo 'This script does not have parameters'; exit 1; fi
+
+#-------------------------------------------------------------------------------
+
+# Set run environment
+
+APP_DIR=$QUERCUSTOA
+DATA_DIR=$APP_DIR/data
+OUTPUT_DIR=$APP_DIR/output
+
+if [ ! -d "$OUTPUT_DIR" ]; then mkdir --parents $OUTPUT_DIR; fi
+
+INITIAL_DIR=$(pwd)
+cd $APP_DIR
+
+#-------------------------------------------------------------------------------
+
+# Run the program concat-functional-annotations.py resolving the cluster annotation data
+# one by one (point mode) and in batches (batch mode)
+
+for MODE in point batch; do
+    if [ "$MODE" == "point" ]; then BATCH_SIZE=0; else BATCH_SIZE=5000; fi
+    /usr/bin/time \
+        ./concat-functional-annotations.py \
+            --db=$DATA_DIR/quercusTOA.db \
+            --blastp-alignments=$DATA_DIR/blastp-Quercus-alignments.csv \
+            --blastx-alignments=$DATA_DIR/blastx-Quercus-alignments.csv \
+            --blastn-alignments=$DATA_DIR/blast-lncRNA-alignments.csv \
+            --transcripts_geneid=$DATA_DIR/transcripts-geneid.csv \
+            --complete_annotations=$OUTPUT_DIR/complete_functional-annotations-$MODE.csv \
+            --besthit_annotations=$OUTPUT_DIR/besthit_functional-annotations-$MODE.csv \
+            --batch-size=$BATCH_SIZE \
+            --threads=1 \
+            --verbose=N \
+            --trace=N
+    if [ $? -ne 0 ]; then echo 'Script ended with errors.'; exit 1; fi
+done
+
+#-------------------------------------------------------------------------------
+
+# Compare the functional annotation files of both modes
+
+for FILE_TYPE in complete besthit; do
+    cmp $OUTPUT_DIR/${FILE_TYPE}_functional-annotations-point.csv $OUTPUT_DIR/${FILE_TYPE}_functional-annotations-batch.csv
+    if [ $? -ne 0 ]; then echo "The $FILE_TYPE functional annotation files of both modes are different."; exit 1; fi
+done
+echo 'The functional annotation files of both modes are equal.'
+
+#-------------------------------------------------------------------------------
+
+# End
+
+cd $INITIAL_DIR
+
+exit 0
+
+#-------------------------------------------------------------------------------
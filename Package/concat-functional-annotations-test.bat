@@ -53,6 +53,8 @@ python.exe %PYTHON_OPTIONS% concat-functional-annotations.py ^
     --blastn-alignments=%DATA_DIR%\blastn-lncRNA-alignments.csv ^
     --complete_annotations=%OUTPUT_DIR%\complete_functional-annotations.csv ^
     --besthit_annotations=%OUTPUT_DIR%\besthit_functional-annotations.csv ^
+    --annotations-db=%OUTPUT_DIR%\annotations.db ^
+    --threads=4 ^
     --verbose=Y ^
     --trace=N
 if %ERRORLEVEL% neq 0 (set RC=%ERRORLEVEL% & set ERROR=2 & goto END)
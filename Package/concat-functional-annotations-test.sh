@@ -46,6 +46,8 @@ cd $APP_DIR
         --blastn-alignments=$DATA_DIR/blast-lncRNA-alignments.csv \
         --complete_annotations=$OUTPUT_DIR/complete_functional-annotations.csv \
         --besthit_annotations=$OUTPUT_DIR/besthit_functional-annotations.csv \
+        --annotations-db=$OUTPUT_DIR/annotations.db \
+        --threads=4 \
         --verbose=Y  \
         --trace=N
 if [ $? -ne 0 ]; then echo 'Script ended with errors.'; exit 1; fi
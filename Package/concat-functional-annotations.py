@@ -27,16 +27,24 @@ Licence: GNU General Public Licence Version 3.
 #-------------------------------------------------------------------------------
 
 import argparse
+import concurrent.futures
 import gzip
 import os
 import re
+import shutil
 import sys
+import tempfile
 
 import genlib
 import sqllib
 
 #-------------------------------------------------------------------------------
 
+# data of every process of the pool that concats the functional annotations of the shards
+shard_process_dict = {}
+
+#-------------------------------------------------------------------------------
+
 def main():
     '''
     Main line of the program.
@@ -50,15 +58,28 @@ def main():
     args = parser.parse_args()
     check_args(args)
 
+    # enable the SQL instrumentation
+    if args.profile_sql.upper() == 'Y':
+        sqllib.enable_sql_profiling(os.path.basename(__file__))
+
     # connect to the quercusTOA database
-    conn = sqllib.connect_database(args.quercustoa_database)
+    conn = sqllib.connect_database(args.quercustoa_database, read_only=True, immutable=True)
 
     # concat functional annotations corresponding to the BLAST+ alignments
-    concat_functional_annotations(conn, args.blastp_clade_alignment_file, args.blastx_clade_alignment_file, args.blastn_lncrna_alignment_file, args.transcripts_geneid_file, args.complete_functional_annotation_file, args.besthit_functional_annotation_file)
+    if args.streaming.upper() == 'Y':
+        if args.threads > 1:
+            genlib.Message.print('info', 'The streaming mode is run with only one thread.')
+        concat_functional_annotations_streaming(conn, args.blastp_clade_alignment_file, args.blastx_clade_alignment_file, args.blastn_lncrna_alignment_file, args.transcripts_geneid_file, args.complete_functional_annotation_file, args.besthit_functional_annotation_file, args.cluster_cache_size, args.batch_size, args.sorted_inputs, args.sort_buffer_size)
+    else:
+        concat_functional_annotations(conn, args.quercustoa_database, args.blastp_clade_alignment_file, args.blastx_clade_alignment_file, args.blastn_lncrna_alignment_file, args.transcripts_geneid_file, args.complete_functional_annotation_file, args.besthit_functional_annotation_file, args.cluster_cache_size, args.batch_size, args.threads, args.sort_buffer_size)
 
     # close connection to quercusTOA database
     conn.close()
 
+    # load the functional annotation files into the annotation results database
+    if args.annotation_results_db is not None:
+        build_annotation_results_db(args.annotation_results_db, args.complete_functional_annotation_file, args.besthit_functional_annotation_file, args.batch_size)
+
 #-------------------------------------------------------------------------------
 
 def build_parser():
@@ -80,6 +101,14 @@ def build_parser():
     parser.add_argument('--transcripts_geneid', dest='transcripts_geneid_file', help='Path of the file with transcripts gene identifications (mandatory).')
     parser.add_argument('--complete_annotations', dest='complete_functional_annotation_file', help='Path of the functional annotation file with all hits per sequence (mandatory).')
     parser.add_argument('--besthit_annotations', dest='besthit_functional_annotation_file', help='Path of the functional annotation file with the best hit per sequence (mandatory).')
+    parser.add_argument('--annotations-db', dest='annotation_results_db', help='Path of the database where the functional annotation files are loaded with their terms indexed (optional; it is not built when it is not indicated).')
+    parser.add_argument('--cache-size', dest='cluster_cache_size', help=f'Maximum number of clusters whose annotation data are cached (0 disables the cache); default: {genlib.Const.DEFAULT_CLUSTER_CACHE_SIZE}.')
+    parser.add_argument('--batch-size', dest='batch_size', help=f'Number of alignment records whose cluster annotation data are resolved together in one database query (0 resolves them one by one); default: {genlib.Const.DEFAULT_ANNOTATION_BATCH_SIZE}.')
+    parser.add_argument('--streaming', dest='streaming', help=f'Merge the input files sorted by sequence identification in only one pass keeping in memory only the alignments of a few sequences: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_STREAMING}.')
+    parser.add_argument('--sorted-inputs', dest='sorted_inputs', help=f'The input files are already sorted by sequence identification in byte order (e.g. with "LC_ALL=C sort"), so they are not sorted again in the streaming mode: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_SORTED_INPUTS}.')
+    parser.add_argument('--sort-buffer-size', dest='sort_buffer_size', help=f'Memory size in MiB of the records sorted together before saving them in a temporal file (the functional annotation files are written sorted); default: {genlib.Const.DEFAULT_SORT_BUFFER_SIZE}.')
+    parser.add_argument('--threads', dest='threads', help=f'Number of processes that concat the functional annotations of the blastp and blastx alignment files split in shards; default: {genlib.Const.DEFAULT_THREADS}.')
+    parser.add_argument('--profile-sql', dest='profile_sql', help=f'Record the calls, latencies and rows of the database accesses, print a summary at exit and save it as JSON in the current directory: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_PROFILE_SQL} (Y when the environment variable {genlib.get_sql_profile_env_var()} is Y).')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {genlib.get_verbose_code_list_text()}; default: {genlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {genlib.get_trace_code_list_text()}; default: {genlib.Const.DEFAULT_TRACE}.')
 
@@ -146,6 +175,68 @@ def check_args(args):
         genlib.Message.print('error', '*** The functional annotation file with  the best hit per sequence is not indicated in the input arguments.')
         OK = False
 
+    # check "annotation_results_db"
+    if args.annotation_results_db is not None and os.path.isdir(args.annotation_results_db):
+        genlib.Message.print('error', f'*** {args.annotation_results_db} is a directory.')
+        OK = False
+
+    # check "cluster_cache_size"
+    if args.cluster_cache_size is None:
+        args.cluster_cache_size = genlib.Const.DEFAULT_CLUSTER_CACHE_SIZE
+    elif not genlib.check_int(args.cluster_cache_size, minimum=0):
+        genlib.Message.print('error', '*** The cache size has to be an integer number greater than or equal to 0.')
+        OK = False
+    else:
+        args.cluster_cache_size = int(args.cluster_cache_size)
+
+    # check "batch_size"
+    if args.batch_size is None:
+        args.batch_size = genlib.Const.DEFAULT_ANNOTATION_BATCH_SIZE
+    elif not genlib.check_int(args.batch_size, minimum=0):
+        genlib.Message.print('error', '*** The batch size has to be an integer number greater than or equal to 0.')
+        OK = False
+    else:
+        args.batch_size = int(args.batch_size)
+
+    # check "streaming"
+    if args.streaming is None:
+        args.streaming = genlib.Const.DEFAULT_STREAMING
+    elif not genlib.check_code(args.streaming, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** streaming has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
+    # check "sorted_inputs"
+    if args.sorted_inputs is None:
+        args.sorted_inputs = genlib.Const.DEFAULT_SORTED_INPUTS
+    elif not genlib.check_code(args.sorted_inputs, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** sorted-inputs has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
+    # check "sort_buffer_size"
+    if args.sort_buffer_size is None:
+        args.sort_buffer_size = genlib.Const.DEFAULT_SORT_BUFFER_SIZE
+    elif not genlib.check_int(args.sort_buffer_size, minimum=1):
+        genlib.Message.print('error', '*** The sort buffer size has to be an integer number greater than or equal to 1.')
+        OK = False
+    else:
+        args.sort_buffer_size = int(args.sort_buffer_size)
+
+    # check "threads"
+    if args.threads is None:
+        args.threads = genlib.Const.DEFAULT_THREADS
+    elif not genlib.check_int(args.threads, minimum=1):
+        genlib.Message.print('error', '*** The threads number has to be an integer number greater than or equal to 1.')
+        OK = False
+    else:
+        args.threads = int(args.threads)
+
+    # check "profile_sql"
+    if args.profile_sql is None:
+        args.profile_sql = genlib.get_sql_profile_default()
+    elif not genlib.check_code(args.profile_sql, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** profile_sql has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = genlib.Const.DEFAULT_VERBOSE
@@ -170,7 +261,7 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def concat_functional_annotations(conn, blastp_clade_alignment_file, blastx_clade_alignment_file, blastn_lncrna_alignment_file, transcripts_geneid_file, complete_functional_annotation_file, besthit_functional_annotation_file):
+def concat_functional_annotations(conn, quercustoa_database, blastp_clade_alignment_file, blastx_clade_alignment_file, blastn_lncrna_alignment_file, transcripts_geneid_file, complete_functional_annotation_file, besthit_functional_annotation_file, cluster_cache_size, batch_size, threads, sort_buffer_size):
     '''
     Concat functional annotations corresponding to the BLAST+ alignments.
     '''
@@ -178,62 +269,275 @@ def concat_functional_annotations(conn, blastp_clade_alignment_file, blastx_clad
     # initialize the set of sequence identifications aligned
     qseqid_set = set()
 
+    # initialize the cache of cluster annotation data
+    # (in batched mode, it can keep the clusters of a whole block)
+    cluster_annotation_cache = genlib.LRUCache(max(cluster_cache_size, batch_size))
+
+    # check if the database has the table with the summary of the cluster annotation data
+    summary_exists = sqllib.check_table_exists(conn, 'cluster_annotation_summary')
+
     # build the dictionary of transcripts gene identification
     transcripts_geneid_dict = build_transcripts_geneid_dict(transcripts_geneid_file)
 
     # open the functional annotation file with all hits per sequence
-    if complete_functional_annotation_file.endswith('.gz'):
-        try:
-            complete_functional_annotation_file_id = gzip.open(complete_functional_annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
-        except Exception as e:
-            raise genlib.ProgramException(e, 'F004', complete_functional_annotation_file)
-    else:
-        try:
-            complete_functional_annotation_file_id = open(complete_functional_annotation_file, mode='w', encoding='iso-8859-1', newline='\n')
-        except Exception as e:
-            raise genlib.ProgramException(e, 'F003', complete_functional_annotation_file)
+    # (the records are written sorted after the head)
+    complete_functional_annotation_file_id = genlib.SortedTextFileWriter(complete_functional_annotation_file, os.path.dirname(os.path.abspath(complete_functional_annotation_file)), buffer_size=sort_buffer_size, head_record_list=[f'{genlib.get_functional_annotation_head()}\n'])
 
     # initialize the counter of records written in the functional annotation file with all hits per sequence
     complete_functional_annotation_record_counter = 0
 
     # open the functional annotation file with the best hit per sequence
-    if besthit_functional_annotation_file.endswith('.gz'):
-        try:
-            besthit_functional_annotation_file_id = gzip.open(besthit_functional_annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
-        except Exception as e:
-            raise genlib.ProgramException(e, 'F004', besthit_functional_annotation_file)
-    else:
-        try:
-            besthit_functional_annotation_file_id = open(besthit_functional_annotation_file, mode='w', encoding='iso-8859-1', newline='\n')
-        except Exception as e:
-            raise genlib.ProgramException(e, 'F003', besthit_functional_annotation_file)
+    # (the records are written sorted after the head)
+    besthit_functional_annotation_file_id = genlib.SortedTextFileWriter(besthit_functional_annotation_file, os.path.dirname(os.path.abspath(besthit_functional_annotation_file)), buffer_size=sort_buffer_size, head_record_list=[f'{genlib.get_functional_annotation_head()}\n'])
 
     # initialize the counter of records written in the functional annotation file with the best hit per sequence
     besthit_functional_annotation_record_counter = 0
 
-    # open the clade alignment file yielded by blastp
-    if blastp_clade_alignment_file.endswith('.gz'):
+    # concat the functional annotations of the clade alignment files yielded by blastp and blastx
+    # (the sequences annotated with the blastp alignments are not annotated again with the blastx ones)
+    for (clade_alignment_file, algorithm) in [(blastp_clade_alignment_file, 'blastp'), (blastx_clade_alignment_file, 'blastx')]:
+
+        # when there are several threads and the file is not compressed, split it in shards and process them in parallel
+        if threads > 1 and not clade_alignment_file.endswith('.gz'):
+            (complete_record_counter, besthit_record_counter) = concat_alignment_shards(quercustoa_database, cluster_annotation_cache, summary_exists, transcripts_geneid_dict, clade_alignment_file, algorithm, cluster_cache_size, batch_size, threads, qseqid_set, complete_functional_annotation_file, complete_functional_annotation_file_id, besthit_functional_annotation_file_id)
+
+        # otherwise, process the whole file
+        else:
+            if threads > 1:
+                genlib.Message.print('info', f'The file {clade_alignment_file} is compressed and it can not be split in shards, so it is processed with only one thread.')
+            (_, complete_record_counter, besthit_record_counter) = concat_alignment_shard(conn, cluster_annotation_cache, summary_exists, transcripts_geneid_dict, clade_alignment_file, algorithm, 0, None, batch_size, qseqid_set, qseqid_set, complete_functional_annotation_file_id, besthit_functional_annotation_file_id)
+
+        # add the counters of records written in the functional annotation files
+        complete_functional_annotation_record_counter += complete_record_counter
+        besthit_functional_annotation_record_counter += besthit_record_counter
+
+        genlib.Message.print('verbose', '\n')
+
+    # open the lncRNA alignment file yielded by blastn
+    if blastn_lncrna_alignment_file.endswith('.gz'):
         try:
-            blastp_clade_alignment_file_id = gzip.open(blastp_clade_alignment_file, mode='rt', encoding='iso-8859-1')
+            blastn_lncrna_alignment_file_id = gzip.open(blastn_lncrna_alignment_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
-            raise genlib.ProgramException(e, 'F002', blastp_clade_alignment_file)
+            raise genlib.ProgramException(e, 'F002', blastn_lncrna_alignment_file)
     else:
         try:
-            blastp_clade_alignment_file_id = open(blastp_clade_alignment_file, mode='r', encoding='iso-8859-1')
+            blastn_lncrna_alignment_file_id = open(blastn_lncrna_alignment_file, mode='r', encoding='iso-8859-1')
         except Exception as e:
-            raise genlib.ProgramException(e, 'F001', blastp_clade_alignment_file)
+            raise genlib.ProgramException(e, 'F001', blastn_lncrna_alignment_file)
+
+    # initialize the counter of records of the lncRNA alignment file yielded by blastn
+    blastn_lncrna_alignment_record_counter = 0
 
-    # initialize the counter of records corresponding to the clade alignment file yielded by blastp
-    blastp_clade_alignment_record_counter = 0
+    # read the sequence identifications of the lncRNA alignment file yielded by blastn in batches
+    for batch_list in genlib.read_alignment_outfmt6_batches(blastn_lncrna_alignment_file, blastn_lncrna_alignment_file_id, column_list=['qseqid']):
+        for (qseqid,) in batch_list:
 
-    # read the first record of clade alignment file yielded by blastp
-    (blastp_clade_alignment_record, _, blastp_clade_alignment_data_dict) = genlib.read_alignment_outfmt6_record(blastp_clade_alignment_file, blastp_clade_alignment_file_id, blastp_clade_alignment_record_counter)
+            # add 1 to record counter
+            blastn_lncrna_alignment_record_counter += 1
 
-    # while there are records in the clade alignment file yielded by blastp
-    while blastp_clade_alignment_record != '':
+            # set the algorithm
+            algorithm = 'blastn'
 
-        # initialize the old sequence identifications
-        old_qseqid = blastp_clade_alignment_data_dict['qseqid']
+            # when the sequence identification is not in the sequence identification set
+            if qseqid not in qseqid_set:
+
+                # add the sequence identification to the set of sequence identifications aligned
+                qseqid_set.add(qseqid)
+
+                # write record in the functional annotation files
+                # -- functional_annotation_record = f'{qseqid};{genlib.get_potential_lncrn()};-;-;-;-;-;-;-;-;-;-;{algorithm};-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-'
+                functional_annotation_record = f'{qseqid};{genlib.get_potential_lncrn()};-;-;-;-;-;-;-;-;-;-;{algorithm};-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-'
+                complete_functional_annotation_file_id.write(f'{functional_annotation_record}\n')
+                besthit_functional_annotation_file_id.write(f'{functional_annotation_record}\n')
+
+                # add 1 to the counter of records written in the functional annotation file with all hits per sequence
+                complete_functional_annotation_record_counter += 1
+
+                # add 1 to the counter of records written in the functional annotation file with the best hit per sequence
+                besthit_functional_annotation_record_counter += 1
+
+            # print counters
+            genlib.Message.print('verbose', f'\rblastn lncRNA alignment file: {blastn_lncrna_alignment_record_counter} processed records')
+
+    # close the lncRNA alignment file yielded by blastn
+    blastn_lncrna_alignment_file_id.close()
+
+    # close output files
+    complete_functional_annotation_file_id.close()
+    besthit_functional_annotation_file_id.close()
+
+    genlib.Message.print('verbose', '\n')
+    genlib.Message.print('info', f'The file {complete_functional_annotation_file} is created with {complete_functional_annotation_record_counter} records.')
+    genlib.Message.print('info', f'The file {besthit_functional_annotation_file} is created with {besthit_functional_annotation_record_counter} records.')
+    genlib.Message.print('info', f'Cluster annotation cache: {cluster_annotation_cache.get_stats_text()}.')
+
+#-------------------------------------------------------------------------------
+
+def concat_functional_annotations_streaming(conn, blastp_clade_alignment_file, blastx_clade_alignment_file, blastn_lncrna_alignment_file, transcripts_geneid_file, complete_functional_annotation_file, besthit_functional_annotation_file, cluster_cache_size, batch_size, sorted_inputs, sort_buffer_size):
+    '''
+    Concat functional annotations corresponding to the BLAST+ alignments merging in only one pass
+    the alignment files and the file of transcripts gene identifications sorted by sequence identification,
+    so only the alignments of a few sequences are kept in memory. When the input files are not sorted,
+    they are previously sorted in temporal files. The functional annotation files are written sorted
+    by sequence identification.
+    '''
+
+    # initialize the cache of cluster annotation data
+    # (in batched mode, it can keep the clusters of a whole block)
+    cluster_annotation_cache = genlib.LRUCache(max(cluster_cache_size, batch_size))
+
+    # check if the database has the table with the summary of the cluster annotation data
+    summary_exists = sqllib.check_table_exists(conn, 'cluster_annotation_summary')
+
+    # create the temporal directory of the sorted input files
+    temp_dir = tempfile.mkdtemp(prefix='concat-streaming-', dir=os.path.dirname(os.path.abspath(complete_functional_annotation_file)))
+
+    try:
+
+        # sort the input files by sequence identification
+        if sorted_inputs.upper() == 'N':
+            genlib.Message.print('info', 'Sorting the input files by sequence identification ...')
+            sorted_blastp_clade_alignment_file = f'{temp_dir}/blastp-clade-alignments.csv'
+            genlib.sort_text_file(blastp_clade_alignment_file, sorted_blastp_clade_alignment_file, get_alignment_record_qseqid, temp_dir, buffer_size=sort_buffer_size)
+            sorted_blastx_clade_alignment_file = f'{temp_dir}/blastx-clade-alignments.csv'
+            genlib.sort_text_file(blastx_clade_alignment_file, sorted_blastx_clade_alignment_file, get_alignment_record_qseqid, temp_dir, buffer_size=sort_buffer_size)
+            sorted_blastn_lncrna_alignment_file = f'{temp_dir}/blastn-lncrna-alignments.csv'
+            genlib.sort_text_file(blastn_lncrna_alignment_file, sorted_blastn_lncrna_alignment_file, get_alignment_record_qseqid, temp_dir, buffer_size=sort_buffer_size)
+            sorted_transcripts_geneid_file = f'{temp_dir}/transcripts-geneid.csv'
+            genlib.sort_text_file(transcripts_geneid_file, sorted_transcripts_geneid_file, get_transcripts_geneid_record_seq_id, temp_dir, buffer_size=sort_buffer_size, head_number=1)
+            genlib.Message.print('info', 'The input files are sorted.')
+        else:
+            sorted_blastp_clade_alignment_file = blastp_clade_alignment_file
+            sorted_blastx_clade_alignment_file = blastx_clade_alignment_file
+            sorted_blastn_lncrna_alignment_file = blastn_lncrna_alignment_file
+            sorted_transcripts_geneid_file = transcripts_geneid_file
+
+        # open the functional annotation file with all hits per sequence
+        # (the records are written sorted after the head)
+        complete_functional_annotation_file_id = genlib.SortedTextFileWriter(complete_functional_annotation_file, os.path.dirname(os.path.abspath(complete_functional_annotation_file)), buffer_size=sort_buffer_size, head_record_list=[f'{genlib.get_functional_annotation_head()}\n'])
+
+        # initialize the counter of records written in the functional annotation file with all hits per sequence
+        complete_functional_annotation_record_counter = 0
+
+        # open the functional annotation file with the best hit per sequence
+        # (the records are written sorted after the head)
+        besthit_functional_annotation_file_id = genlib.SortedTextFileWriter(besthit_functional_annotation_file, os.path.dirname(os.path.abspath(besthit_functional_annotation_file)), buffer_size=sort_buffer_size, head_record_list=[f'{genlib.get_functional_annotation_head()}\n'])
+
+        # initialize the counter of records written in the functional annotation file with the best hit per sequence
+        besthit_functional_annotation_record_counter = 0
+
+        # create the readers of the input files and read their first sequence
+        blastp_clade_alignment_reader = read_alignment_groups(sorted_blastp_clade_alignment_file)
+        (blastp_qseqid, blastp_data_dict_list) = next(blastp_clade_alignment_reader)
+        blastx_clade_alignment_reader = read_alignment_groups(sorted_blastx_clade_alignment_file)
+        (blastx_qseqid, blastx_data_dict_list) = next(blastx_clade_alignment_reader)
+        blastn_lncrna_alignment_reader = read_alignment_groups(sorted_blastn_lncrna_alignment_file)
+        (blastn_qseqid, blastn_data_dict_list) = next(blastn_lncrna_alignment_reader)
+        transcripts_geneid_reader = read_transcripts_geneid_pairs(sorted_transcripts_geneid_file)
+        (geneid_seq_id, geneid_gene_id) = next(transcripts_geneid_reader)
+
+        # initialize the list of alignment groups pending to be written and their record counter
+        group_list = []
+        group_record_counter = 0
+
+        # initialize the sequence counter
+        sequence_counter = 0
+
+        # while there are sequences in any alignment file
+        while blastp_qseqid is not None or blastx_qseqid is not None or blastn_qseqid is not None:
+
+            # get the lowest sequence identification
+            qseqid = min(seq_id for seq_id in [blastp_qseqid, blastx_qseqid, blastn_qseqid] if seq_id is not None)
+
+            # get the Quercus lobate gene identification
+            while geneid_seq_id is not None and geneid_seq_id < qseqid:
+                (geneid_seq_id, geneid_gene_id) = next(transcripts_geneid_reader)
+            qlobata_gene_id = geneid_gene_id if geneid_seq_id == qseqid else '-'
+
+            # add the alignment group of the sequence
+            # (blastp alignments have priority over blastx ones, and these ones over blastn ones)
+            if blastp_qseqid == qseqid:
+                group_list.append(('blastp', blastp_data_dict_list, qlobata_gene_id))
+                group_record_counter += len(blastp_data_dict_list)
+            elif blastx_qseqid == qseqid:
+                group_list.append(('blastx', blastx_data_dict_list, qlobata_gene_id))
+                group_record_counter += len(blastx_data_dict_list)
+            else:
+                group_list.append(('blastn', blastn_data_dict_list, qlobata_gene_id))
+                group_record_counter += 1
+
+            # read the next sequence of the alignment files with the current sequence
+            if blastp_qseqid == qseqid:
+                (blastp_qseqid, blastp_data_dict_list) = next(blastp_clade_alignment_reader)
+            if blastx_qseqid == qseqid:
+                (blastx_qseqid, blastx_data_dict_list) = next(blastx_clade_alignment_reader)
+            if blastn_qseqid == qseqid:
+                (blastn_qseqid, blastn_data_dict_list) = next(blastn_lncrna_alignment_reader)
+
+            # write the pending alignment groups when they have a whole block of records
+            if group_record_counter >= max(batch_size, 1):
+                (complete_record_counter, besthit_record_counter) = write_alignment_groups(conn, cluster_annotation_cache, summary_exists, group_list, batch_size, complete_functional_annotation_file_id, besthit_functional_annotation_file_id)
+                complete_functional_annotation_record_counter += complete_record_counter
+                besthit_functional_annotation_record_counter += besthit_record_counter
+                group_list = []
+                group_record_counter = 0
+
+            # print counters
+            sequence_counter += 1
+            genlib.Message.print('verbose', f'\rAlignment files: {sequence_counter} processed sequences')
+
+        # write the rest of pending alignment groups
+        (complete_record_counter, besthit_record_counter) = write_alignment_groups(conn, cluster_annotation_cache, summary_exists, group_list, batch_size, complete_functional_annotation_file_id, besthit_functional_annotation_file_id)
+        complete_functional_annotation_record_counter += complete_record_counter
+        besthit_functional_annotation_record_counter += besthit_record_counter
+
+        # close output files
+        complete_functional_annotation_file_id.close()
+        besthit_functional_annotation_file_id.close()
+
+    finally:
+
+        # delete the temporal directory of the sorted input files
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    genlib.Message.print('verbose', '\n')
+    genlib.Message.print('info', f'The file {complete_functional_annotation_file} is created with {complete_functional_annotation_record_counter} records.')
+    genlib.Message.print('info', f'The file {besthit_functional_annotation_file} is created with {besthit_functional_annotation_record_counter} records.')
+    genlib.Message.print('info', f'Cluster annotation cache: {cluster_annotation_cache.get_stats_text()}.')
+
+#-------------------------------------------------------------------------------
+
+def write_alignment_groups(conn, cluster_annotation_cache, summary_exists, group_list, batch_size, complete_functional_annotation_file_id, besthit_functional_annotation_file_id):
+    '''
+    Write the functional annotation records of a list of alignment groups, each one with the algorithm,
+    the alignments and the Quercus lobata gene identification of a sequence. Return the counters
+    of records written in the functional annotation files.
+    '''
+
+    # initialize the counters of records written in the functional annotation files
+    complete_functional_annotation_record_counter = 0
+    besthit_functional_annotation_record_counter = 0
+
+    # resolve the annotation data of the clusters
+    # (they are kept until the groups are written because the groups can have more clusters than the cache size)
+    if batch_size > 0:
+        cluster_annotation_data_dict = resolve_cluster_annotation_data(conn, cluster_annotation_cache, [data_dict['sseqid'] for (algorithm, data_dict_list, _) in group_list if algorithm != 'blastn' for data_dict in data_dict_list])
+    else:
+        cluster_annotation_data_dict = {}
+
+    # write the records of every alignment group
+    for (algorithm, data_dict_list, qlobata_gene_id) in group_list:
+
+        # when the alignments are blastn ones, write the record of a potential lncRNA
+        if algorithm == 'blastn':
+            qseqid = data_dict_list[0]['qseqid']
+            # -- functional_annotation_record = f'{qseqid};{genlib.get_potential_lncrn()};-;-;-;-;-;-;-;-;-;-;{algorithm};-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-'
+            functional_annotation_record = f'{qseqid};{genlib.get_potential_lncrn()};-;-;-;-;-;-;-;-;-;-;{algorithm};-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-'
+            complete_functional_annotation_file_id.write(f'{functional_annotation_record}\n')
+            besthit_functional_annotation_file_id.write(f'{functional_annotation_record}\n')
+            complete_functional_annotation_record_counter += 1
+            besthit_functional_annotation_record_counter += 1
+            continue
 
         # initialize the best evalue and pident
         best_evalue = 1.
@@ -242,122 +546,554 @@ def concat_functional_annotations(conn, blastp_clade_alignment_file, blastx_clad
         # initialize the functional annotation record with the best evalue and pident
         best_functional_annotation_record = ''
 
-        # while there are records and the same sequence identification
-        while blastp_clade_alignment_record != '' and blastp_clade_alignment_data_dict['qseqid'] == old_qseqid:
-
-            # add 1 to record counter
-            blastp_clade_alignment_record_counter += 1
-
-            # get alignment data
-            qseqid = blastp_clade_alignment_data_dict['qseqid']
-            sseqid = blastp_clade_alignment_data_dict['sseqid']
-            pident = blastp_clade_alignment_data_dict['pident']
-            length = blastp_clade_alignment_data_dict['length']
-            mismatch = blastp_clade_alignment_data_dict['mismatch']
-            gapopen = blastp_clade_alignment_data_dict['gapopen']
-            qstart = blastp_clade_alignment_data_dict['qstart']
-            qend = blastp_clade_alignment_data_dict['qend']
-            sstart = blastp_clade_alignment_data_dict['sstart']
-            send = blastp_clade_alignment_data_dict['send']
-            evalue = blastp_clade_alignment_data_dict['evalue']
-            bitscore = blastp_clade_alignment_data_dict['bitscore']
-            algorithm = 'blastp'
-
-            # get the most frecuent species in sseqid
-            (protein_description, protein_species) = sqllib.get_mmseqs2_seq_mf_data(conn, sseqid)
-
-            # get the TAIR10 ortholog sequence identification
-            tair10_ortholog_seq_id = sqllib.get_tair10_ortholog_seq_id(conn, sseqid)
-
-            # get the description of TAIR10 ortholog sequence identification
-            tair10_description = sqllib.get_tair10_peptide_description(conn, tair10_ortholog_seq_id).replace(';','')
+        # write the record of every alignment
+        for data_dict in data_dict_list:
 
-            # get the Quercus lobate gene identification
-            qlobata_gene_id = transcripts_geneid_dict.get(qseqid, '-')
-
-            # get InterproScan functional annotations data
-            interproscan_annotation_dict = sqllib.get_interproscan_annotation_dict(conn, sseqid)
-            interpro_goterms = interproscan_annotation_dict.get('interpro_goterms', '-')
-            panther_goterms = interproscan_annotation_dict.get('panther_goterms', '-')
-            metacyc_pathways = interproscan_annotation_dict.get('metacyc_pathways', '-')
-            # -- reactome_pathways = annotations_dict.get('reactome_pathways', '-')
-
-            # get eggNOG-mapper functional annotations data
-            emapper_annotation_dict = sqllib.get_emapper_annotation_dict(conn, sseqid)
-            eggnog_ortholog_seq_id = emapper_annotation_dict.get('ortholog_seq_id', '-')
-            eggnog_ortholog_species = emapper_annotation_dict.get('ortholog_species', '-')
-            eggnog_ogs = emapper_annotation_dict.get('eggnog_ogs', '-')
-            cog_category = emapper_annotation_dict.get('cog_category', '-')
-            eggnog_description = emapper_annotation_dict.get('description', '-')
-            eggnog_goterms = emapper_annotation_dict.get('goterms', '-')
-            ec = emapper_annotation_dict.get('ec', '-')
-            kegg_kos = emapper_annotation_dict.get('kegg_kos', '-')
-            kegg_pathways = emapper_annotation_dict.get('kegg_pathways', '-')
-            kegg_modules = emapper_annotation_dict.get('kegg_modules', '-')
-            kegg_reactions = emapper_annotation_dict.get('kegg_reactions', '-')
-            kegg_rclasses = emapper_annotation_dict.get('kegg_rclasses', '-')
-            brite = emapper_annotation_dict.get('brite', '-')
-            kegg_tc = emapper_annotation_dict.get('kegg_tc', '-')
-            cazy = emapper_annotation_dict.get('cazy', '-')
-            pfams = emapper_annotation_dict.get('pfams', '-')
+            # get the functional annotation data of the cluster
+            cluster_annotation_dict = cluster_annotation_data_dict.get(data_dict['sseqid'])
+            if cluster_annotation_dict is None:
+                cluster_annotation_dict = get_cluster_annotation_dict(conn, cluster_annotation_cache, summary_exists, data_dict['sseqid'])
 
             # write record of the functional annotation file with all hits per sequence
-            # -- functional_annotation_record = f'{qseqid};{sseqid};{pident};{length};{mismatch};{gapopen};{qstart};{qend};{sstart};{send};{evalue};{bitscore};{algorithm};{protein_description};{protein_species};{tair10_ortholog_seq_id};{tair10_description};{qlobata_gene_id};{interpro_goterms};{panther_goterms};{metacyc_pathways};{reactome_pathways};{eggnog_ortholog_seq_id};{eggnog_ortholog_species};{eggnog_ogs};{cog_category};{eggnog_description};{eggnog_goterms};{ec};{kegg_kos};{kegg_pathways};{kegg_modules};{kegg_reactions};{kegg_rclasses};{brite};{kegg_tc};{cazy};{pfams}'
-            functional_annotation_record = f'{qseqid};{sseqid};{pident};{length};{mismatch};{gapopen};{qstart};{qend};{sstart};{send};{evalue};{bitscore};{algorithm};{protein_description};{protein_species};{tair10_ortholog_seq_id};{tair10_description};{qlobata_gene_id};{interpro_goterms};{panther_goterms};{metacyc_pathways};{eggnog_ortholog_seq_id};{eggnog_ortholog_species};{eggnog_ogs};{cog_category};{eggnog_description};{eggnog_goterms};{ec};{kegg_kos};{kegg_pathways};{kegg_modules};{kegg_reactions};{kegg_rclasses};{brite};{kegg_tc};{cazy};{pfams}'
+            functional_annotation_record = build_functional_annotation_record(data_dict, algorithm, cluster_annotation_dict, qlobata_gene_id)
             complete_functional_annotation_file_id.write(f'{functional_annotation_record}\n')
-
-            # add 1 to the counter of records written in the functional annotation file with all hits per sequence
             complete_functional_annotation_record_counter += 1
 
             # save the record of the secuence with the best evalue and pident
-            if float(evalue) < best_evalue or float(evalue) == best_evalue and float(pident) > best_pident:
+            evalue = float(data_dict['evalue'])
+            pident = float(data_dict['pident'])
+            if evalue < best_evalue or evalue == best_evalue and pident > best_pident:
                 best_functional_annotation_record = functional_annotation_record
-                best_evalue = float(evalue)
-                best_pident = float(pident)
+                best_evalue = evalue
+                best_pident = pident
 
-            # print counters
-            genlib.Message.print('verbose', f'\rblastp clade alignment file: {blastp_clade_alignment_record_counter} processed records')
+        # write record of the functional annotation file with the best hit per sequence
+        besthit_functional_annotation_file_id.write(f'{best_functional_annotation_record}\n')
+        besthit_functional_annotation_record_counter += 1
 
-            # read the next record of clade alignment file yielded by blastp
-            (blastp_clade_alignment_record, _, blastp_clade_alignment_data_dict) = genlib.read_alignment_outfmt6_record(blastp_clade_alignment_file, blastp_clade_alignment_file_id, blastp_clade_alignment_record_counter)
+    # return the counters of records written in the functional annotation files
+    return (complete_functional_annotation_record_counter, besthit_functional_annotation_record_counter)
 
-        # add the sequence identification to the set of sequence identifications aligned
-        qseqid_set.add(old_qseqid)
+#-------------------------------------------------------------------------------
 
-        # write record of the functional annotation file with all hits per sequence
-        besthit_functional_annotation_file_id.write(f'{best_functional_annotation_record}\n')
+def read_alignment_groups(alignment_file):
+    '''
+    Read an alignment file with output format 6 sorted by sequence identification and yield
+    its alignments grouped by sequence identification as (qseqid, data dictionary list) tuples.
+    A None sequence identification is yielded when the file ends.
+    '''
 
-        # add 1 to the counter of records written in the functional annotation file with the best hit per sequence
-        besthit_functional_annotation_record_counter += 1
+    # open the alignment file
+    if alignment_file.endswith('.gz'):
+        try:
+            alignment_file_id = gzip.open(alignment_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F002', alignment_file)
+    else:
+        try:
+            alignment_file_id = open(alignment_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F001', alignment_file)
 
-    genlib.Message.print('verbose', '\n')
+    # get the column list of the alignment files
+    column_list = genlib.get_alignment_outfmt6_column_list()
+
+    # initialize the current group
+    group_qseqid = None
+    group_data_dict_list = []
+
+    # read the records in batches
+    for batch_list in genlib.read_alignment_outfmt6_batches(alignment_file, alignment_file_id):
+        for data_tuple in batch_list:
+
+            # get the record data dictionary
+            data_dict = dict(zip(column_list, data_tuple))
+
+            # when the sequence identification changes, yield the current group
+            if data_dict['qseqid'] != group_qseqid:
+                if group_qseqid is not None:
+                    if data_dict['qseqid'] < group_qseqid:
+                        genlib.Message.print('error', f'*** The file {alignment_file} is not sorted by sequence identification.')
+                        raise genlib.ProgramException('', 'F005', alignment_file)
+                    yield (group_qseqid, group_data_dict_list)
+                group_qseqid = data_dict['qseqid']
+                group_data_dict_list = []
+
+            # add the record to the current group
+            group_data_dict_list.append(data_dict)
+
+    # yield the last group
+    if group_qseqid is not None:
+        yield (group_qseqid, group_data_dict_list)
+
+    # close the alignment file
+    alignment_file_id.close()
+
+    # yield the end of file
+    while True:
+        yield (None, [])
+
+#-------------------------------------------------------------------------------
+
+def build_annotation_results_db(annotation_results_db, complete_functional_annotation_file, besthit_functional_annotation_file, batch_size):
+    '''
+    Build the annotation results database loading the functional annotation files with
+    their hits indexed and their terms exploded in rows.
+    '''
+
+    # connect to the annotation results database
+    annotation_results_conn = sqllib.connect_database(annotation_results_db)
+
+    # create the tables when they do not exist
+    sqllib.build_annotation_results_tables(annotation_results_conn)
+
+    # load every functional annotation file
+    for (dataset, functional_annotation_file) in [('complete', complete_functional_annotation_file), ('besthit', besthit_functional_annotation_file)]:
+        hit_counter = load_annotation_results_dataset(annotation_results_conn, dataset, functional_annotation_file, batch_size)
+        genlib.Message.print('info', f'{hit_counter} hits of the file {functional_annotation_file} are loaded into the database {annotation_results_db}.')
+
+    # close connection to the annotation results database
+    annotation_results_conn.close()
+
+#-------------------------------------------------------------------------------
+
+def load_annotation_results_dataset(annotation_results_conn, dataset, functional_annotation_file, batch_size):
+    '''
+    Load a functional annotation file into a dataset of the annotation results database
+    replacing its previous rows.
+    '''
+
+    # get the dictionary of the term tables and the columns with their terms
+    term_column_dict = sqllib.get_annotation_term_column_dict()
+
+    # delete the previous rows of the dataset
+    sqllib.delete_annotation_results(annotation_results_conn, dataset)
+
+    # open the functional annotation file
+    if functional_annotation_file.endswith('.gz'):
+        try:
+            functional_annotation_file_id = gzip.open(functional_annotation_file, mode='rt', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F002', functional_annotation_file)
+    else:
+        try:
+            functional_annotation_file_id = open(functional_annotation_file, mode='r', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F001', functional_annotation_file)
+
+    # initialize the hit counter
+    hit_counter = 0
+
+    # initialize the row lists
+    hit_row_list = []
+    term_row_list_dict = {table_name: [] for table_name in term_column_dict}
+
+    # get the column list of the functional annotation files
+    column_list = genlib.get_functional_annotation_head().split(';')
+
+    # read the first record of the functional annotation file (header)
+    (record, _, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, hit_counter)
+
+    # read the secord record of the functional annotation file (first data record)
+    (record, _, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, hit_counter)
+
+    # while there are records
+    while record != '':
+
+        # add 1 to the hit counter
+        hit_counter += 1
+
+        # add the hit row and the rows of its terms
+        hit_row_list.append([hit_counter] + [data_dict[column] for column in column_list])
+        for table_name, term_column_list in term_column_dict.items():
+            for term_id in genlib.get_functional_annotation_term_id_list(data_dict, term_column_list):
+                term_row_list_dict[table_name].append((hit_counter, data_dict['qseqid'], term_id))
+
+        # insert the rows when the batch is full
+        if len(hit_row_list) >= max(batch_size, 1):
+            sqllib.insert_annotation_hit_rows(annotation_results_conn, dataset, hit_row_list, term_row_list_dict)
+            hit_row_list = []
+            term_row_list_dict = {table_name: [] for table_name in term_column_dict}
+
+        # read the next record of the functional annotation file
+        (record, _, data_dict) = genlib.read_functional_annotation_record(functional_annotation_file, functional_annotation_file_id, hit_counter)
+
+    # insert the remaining rows
+    sqllib.insert_annotation_hit_rows(annotation_results_conn, dataset, hit_row_list, term_row_list_dict)
+
+    # close the functional annotation file
+    functional_annotation_file_id.close()
+
+    # save the data of the functional annotation file
+    sqllib.insert_annotation_results_file(annotation_results_conn, dataset, functional_annotation_file)
+    annotation_results_conn.commit()
+
+    # return the hit counter
+    return hit_counter
 
-    # close the clade alignment file yielded by blastp
-    blastp_clade_alignment_file_id.close()
+#-------------------------------------------------------------------------------
+
+def read_transcripts_geneid_pairs(transcripts_geneid_file):
+    '''
+    Read the file of transcripts gene identification sorted by sequence identification and yield
+    (sequence identification, gene identification) tuples. When a sequence identification is
+    repeated, only its last gene identification is yielded, like the dictionary of transcripts gene
+    identification keeps. A None sequence identification is yielded when the file ends.
+    '''
+
+    # open the file of transcripts gene identification
+    if transcripts_geneid_file.endswith('.gz'):
+        try:
+            transcripts_geneid_file_id = gzip.open(transcripts_geneid_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F002', transcripts_geneid_file)
+    else:
+        try:
+            transcripts_geneid_file_id = open(transcripts_geneid_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F001', transcripts_geneid_file)
+
+    # initialize the identification counter
+    id_counter = 0
+
+    # initialize the previous sequence identification and its gene identification
+    (previous_seq_id, previous_gene_id) = (None, None)
+
+    # skip the head record
+    record = transcripts_geneid_file_id.readline()
+
+    # read the first data record
+    record = transcripts_geneid_file_id.readline()
+
+    # while there are records
+    while record != '':
+
+        # extract data
+        # record format: seq_id <field_sep> gene_id
+        field_sep = ';'
+        record_sep = '\n'
+        data_list = re.split(field_sep, record.replace(record_sep,''))
+        try:
+            seq_id = data_list[0].strip()
+            gene_id = data_list[1].strip()
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F006', os.path.basename(transcripts_geneid_file), id_counter + 1) from e
+
+        # check the order
+        if previous_seq_id is not None and seq_id < previous_seq_id:
+            genlib.Message.print('error', f'*** The file {transcripts_geneid_file} is not sorted by sequence identification.')
+            raise genlib.ProgramException('', 'F005', transcripts_geneid_file)
+
+        # yield the identifications of the previous sequence when the sequence changes
+        if previous_seq_id is not None and seq_id != previous_seq_id:
+            yield (previous_seq_id, previous_gene_id)
+        (previous_seq_id, previous_gene_id) = (seq_id, gene_id)
+
+        # add 1 to the identification counter
+        id_counter += 1
+
+        # read the next record
+        record = transcripts_geneid_file_id.readline()
+
+    # close file
+    transcripts_geneid_file_id.close()
+
+    # yield the identifications of the last sequence
+    if previous_seq_id is not None:
+        yield (previous_seq_id, previous_gene_id)
+
+    # yield the end of file
+    while True:
+        yield (None, None)
+
+#-------------------------------------------------------------------------------
+
+def get_alignment_record_qseqid(record):
+    '''
+    Get the sequence identification of a record of an alignment file with output format 6.
+    '''
+
+    return record.split('\t', 1)[0].strip()
+
+#-------------------------------------------------------------------------------
+
+def get_transcripts_geneid_record_seq_id(record):
+    '''
+    Get the sequence identification of a record of the file of transcripts gene identification.
+    '''
+
+    return record.split(';', 1)[0].strip()
+
+#-------------------------------------------------------------------------------
+
+def concat_alignment_shards(quercustoa_database, cluster_annotation_cache, summary_exists, transcripts_geneid_dict, clade_alignment_file, algorithm, cluster_cache_size, batch_size, threads, qseqid_set, complete_functional_annotation_file, complete_functional_annotation_file_id, besthit_functional_annotation_file_id):
+    '''
+    Concat the functional annotations corresponding to a clade alignment file yielded by blastp or blastx
+    splitting it in shards of records with contiguous sequence identifications, which are processed
+    by a pool of "threads" processes. The functional annotations of every shard are written in temporal
+    files that are appended to the functional annotation files in the shard order, so the result is
+    the same as processing the whole file.
+    '''
+
+    # initialize the counters of records written in the functional annotation files
+    complete_functional_annotation_record_counter = 0
+    besthit_functional_annotation_record_counter = 0
+
+    # get the shard list of the clade alignment file
+    # (several shards per thread balance the load of the processes)
+    shard_list = get_alignment_file_shard_list(clade_alignment_file, threads * 4)
+
+    # create the temporal directory of the shard files
+    temp_dir = tempfile.mkdtemp(prefix=f'{algorithm}-shards-', dir=os.path.dirname(os.path.abspath(complete_functional_annotation_file)))
+
+    # the sequences annotated with the blastp alignments are skipped when the algorithm is blastx
+    annotated_qseqid_set = qseqid_set if algorithm == 'blastx' else set()
+
+    try:
+
+        # create the pool of processes, each one with its own connection to the quercusTOA database
+        with concurrent.futures.ProcessPoolExecutor(max_workers=threads, initializer=initialize_shard_process, initargs=(quercustoa_database, cluster_cache_size, batch_size, summary_exists, transcripts_geneid_dict, annotated_qseqid_set, sqllib.sql_profile_dict is not None)) as executor:
+
+            # submit the shards
+            future_list = []
+            for (shard_num, (start_offset, end_offset)) in enumerate(shard_list):
+                future_list.append(executor.submit(concat_alignment_shard_process, clade_alignment_file, algorithm, start_offset, end_offset, f'{temp_dir}/{algorithm}-{shard_num:05d}'))
+
+            # append the functional annotation files of every shard in the shard order
+            for (shard_num, future) in enumerate(future_list):
+
+                # get the shard result
+                (complete_shard_file, besthit_shard_file, shard_qseqid_set, cache_stats, sql_profile_dict) = future.result()
+
+                # add the SQL instrumentation statistics of the shard
+                sqllib.merge_sql_profile_dict(sql_profile_dict)
+
+                # add the statistics of the cluster annotation cache of the shard
+                (hits, misses, evictions) = cache_stats
+                cluster_annotation_cache.hits += hits
+                cluster_annotation_cache.misses += misses
+                cluster_annotation_cache.evictions += evictions
+
+                # get the sequence identifications of the shard already annotated by a previous shard
+                # (only when the algorithm is blastx and the records of a sequence are not contiguous)
+                duplicated_qseqid_set = shard_qseqid_set & qseqid_set if algorithm == 'blastx' else set()
+
+                # append the shard files to the functional annotation files
+                complete_functional_annotation_record_counter += append_shard_file(complete_shard_file, complete_functional_annotation_file_id, duplicated_qseqid_set)
+                besthit_functional_annotation_record_counter += append_shard_file(besthit_shard_file, besthit_functional_annotation_file_id, duplicated_qseqid_set)
+
+                # add the sequence identifications of the shard to the set of sequence identifications aligned
+                qseqid_set |= shard_qseqid_set
+
+                # print counters
+                genlib.Message.print('verbose', f'\r{algorithm} clade alignment file: {shard_num + 1} of {len(shard_list)} processed shards')
+
+    finally:
+
+        # delete the temporal directory of the shard files
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    # return the counters of records written in the functional annotation files
+    return (complete_functional_annotation_record_counter, besthit_functional_annotation_record_counter)
+
+#-------------------------------------------------------------------------------
+
+def get_alignment_file_shard_list(alignment_file, shard_number):
+    '''
+    Get the list of shards of an alignment file with output format 6 as (start offset, end offset) tuples.
+    The file is split in "shard_number" parts of similar size and the boundaries are moved
+    to the next change of sequence identification, so the records of a sequence are in only one shard.
+    '''
+
+    # initialize the shard list
+    shard_list = []
+
+    # get the file size
+    file_size = os.path.getsize(alignment_file)
+
+    # open the alignment file
+    try:
+        alignment_file_id = open(alignment_file, mode='rb')
+    except Exception as e:
+        raise genlib.ProgramException(e, 'F001', alignment_file)
+
+    # initialize the start offset of the current shard
+    start_offset = 0
+
+    # calculate the boundary of every shard
+    for i in range(1, shard_number):
+
+        # get the approximate end offset
+        end_offset = file_size * i // shard_number
+        if end_offset <= start_offset:
+            continue
+
+        # move the end offset to the start of the next record
+        alignment_file_id.seek(end_offset - 1)
+        alignment_file_id.readline()
+        end_offset = alignment_file_id.tell()
+
+        # move the end offset to the first record with a different sequence identification
+        record = alignment_file_id.readline()
+        qseqid = record.split(b'\t', 1)[0].strip()
+        while record != b'' and record.split(b'\t', 1)[0].strip() == qseqid:
+            end_offset = alignment_file_id.tell()
+            record = alignment_file_id.readline()
+
+        # add the shard
+        if start_offset < end_offset < file_size:
+            shard_list.append((start_offset, end_offset))
+            start_offset = end_offset
+
+    # add the last shard
+    shard_list.append((start_offset, file_size))
+
+    # close the alignment file
+    alignment_file_id.close()
 
-    # open the clade alignment file yielded by blastx
-    if blastx_clade_alignment_file.endswith('.gz'):
+    # return the shard list
+    return shard_list
+
+#-------------------------------------------------------------------------------
+
+def initialize_shard_process(quercustoa_database, cluster_cache_size, batch_size, summary_exists, transcripts_geneid_dict, annotated_qseqid_set, profile_sql):
+    '''
+    Initialize a process of the pool that concats the functional annotations of the shards.
+    '''
+
+    # the progress of the shards is printed by the main process
+    genlib.Message.set_verbose_status(False)
+
+    # enable the SQL instrumentation without report at exit (the statistics of every shard are sent to the main process)
+    # and discard the statistics inherited from the main process
+    if profile_sql:
+        sqllib.enable_sql_profiling(os.path.basename(__file__), report_at_exit=False)
+        sqllib.pop_sql_profile_dict()
+
+    # save the process data
+    shard_process_dict['conn'] = sqllib.connect_database(quercustoa_database, read_only=True, immutable=True)
+    shard_process_dict['cluster_annotation_cache'] = genlib.LRUCache(max(cluster_cache_size, batch_size))
+    shard_process_dict['batch_size'] = batch_size
+    shard_process_dict['summary_exists'] = summary_exists
+    shard_process_dict['transcripts_geneid_dict'] = transcripts_geneid_dict
+    shard_process_dict['annotated_qseqid_set'] = annotated_qseqid_set
+
+#-------------------------------------------------------------------------------
+
+def concat_alignment_shard_process(clade_alignment_file, algorithm, start_offset, end_offset, shard_file_prefix):
+    '''
+    Concat the functional annotations corresponding to a shard of a clade alignment file in a process of the pool
+    and write them in the shard files.
+    '''
+
+    # get the process data
+    cluster_annotation_cache = shard_process_dict['cluster_annotation_cache']
+
+    # initialize the statistics of the cluster annotation cache
+    (hits, misses, evictions) = (cluster_annotation_cache.hits, cluster_annotation_cache.misses, cluster_annotation_cache.evictions)
+
+    # open the shard files
+    complete_shard_file = f'{shard_file_prefix}-complete.csv'
+    try:
+        complete_shard_file_id = open(complete_shard_file, mode='w', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise genlib.ProgramException(e, 'F003', complete_shard_file)
+    besthit_shard_file = f'{shard_file_prefix}-besthit.csv'
+    try:
+        besthit_shard_file_id = open(besthit_shard_file, mode='w', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise genlib.ProgramException(e, 'F003', besthit_shard_file)
+
+    # concat the functional annotations of the shard
+    shard_qseqid_set = set()
+    concat_alignment_shard(shard_process_dict['conn'], cluster_annotation_cache, shard_process_dict['summary_exists'], shard_process_dict['transcripts_geneid_dict'], clade_alignment_file, algorithm, start_offset, end_offset, shard_process_dict['batch_size'], shard_process_dict['annotated_qseqid_set'], shard_qseqid_set, complete_shard_file_id, besthit_shard_file_id)
+
+    # close the shard files
+    complete_shard_file_id.close()
+    besthit_shard_file_id.close()
+
+    # get the statistics of the cluster annotation cache corresponding to the shard
+    cache_stats = (cluster_annotation_cache.hits - hits, cluster_annotation_cache.misses - misses, cluster_annotation_cache.evictions - evictions)
+
+    # return the shard files, the sequence identifications annotated, the cache statistics and the SQL instrumentation statistics
+    return (complete_shard_file, besthit_shard_file, shard_qseqid_set, cache_stats, sqllib.pop_sql_profile_dict())
+
+#-------------------------------------------------------------------------------
+
+def append_shard_file(shard_file, functional_annotation_file_id, duplicated_qseqid_set):
+    '''
+    Append the records of a shard file to a functional annotation file skipping the records
+    of the sequence identifications in "duplicated_qseqid_set". Return the number of appended records.
+    '''
+
+    # initialize the record counter
+    record_counter = 0
+
+    # open the shard file
+    try:
+        shard_file_id = open(shard_file, mode='r', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise genlib.ProgramException(e, 'F001', shard_file)
+
+    # append the records
+    for record in shard_file_id:
+        if duplicated_qseqid_set and record.split(';', 1)[0] in duplicated_qseqid_set:
+            continue
+        functional_annotation_file_id.write(record)
+        record_counter += 1
+
+    # close the shard file
+    shard_file_id.close()
+
+    # return the record counter
+    return record_counter
+
+#-------------------------------------------------------------------------------
+
+def concat_alignment_shard(conn, cluster_annotation_cache, summary_exists, transcripts_geneid_dict, clade_alignment_file, algorithm, start_offset, end_offset, batch_size, qseqid_set, new_qseqid_set, complete_functional_annotation_file_id, besthit_functional_annotation_file_id):
+    '''
+    Concat functional annotations corresponding to the records of a clade alignment file yielded by blastp
+    or blastx between the offsets "start_offset" and "end_offset" (None is the end of file).
+    When the algorithm is blastx, the sequences in "qseqid_set" or in "new_qseqid_set" are skipped.
+    The annotated sequences are added to "new_qseqid_set".
+    '''
+
+    # open the clade alignment file
+    # (the newline translation is disabled to count the bytes of every record)
+    if clade_alignment_file.endswith('.gz'):
         try:
-            blastx_clade_alignment_file_id = gzip.open(blastx_clade_alignment_file, mode='rt', encoding='iso-8859-1')
+            clade_alignment_file_id = gzip.open(clade_alignment_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
-            raise genlib.ProgramException(e, 'F002', blastx_clade_alignment_file)
+            raise genlib.ProgramException(e, 'F002', clade_alignment_file)
     else:
         try:
-            blastx_clade_alignment_file_id = open(blastx_clade_alignment_file, mode='r', encoding='iso-8859-1')
+            clade_alignment_file_id = open(clade_alignment_file, mode='r', encoding='iso-8859-1', newline='')
+            clade_alignment_file_id.seek(start_offset)
         except Exception as e:
-            raise genlib.ProgramException(e, 'F001', blastx_clade_alignment_file)
+            raise genlib.ProgramException(e, 'F001', clade_alignment_file)
 
-    # initialize the counter of records corresponding to the clade alignment file yielded by blastx
-    blastx_clade_alignment_record_counter = 0
+    # initialize the counter of records corresponding to the clade alignment file
+    clade_alignment_record_counter = 0
 
-    # read the first record of clade alignment file yielded by blastx
-    (blastx_clade_alignment_record, _, blastx_clade_alignment_data_dict) = genlib.read_alignment_outfmt6_record(blastx_clade_alignment_file, blastx_clade_alignment_file_id, blastx_clade_alignment_record_counter)
+    # initialize the counters of records written in the functional annotation files
+    complete_functional_annotation_record_counter = 0
+    besthit_functional_annotation_record_counter = 0
+
+    # create the reader of the clade alignment file
+    clade_alignment_reader = read_alignment_blocks(conn, cluster_annotation_cache, clade_alignment_file, clade_alignment_file_id, start_offset, end_offset, batch_size, qseqid_set)
 
-    # while there are records in the clade alignment file yielded by blastx
-    while blastx_clade_alignment_record != '':
+    # read the first record of clade alignment file
+    (clade_alignment_data_dict, clade_cluster_annotation_dict) = next(clade_alignment_reader)
+
+    # while there are records in the clade alignment file
+    while clade_alignment_data_dict != {}:
 
         # initialize the old sequence identifications
-        old_qseqid = blastx_clade_alignment_data_dict['qseqid']
+        old_qseqid = clade_alignment_data_dict['qseqid']
+
+        # check if the "old" sequence identification has to be annotated
+        # (blastx does not annotate the sequences already annotated)
+        is_annotated = algorithm == 'blastp' or old_qseqid not in qseqid_set and old_qseqid not in new_qseqid_set
 
         # initialize the best evalue and pident
         best_evalue = 1.
@@ -367,70 +1103,30 @@ def concat_functional_annotations(conn, blastp_clade_alignment_file, blastx_clad
         best_functional_annotation_record = ''
 
         # while there are records and the same sequence identification
-        while blastx_clade_alignment_record != '' and blastx_clade_alignment_data_dict['qseqid'] == old_qseqid:
+        while clade_alignment_data_dict != {} and clade_alignment_data_dict['qseqid'] == old_qseqid:
 
             # add 1 to record counter
-            blastx_clade_alignment_record_counter += 1
+            clade_alignment_record_counter += 1
 
             # get alignment data
-            qseqid = blastx_clade_alignment_data_dict['qseqid']
-            sseqid = blastx_clade_alignment_data_dict['sseqid']
-            pident = blastx_clade_alignment_data_dict['pident']
-            length = blastx_clade_alignment_data_dict['length']
-            mismatch = blastx_clade_alignment_data_dict['mismatch']
-            gapopen = blastx_clade_alignment_data_dict['gapopen']
-            qstart = blastx_clade_alignment_data_dict['qstart']
-            qend = blastx_clade_alignment_data_dict['qend']
-            sstart = blastx_clade_alignment_data_dict['sstart']
-            send = blastx_clade_alignment_data_dict['send']
-            evalue = blastx_clade_alignment_data_dict['evalue']
-            bitscore = blastx_clade_alignment_data_dict['bitscore']
-            algorithm = 'blastx'
-
-            # when the "old" sequence identification is not in the sequence identification set
-            if old_qseqid not in qseqid_set:
-
-                # get the most frecuent species in sseqid
-                (protein_description, protein_species) = sqllib.get_mmseqs2_seq_mf_data(conn, sseqid)
-
-                # get the TAIR10 ortholog sequence identification
-                tair10_ortholog_seq_id = sqllib.get_tair10_ortholog_seq_id(conn, sseqid)
-
-                # get the description of TAIR10 ortholog sequence identification
-                tair10_description = sqllib.get_tair10_peptide_description(conn, tair10_ortholog_seq_id).replace(';','')
+            qseqid = clade_alignment_data_dict['qseqid']
+            sseqid = clade_alignment_data_dict['sseqid']
+            pident = clade_alignment_data_dict['pident']
+            evalue = clade_alignment_data_dict['evalue']
+
+            # when the "old" sequence identification has to be annotated
+            if is_annotated:
+
+                # get the functional annotation data of the cluster
+                cluster_annotation_dict = clade_cluster_annotation_dict
+                if cluster_annotation_dict is None:
+                    cluster_annotation_dict = get_cluster_annotation_dict(conn, cluster_annotation_cache, summary_exists, sseqid)
 
                 # get the Quercus lobate gene identification
                 qlobata_gene_id = transcripts_geneid_dict.get(qseqid, '-')
 
-                # get InterproScan functional annotations data
-                interproscan_annotation_dict = sqllib.get_interproscan_annotation_dict(conn, sseqid)
-                interpro_goterms = interproscan_annotation_dict.get('interpro_goterms', '-')
-                panther_goterms = interproscan_annotation_dict.get('panther_goterms', '-')
-                metacyc_pathways = interproscan_annotation_dict.get('metacyc_pathways', '-')
-                # -- reactome_pathways = annotations_dict.get('reactome_pathways', '-')
-
-                # get eggNOG-mapper functional annotations data
-                emapper_annotation_dict = sqllib.get_emapper_annotation_dict(conn, sseqid)
-                eggnog_ortholog_seq_id = emapper_annotation_dict.get('ortholog_seq_id', '-')
-                eggnog_ortholog_species = emapper_annotation_dict.get('ortholog_species', '-')
-                eggnog_ogs = emapper_annotation_dict.get('eggnog_ogs', '-')
-                cog_category = emapper_annotation_dict.get('cog_category', '-')
-                eggnog_description = emapper_annotation_dict.get('description', '-')
-                eggnog_goterms = emapper_annotation_dict.get('goterms', '-')
-                ec = emapper_annotation_dict.get('ec', '-')
-                kegg_kos = emapper_annotation_dict.get('kegg_kos', '-')
-                kegg_pathways = emapper_annotation_dict.get('kegg_pathways', '-')
-                kegg_modules = emapper_annotation_dict.get('kegg_modules', '-')
-                kegg_reactions = emapper_annotation_dict.get('kegg_reactions', '-')
-                kegg_rclasses = emapper_annotation_dict.get('kegg_rclasses', '-')
-                brite = emapper_annotation_dict.get('brite', '-')
-                kegg_tc = emapper_annotation_dict.get('kegg_tc', '-')
-                cazy = emapper_annotation_dict.get('cazy', '-')
-                pfams = emapper_annotation_dict.get('pfams', '-')
-
                 # write record of the functional annotation file with all hits per sequence
-                # -- functional_annotation_record = f'{qseqid};{sseqid};{pident};{length};{mismatch};{gapopen};{qstart};{qend};{sstart};{send};{evalue};{bitscore};{algorithm};{protein_description};{protein_species};{tair10_ortholog_seq_id};{tair10_description};{qlobata_gene_id};{interpro_goterms};{panther_goterms};{metacyc_pathways};{reactome_pathways};{eggnog_ortholog_seq_id};{eggnog_ortholog_species};{eggnog_ogs};{cog_category};{eggnog_description};{eggnog_goterms};{ec};{kegg_kos};{kegg_pathways};{kegg_modules};{kegg_reactions};{kegg_rclasses};{brite};{kegg_tc};{cazy};{pfams}'
-                functional_annotation_record = f'{qseqid};{sseqid};{pident};{length};{mismatch};{gapopen};{qstart};{qend};{sstart};{send};{evalue};{bitscore};{algorithm};{protein_description};{protein_species};{tair10_ortholog_seq_id};{tair10_description};{qlobata_gene_id};{interpro_goterms};{panther_goterms};{metacyc_pathways};{eggnog_ortholog_seq_id};{eggnog_ortholog_species};{eggnog_ogs};{cog_category};{eggnog_description};{eggnog_goterms};{ec};{kegg_kos};{kegg_pathways};{kegg_modules};{kegg_reactions};{kegg_rclasses};{brite};{kegg_tc};{cazy};{pfams}'
+                functional_annotation_record = build_functional_annotation_record(clade_alignment_data_dict, algorithm, cluster_annotation_dict, qlobata_gene_id)
                 complete_functional_annotation_file_id.write(f'{functional_annotation_record}\n')
 
                 # add 1 to the counter of records written in the functional annotation file with all hits per sequence
@@ -443,90 +1139,221 @@ def concat_functional_annotations(conn, blastp_clade_alignment_file, blastx_clad
                     best_pident = float(pident)
 
             # print counters
-            genlib.Message.print('verbose', f'\rblastx clade alignment file: {blastx_clade_alignment_record_counter} processed records')
+            genlib.Message.print('verbose', f'\r{algorithm} clade alignment file: {clade_alignment_record_counter} processed records')
 
-            # read the next record of clade alignment file yielded by blastx
-            (blastx_clade_alignment_record, _, blastx_clade_alignment_data_dict) = genlib.read_alignment_outfmt6_record(blastx_clade_alignment_file, blastx_clade_alignment_file_id, blastx_clade_alignment_record_counter)
+            # read the next record of clade alignment file
+            (clade_alignment_data_dict, clade_cluster_annotation_dict) = next(clade_alignment_reader)
 
-        # when the "old" sequence identification is not in the sequence identification set
-        if old_qseqid not in qseqid_set:
+        # when the "old" sequence identification has been annotated
+        if is_annotated:
 
             # add the sequence identification to the set of sequence identifications aligned
-            qseqid_set.add(old_qseqid)
+            new_qseqid_set.add(old_qseqid)
 
-            # write record of the functional annotation file with all hits per sequence
+            # write record of the functional annotation file with the best hit per sequence
             besthit_functional_annotation_file_id.write(f'{best_functional_annotation_record}\n')
 
             # add 1 to the counter of records written in the functional annotation file with the best hit per sequence
             besthit_functional_annotation_record_counter += 1
 
-    # close the clade alignment file yielded by blastx
-    blastx_clade_alignment_file_id.close()
+    # close the clade alignment file
+    clade_alignment_file_id.close()
 
-    genlib.Message.print('verbose', '\n')
+    # return the record counters
+    return (clade_alignment_record_counter, complete_functional_annotation_record_counter, besthit_functional_annotation_record_counter)
 
-    # open the lncRNA alignment file yielded by blastn
-    if blastn_lncrna_alignment_file.endswith('.gz'):
-        try:
-            blastn_lncrna_alignment_file_id = gzip.open(blastn_lncrna_alignment_file, mode='rt', encoding='iso-8859-1')
-        except Exception as e:
-            raise genlib.ProgramException(e, 'F002', blastn_lncrna_alignment_file)
-    else:
-        try:
-            blastn_lncrna_alignment_file_id = open(blastn_lncrna_alignment_file, mode='r', encoding='iso-8859-1')
-        except Exception as e:
-            raise genlib.ProgramException(e, 'F001', blastn_lncrna_alignment_file)
+#-------------------------------------------------------------------------------
 
-    # initialize the counter of records of the lncRNA alignment file yielded by blastn
-    blastn_lncrna_alignment_record_counter = 0
+def build_functional_annotation_record(alignment_data_dict, algorithm, cluster_annotation_dict, qlobata_gene_id):
+    '''
+    Build the functional annotation record of an alignment.
+    '''
 
-    # read the first record of lncRNA alignment file yielded by blastn
-    (blastn_lncrna_alignment_record, _, blastn_lncrna_alignment_data_dict) = genlib.read_alignment_outfmt6_record(blastn_lncrna_alignment_file, blastn_lncrna_alignment_file_id, blastn_lncrna_alignment_record_counter)
+    # get alignment data
+    qseqid = alignment_data_dict['qseqid']
+    sseqid = alignment_data_dict['sseqid']
+    pident = alignment_data_dict['pident']
+    length = alignment_data_dict['length']
+    mismatch = alignment_data_dict['mismatch']
+    gapopen = alignment_data_dict['gapopen']
+    qstart = alignment_data_dict['qstart']
+    qend = alignment_data_dict['qend']
+    sstart = alignment_data_dict['sstart']
+    send = alignment_data_dict['send']
+    evalue = alignment_data_dict['evalue']
+    bitscore = alignment_data_dict['bitscore']
+
+    # get the functional annotation data of the cluster
+    protein_description = cluster_annotation_dict['protein_description']
+    protein_species = cluster_annotation_dict['protein_species']
+    tair10_ortholog_seq_id = cluster_annotation_dict['tair10_ortholog_seq_id']
+    tair10_description = cluster_annotation_dict['tair10_description']
+    interpro_goterms = cluster_annotation_dict['interpro_goterms']
+    panther_goterms = cluster_annotation_dict['panther_goterms']
+    metacyc_pathways = cluster_annotation_dict['metacyc_pathways']
+    eggnog_ortholog_seq_id = cluster_annotation_dict['eggnog_ortholog_seq_id']
+    eggnog_ortholog_species = cluster_annotation_dict['eggnog_ortholog_species']
+    eggnog_ogs = cluster_annotation_dict['eggnog_ogs']
+    cog_category = cluster_annotation_dict['cog_category']
+    eggnog_description = cluster_annotation_dict['eggnog_description']
+    eggnog_goterms = cluster_annotation_dict['eggnog_goterms']
+    ec = cluster_annotation_dict['ec']
+    kegg_kos = cluster_annotation_dict['kegg_kos']
+    kegg_pathways = cluster_annotation_dict['kegg_pathways']
+    kegg_modules = cluster_annotation_dict['kegg_modules']
+    kegg_reactions = cluster_annotation_dict['kegg_reactions']
+    kegg_rclasses = cluster_annotation_dict['kegg_rclasses']
+    brite = cluster_annotation_dict['brite']
+    kegg_tc = cluster_annotation_dict['kegg_tc']
+    cazy = cluster_annotation_dict['cazy']
+    pfams = cluster_annotation_dict['pfams']
+
+    # build the functional annotation record
+    # -- functional_annotation_record = f'{qseqid};{sseqid};{pident};{length};{mismatch};{gapopen};{qstart};{qend};{sstart};{send};{evalue};{bitscore};{algorithm};{protein_description};{protein_species};{tair10_ortholog_seq_id};{tair10_description};{qlobata_gene_id};{interpro_goterms};{panther_goterms};{metacyc_pathways};{reactome_pathways};{eggnog_ortholog_seq_id};{eggnog_ortholog_species};{eggnog_ogs};{cog_category};{eggnog_description};{eggnog_goterms};{ec};{kegg_kos};{kegg_pathways};{kegg_modules};{kegg_reactions};{kegg_rclasses};{brite};{kegg_tc};{cazy};{pfams}'
+    functional_annotation_record = f'{qseqid};{sseqid};{pident};{length};{mismatch};{gapopen};{qstart};{qend};{sstart};{send};{evalue};{bitscore};{algorithm};{protein_description};{protein_species};{tair10_ortholog_seq_id};{tair10_description};{qlobata_gene_id};{interpro_goterms};{panther_goterms};{metacyc_pathways};{eggnog_ortholog_seq_id};{eggnog_ortholog_species};{eggnog_ogs};{cog_category};{eggnog_description};{eggnog_goterms};{ec};{kegg_kos};{kegg_pathways};{kegg_modules};{kegg_reactions};{kegg_rclasses};{brite};{kegg_tc};{cazy};{pfams}'
+
+    # return the functional annotation record
+    return functional_annotation_record
 
-    # while there are records in the lncRNA alignment file yielded by blastn
-    while blastn_lncrna_alignment_record != '':
+#-------------------------------------------------------------------------------
 
-        # add 1 to record counter
-        blastn_lncrna_alignment_record_counter += 1
+def read_alignment_blocks(conn, cluster_annotation_cache, alignment_file, alignment_file_id, start_offset, end_offset, batch_size, qseqid_set):
+    '''
+    Read the records of an alignment file with output format 6 in blocks of "batch_size" records.
+    Before yielding the records of a block, the annotation data of its clusters are resolved
+    (the ones that are not cached with only one database query) and every record data dictionary
+    is yielded with the annotation data of its cluster. When "batch_size" is 0, the records are
+    yielded with None cluster annotation data.
+    The reading stops at the offset "end_offset" (None is the end of file) and an empty data
+    dictionary is yielded when it ends.
+    '''
 
-        # get alignment data
-        qseqid = blastn_lncrna_alignment_data_dict['qseqid']
-        algorithm = 'blastn'
+    # get the column list of the alignment files
+    column_list = genlib.get_alignment_outfmt6_column_list()
 
-        # when the sequence identification is not in the sequence identification set
-        if qseqid not in qseqid_set:
+    # set the size of the records to read
+    size_limit = None if end_offset is None else end_offset - start_offset
 
-            # add the sequence identification to the set of sequence identifications aligned
-            qseqid_set.add(qseqid)
+    # read the blocks of records
+    for batch_list in genlib.read_alignment_outfmt6_batches(alignment_file, alignment_file_id, batch_size=batch_size if batch_size > 0 else None, size_limit=size_limit):
 
-            # write record in the functional annotation files
-            # -- functional_annotation_record = f'{qseqid};{genlib.get_potential_lncrn()};-;-;-;-;-;-;-;-;-;-;{algorithm};-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-'
-            functional_annotation_record = f'{qseqid};{genlib.get_potential_lncrn()};-;-;-;-;-;-;-;-;-;-;{algorithm};-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-;-'
-            complete_functional_annotation_file_id.write(f'{functional_annotation_record}\n')
-            besthit_functional_annotation_file_id.write(f'{functional_annotation_record}\n')
+        # build the data dictionaries of the records
+        block_list = [dict(zip(column_list, data_tuple)) for data_tuple in batch_list]
 
-            # add 1 to the counter of records written in the functional annotation file with all hits per sequence
-            complete_functional_annotation_record_counter += 1
+        # resolve the annotation data of the clusters
+        # (sequences annotated by a previous alignment file are skipped)
+        if batch_size > 0:
+            cluster_annotation_data_dict = resolve_cluster_annotation_data(conn, cluster_annotation_cache, [data_dict['sseqid'] for data_dict in block_list if data_dict['qseqid'] not in qseqid_set])
+        else:
+            cluster_annotation_data_dict = {}
 
-            # add 1 to the counter of records written in the functional annotation file with the best hit per sequence
-            besthit_functional_annotation_record_counter += 1
+        # yield the records of the block
+        for data_dict in block_list:
+            yield (data_dict, cluster_annotation_data_dict.get(data_dict['sseqid']))
 
-        # print counters
-        genlib.Message.print('verbose', f'\rblastn lncRNA alignment file: {blastn_lncrna_alignment_record_counter} processed records')
+    # yield the end of file
+    yield ({}, None)
 
-        # read the next record of lncRNA alignment file yielded by blastn
-        (blastn_lncrna_alignment_record, _, blastn_lncrna_alignment_data_dict) = genlib.read_alignment_outfmt6_record(blastn_lncrna_alignment_file, blastn_lncrna_alignment_file_id, blastn_lncrna_alignment_record_counter)
+#-------------------------------------------------------------------------------
 
-    # close the lncRNA alignment file yielded by blastn
-    blastn_lncrna_alignment_file_id.close()
+def resolve_cluster_annotation_data(conn, cluster_annotation_cache, cluster_id_list):
+    '''
+    Resolve the annotation data of the clusters of a list: the cached ones are gotten from the cache
+    and the rest ones with only one database query, and then they are saved in the cache.
+    Return the dictionary of the annotation data of the clusters of the list.
+    '''
 
-    # close output files
-    complete_functional_annotation_file_id.close()
-    besthit_functional_annotation_file_id.close()
+    # initialize the dictionary of cluster annotation data
+    cluster_annotation_data_dict = {}
 
-    genlib.Message.print('verbose', '\n')
-    genlib.Message.print('info', f'The file {complete_functional_annotation_file} is created with {complete_functional_annotation_record_counter} records.')
-    genlib.Message.print('info', f'The file {besthit_functional_annotation_file} is created with {besthit_functional_annotation_record_counter} records.')
+    # get the data of the cached clusters and the set of clusters not cached
+    cluster_id_set = set()
+    for cluster_id in dict.fromkeys(cluster_id_list):
+        cluster_annotation_dict = cluster_annotation_cache.get(cluster_id)
+        if cluster_annotation_dict is not None:
+            cluster_annotation_data_dict[cluster_id] = cluster_annotation_dict
+        else:
+            cluster_id_set.add(cluster_id)
+
+    # get the data of the clusters not cached and save them in the cache
+    if cluster_id_set:
+        query_data_dict = sqllib.get_cluster_annotation_data_dict(conn, sorted(cluster_id_set))
+        for cluster_id in sorted(cluster_id_set):
+            cluster_annotation_data_dict[cluster_id] = query_data_dict[cluster_id]
+            cluster_annotation_cache.put(cluster_id, query_data_dict[cluster_id])
+
+    # return the dictionary of cluster annotation data resolved
+    return cluster_annotation_data_dict
+
+#-------------------------------------------------------------------------------
+
+def get_cluster_annotation_dict(conn, cluster_annotation_cache, summary_exists, cluster_id):
+    '''
+    Get the functional annotation data of a cluster from the cache or, when it is not cached,
+    from the database (using the table "cluster_annotation_summary" when it exists).
+    '''
+
+    # get the cluster annotation data from the cache
+    cluster_annotation_dict = cluster_annotation_cache.get(cluster_id)
+    if cluster_annotation_dict is not None:
+        return cluster_annotation_dict
+
+    # get the cluster annotation data from the summary table
+    if summary_exists:
+        cluster_annotation_dict = sqllib.get_cluster_annotation_summary_dict(conn, cluster_id)
+        if cluster_annotation_dict == {}:
+            cluster_annotation_dict = sqllib.get_cluster_annotation_row_dict([cluster_id, '', ''] + ['-'] * 21)
+        cluster_annotation_cache.put(cluster_id, cluster_annotation_dict)
+        return cluster_annotation_dict
+
+    # get the most frecuent species in the cluster
+    (protein_description, protein_species) = sqllib.get_mmseqs2_seq_mf_data(conn, cluster_id)
+
+    # get the TAIR10 ortholog sequence identification
+    tair10_ortholog_seq_id = sqllib.get_tair10_ortholog_seq_id(conn, cluster_id)
+
+    # get the description of TAIR10 ortholog sequence identification
+    tair10_description = sqllib.get_tair10_peptide_description(conn, tair10_ortholog_seq_id).replace(';','')
+
+    # get InterproScan functional annotations data
+    interproscan_annotation_dict = sqllib.get_interproscan_annotation_dict(conn, cluster_id)
+
+    # get eggNOG-mapper functional annotations data
+    emapper_annotation_dict = sqllib.get_emapper_annotation_dict(conn, cluster_id)
+
+    # build the cluster annotation data
+    cluster_annotation_dict = {
+        'protein_description': protein_description,
+        'protein_species': protein_species,
+        'tair10_ortholog_seq_id': tair10_ortholog_seq_id,
+        'tair10_description': tair10_description,
+        'interpro_goterms': interproscan_annotation_dict.get('interpro_goterms', '-'),
+        'panther_goterms': interproscan_annotation_dict.get('panther_goterms', '-'),
+        'metacyc_pathways': interproscan_annotation_dict.get('metacyc_pathways', '-'),
+        # -- 'reactome_pathways': interproscan_annotation_dict.get('reactome_pathways', '-'),
+        'eggnog_ortholog_seq_id': emapper_annotation_dict.get('ortholog_seq_id', '-'),
+        'eggnog_ortholog_species': emapper_annotation_dict.get('ortholog_species', '-'),
+        'eggnog_ogs': emapper_annotation_dict.get('eggnog_ogs', '-'),
+        'cog_category': emapper_annotation_dict.get('cog_category', '-'),
+        'eggnog_description': emapper_annotation_dict.get('description', '-'),
+        'eggnog_goterms': emapper_annotation_dict.get('goterms', '-'),
+        'ec': emapper_annotation_dict.get('ec', '-'),
+        'kegg_kos': emapper_annotation_dict.get('kegg_kos', '-'),
+        'kegg_pathways': emapper_annotation_dict.get('kegg_pathways', '-'),
+        'kegg_modules': emapper_annotation_dict.get('kegg_modules', '-'),
+        'kegg_reactions': emapper_annotation_dict.get('kegg_reactions', '-'),
+        'kegg_rclasses': emapper_annotation_dict.get('kegg_rclasses', '-'),
+        'brite': emapper_annotation_dict.get('brite', '-'),
+        'kegg_tc': emapper_annotation_dict.get('kegg_tc', '-'),
+        'cazy': emapper_annotation_dict.get('cazy', '-'),
+        'pfams': emapper_annotation_dict.get('pfams', '-'),
+    }
+
+    # save the cluster annotation data in the cache
+    cluster_annotation_cache.put(cluster_id, cluster_annotation_dict)
+
+    # return the cluster annotation data
+    return cluster_annotation_dict
 
 #-------------------------------------------------------------------------------
 
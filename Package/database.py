@@ -368,9 +368,13 @@ class FormDownloadQuercusTOAdb(QWidget):
         miniforge3_bin_dir = f'{miniforge3_dir}/bin'
 
         # get items from dictionary of application configuration
+        app_dir = self.app_config_dict['Environment parameters']['app_dir']
         database_dir = self.app_config_dict['Environment parameters']['database_dir']
         quercustoa_db_dir = self.app_config_dict['Environment parameters']['quercustoa_db_dir']
         compressed_db_url = self.app_config_dict[f'{genlib.get_app_short_name()} database']['compressed_db_url']
+        functional_annotations_db_path = self.app_config_dict[f'{genlib.get_app_short_name()} database']['functional_annotations_db_path']
+        sequences_db_path = self.app_config_dict[f'{genlib.get_app_short_name()} database']['sequences_db_path']
+        comparative_genomics_db_path = self.app_config_dict[f'{genlib.get_app_short_name()} database']['comparative_genomics_db_path']
 
         # set the compressed database path
         compressed_db_path = f'{database_dir}/{genlib.get_compressed_db_name()}'
@@ -449,6 +453,42 @@ class FormDownloadQuercusTOAdb(QWidget):
                 file_id.write( '    echo "Database is decompressed."\n')
                 file_id.write( '}\n')
                 file_id.write( '#-------------------------------------------------------------------------------\n')
+                file_id.write( 'function build_derived_tables\n')
+                file_id.write( '{\n')
+                file_id.write(f'    cd {current_run_dir}\n')
+                file_id.write( '    echo "$SEP"\n')
+                file_id.write( '    echo "Building the tables derived from the functional annotations database ..."\n')
+                file_id.write(f'    source {miniforge3_bin_dir}/activate {genlib.get_quercustoa_env_code()}\n')
+                file_id.write( '    /usr/bin/time \\\n')
+                file_id.write(f'        {app_dir}/build-derived-tables.py \\\n')
+                file_id.write(f'            --db={functional_annotations_db_path} \\\n')
+                file_id.write( '            --verbose=N \\\n')
+                file_id.write( '            --trace=N\n')
+                file_id.write( '    RC=$?\n')
+                file_id.write( '    if [ $RC -ne 0 ]; then manage_error build-derived-tables.py $RC; fi\n')
+                file_id.write( '    conda deactivate\n')
+                file_id.write( '    echo "Tables are built."\n')
+                file_id.write( '}\n')
+                file_id.write( '#-------------------------------------------------------------------------------\n')
+                file_id.write( 'function ensure_db_indexes\n')
+                file_id.write( '{\n')
+                file_id.write(f'    cd {current_run_dir}\n')
+                file_id.write( '    echo "$SEP"\n')
+                file_id.write( '    echo "Ensuring the indexes of the databases ..."\n')
+                file_id.write(f'    source {miniforge3_bin_dir}/activate {genlib.get_quercustoa_env_code()}\n')
+                file_id.write( '    /usr/bin/time \\\n')
+                file_id.write(f'        {app_dir}/ensure-db-indexes.py \\\n')
+                file_id.write(f'            --sequences-db={sequences_db_path} \\\n')
+                file_id.write(f'            --annotations-db={functional_annotations_db_path} \\\n')
+                file_id.write(f'            --comparative-db={comparative_genomics_db_path} \\\n')
+                file_id.write( '            --verbose=N \\\n')
+                file_id.write( '            --trace=N\n')
+                file_id.write( '    RC=$?\n')
+                file_id.write( '    if [ $RC -ne 0 ]; then manage_error ensure-db-indexes.py $RC; fi\n')
+                file_id.write( '    conda deactivate\n')
+                file_id.write( '    echo "Indexes are ensured."\n')
+                file_id.write( '}\n')
+                file_id.write( '#-------------------------------------------------------------------------------\n')
                 file_id.write( 'function delete_compressed_db\n')
                 file_id.write( '{\n')
                 file_id.write(f'    cd {current_run_dir}\n')
@@ -500,6 +540,8 @@ class FormDownloadQuercusTOAdb(QWidget):
                 file_id.write( 'recreate_quercustoa_db_dir\n')
                 file_id.write( 'download_quercustoa_db\n')
                 file_id.write( 'decompress_quercustoa_db\n')
+                file_id.write( 'build_derived_tables\n')
+                file_id.write( 'ensure_db_indexes\n')
                 file_id.write( 'delete_compressed_db\n')
                 file_id.write( 'end\n')
         except Exception as e:
@@ -30,6 +30,12 @@ import os
 import sys
 import webbrowser
 
+from Bio import Phylo
+
+import matplotlib
+import matplotlib.pyplot as plt
+from pymsaviz import MsaViz
+
 from PyQt5.QtCore import Qt                      # pylint: disable=no-name-in-module
 from PyQt5.QtGui import QCursor                  # pylint: disable=no-name-in-module
 from PyQt5.QtGui import QFont                    # pylint: disable=no-name-in-module
@@ -58,6 +64,8 @@ from PyQt5.QtWidgets import QVBoxLayout          # pylint: disable=no-name-in-mo
 import genlib
 import sqllib
 
+matplotlib.use('Agg')
+
 #-------------------------------------------------------------------------------
 
 class DialogProcess(QDialog):
@@ -663,8 +671,12 @@ class DialogDataTable(QDialog):
                 data_dict['description'] = {'text': 'Description', 'width': 400, 'alignment': 'left'}
                 data_dict['species'] = {'text': 'Species', 'width': 200, 'alignment': 'left'}
 
-                # set the explanatory text
+                # set the explanatory text with the summary of the cluster annotation data when it is available
                 explanatory_text = ''
+                if sqllib.check_table_exists(self.conn, 'cluster_annotation_summary'):
+                    cluster_annotation_dict = sqllib.get_cluster_annotation_summary_dict(self.conn, cluster_id)
+                    if cluster_annotation_dict != {}:
+                        explanatory_text = f'''Most frequent description: {cluster_annotation_dict['protein_description']} - Most frequent species: {cluster_annotation_dict['protein_species']} - TAIR10 ortholog: {cluster_annotation_dict['tair10_ortholog_seq_id']}'''
 
                 # set the window height and width
                 window_height = 500
@@ -1635,13 +1647,54 @@ class DialogHomologyRelationships(QDialog):
 
     #---------------
 
+    def get_plot_file_path(self, file_name):
+        '''
+        Get the path of the plot of the current sequence identification corresponding to a file name
+        ("homologous-proteins.fasta.aln", "homologous-proteins.fasta.tree" or "homologous-genes.fasta.aln").
+        When the alignments and trees are saved in container files, the plot is drawn in the
+        temporal directory.
+        '''
+
+        # get the current sequence identification
+        seq_id = self.combobox_selection_data.currentText()
+
+        # set the image file path generated by the alignment of each sequence identification
+        image_file_path = f'{self.seq_alignment_dir_path}{os.sep}{seq_id}-{file_name}.pdf'
+
+        # when the image file does not exist and there is a container file, draw the plot of the container entry
+        container_file = f'{self.seq_alignment_dir_path}{os.sep}{file_name}'
+        if not os.path.exists(image_file_path) and genlib.is_container_file(container_file):
+            with genlib.IndexedContainer(container_file) as container:
+                if seq_id in container:
+                    QApplication.setOverrideCursor(Qt.WaitCursor)
+                    try:
+                        os.makedirs(genlib.get_temp_dir(), exist_ok=True)
+                        data_file = f'{genlib.get_temp_dir()}{os.sep}{seq_id}-{file_name}'
+                        container.extract(seq_id, data_file)
+                        image_file_path = f'{data_file}.pdf'
+                        if file_name.endswith('.tree'):
+                            tree = Phylo.read(data_file, 'newick')
+                            Phylo.draw(tree, do_show=False)
+                            plt.savefig(image_file_path)
+                            plt.close()
+                        else:
+                            alignment_plot = MsaViz(data_file, format='fasta', wrap_length=80, sort=False, color_scheme='Flower', show_count=True, show_consensus=False)
+                            alignment_plot.savefig(image_file_path)
+                    finally:
+                        QApplication.restoreOverrideCursor()
+
+        # return the image file path
+        return image_file_path
+
+    #---------------
+
     def pushbutton_protein_alignment_clicked(self):
         '''
         Plot the alignment of homologous proteins.
         '''
 
         # set the image file path of the alignment of homologous proteins
-        image_file_path = f'{self.seq_alignment_dir_path}{os.sep}{self.combobox_selection_data.currentText()}-homologous-proteins.fasta.aln.pdf'
+        image_file_path = self.get_plot_file_path('homologous-proteins.fasta.aln')
 
         # show the plot
         if os.path.exists(image_file_path):
@@ -1660,7 +1713,7 @@ class DialogHomologyRelationships(QDialog):
         '''
 
         # set the image file path of phylogenetic treee of homologous proteins
-        image_file_path = f'{self.seq_alignment_dir_path}{os.sep}{self.combobox_selection_data.currentText()}-homologous-proteins.fasta.tree.pdf'
+        image_file_path = self.get_plot_file_path('homologous-proteins.fasta.tree')
 
         # show the plot
         if os.path.exists(image_file_path):
@@ -1679,7 +1732,7 @@ class DialogHomologyRelationships(QDialog):
         '''
 
         # set the image file path of the alignment of homologus genes
-        image_file_path = f'{self.seq_alignment_dir_path}{os.sep}{self.combobox_selection_data.currentText()}-homologous-genes.fasta.aln.pdf'
+        image_file_path = self.get_plot_file_path('homologous-genes.fasta.aln')
 
         # show the plot
         if os.path.exists(image_file_path):
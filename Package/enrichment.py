@@ -883,6 +883,9 @@ class FormRunEnrichmentAnalysis(QWidget):
         besthit_functional_annotation_file = f'{result_dir}/{genlib.get_result_run_subdir()}/{functional_annotation_dataset}/{genlib.get_besthit_functional_annotation_file_name()}'
         complete_functional_annotation_file = f'{result_dir}/{genlib.get_result_run_subdir()}/{functional_annotation_dataset}/{genlib.get_complete_functional_annotation_file_name()}'
 
+        # set the database with the annotation results (runs of previous versions do not have it)
+        annotation_results_db = f'{result_dir}/{genlib.get_result_run_subdir()}/{functional_annotation_dataset}/{genlib.get_annotation_results_db_name()}'
+
         # set the CSV files with the GO enrichment_analysis
         besthit_goea_file = f'./{genlib.get_besthit_goea_file_name()}'
         complete_goea_file = f'./{genlib.get_complete_goea_file_name()}'
@@ -964,6 +967,31 @@ class FormRunEnrichmentAnalysis(QWidget):
                 file_id.write( '    fi\n')
                 file_id.write( '}\n')
                 file_id.write( '#-------------------------------------------------------------------------------\n')
+                file_id.write('function build_species_background\n')
+                file_id.write( '{\n')
+                file_id.write( '    echo "$SEP"\n')
+                file_id.write( '    echo "Building the species background shared by the enrichment analyses ..."\n')
+                file_id.write(f'    cd {current_run_dir}\n')
+                file_id.write( '    STEP_STATUS=$STATUS_DIR/build_species_background.ok\n')
+                file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
+                file_id.write( '        echo "This step was previously run."\n')
+                file_id.write( '    else\n')
+                file_id.write(f'        source {miniforge3_bin_dir}/activate {genlib.get_quercustoa_env_code()}\n')
+                file_id.write( '        /usr/bin/time \\\n')
+                file_id.write(f'            {app_dir}/calculate-enrichment-analysis.py \\\n')
+                file_id.write(f'                --db={functional_annotations_db_path} \\\n')
+                file_id.write(f'                --species="{species_name}" \\\n')
+                file_id.write( '                --background-only=Y \\\n')
+                file_id.write( '                --verbose=N \\\n')
+                file_id.write( '                --trace=N\n')
+                file_id.write( '        RC=$?\n')
+                file_id.write( '        if [ $RC -ne 0 ]; then manage_error calculate-enrichment-analysis.py $RC; fi\n')
+                file_id.write( '        conda deactivate\n')
+                file_id.write( '        echo "Species background is built."\n')
+                file_id.write( '        touch $STEP_STATUS\n')
+                file_id.write( '    fi\n')
+                file_id.write( '}\n')
+                file_id.write( '#-------------------------------------------------------------------------------\n')
                 file_id.write('function calculate_besthit_enrichment_analysis\n')
                 file_id.write( '{\n')
                 file_id.write( '    echo "$SEP"\n')
@@ -978,6 +1006,8 @@ class FormRunEnrichmentAnalysis(QWidget):
                 file_id.write(f'            {app_dir}/calculate-enrichment-analysis.py \\\n')
                 file_id.write(f'                --db={functional_annotations_db_path} \\\n')
                 file_id.write(f'                --annotations={besthit_functional_annotation_file} \\\n')
+                if os.path.isfile(annotation_results_db):
+                    file_id.write(f'                --annotations-db={annotation_results_db} \\\n')
                 file_id.write(f'                --species="{species_name}" \\\n')
                 file_id.write(f'                --method={fdr_method} \\\n')
                 file_id.write(f'                --msqannot={min_seqnum_annotations} \\\n')
@@ -1010,6 +1040,8 @@ class FormRunEnrichmentAnalysis(QWidget):
                 file_id.write(f'            {app_dir}/calculate-enrichment-analysis.py \\\n')
                 file_id.write(f'                --db={functional_annotations_db_path} \\\n')
                 file_id.write(f'                --annotations={complete_functional_annotation_file} \\\n')
+                if os.path.isfile(annotation_results_db):
+                    file_id.write(f'                --annotations-db={annotation_results_db} \\\n')
                 file_id.write(f'                --species="{species_name}" \\\n')
                 file_id.write(f'                --method={fdr_method} \\\n')
                 file_id.write(f'                --msqannot={min_seqnum_annotations} \\\n')
@@ -1028,6 +1060,20 @@ class FormRunEnrichmentAnalysis(QWidget):
                 file_id.write( '    fi\n')
                 file_id.write( '}\n')
                 file_id.write( '#-------------------------------------------------------------------------------\n')
+                file_id.write('function calculate_enrichment_analyses\n')
+                file_id.write( '{\n')
+                file_id.write( '    calculate_besthit_enrichment_analysis &\n')
+                file_id.write( '    BESTHIT_PID=$!\n')
+                file_id.write( '    calculate_complete_enrichment_analysis &\n')
+                file_id.write( '    COMPLETE_PID=$!\n')
+                file_id.write( '    wait $BESTHIT_PID\n')
+                file_id.write( '    BESTHIT_RC=$?\n')
+                file_id.write( '    wait $COMPLETE_PID\n')
+                file_id.write( '    COMPLETE_RC=$?\n')
+                file_id.write( '    if [ $BESTHIT_RC -ne 0 ]; then manage_error calculate_besthit_enrichment_analysis $BESTHIT_RC; fi\n')
+                file_id.write( '    if [ $COMPLETE_RC -ne 0 ]; then manage_error calculate_complete_enrichment_analysis $COMPLETE_RC; fi\n')
+                file_id.write( '}\n')
+                file_id.write( '#-------------------------------------------------------------------------------\n')
                 file_id.write( 'function end\n')
                 file_id.write( '{\n')
                 file_id.write( '    END_DATETIME=`date +%s`\n')
@@ -1065,8 +1111,8 @@ class FormRunEnrichmentAnalysis(QWidget):
                 file_id.write( 'init\n')
                 file_id.write( 'copy_annotation_params\n')
                 file_id.write( 'append_enrichment_params\n')
-                file_id.write( 'calculate_besthit_enrichment_analysis\n')
-                file_id.write( 'calculate_complete_enrichment_analysis\n')
+                file_id.write( 'build_species_background\n')
+                file_id.write( 'calculate_enrichment_analyses\n')
                 file_id.write( 'end\n')
         except Exception as e:
             error_list.append(f'*** EXCEPTION: "{e}".')
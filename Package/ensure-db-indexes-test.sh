@@ -0,0 +1,58 @@
+#!/bin/bash
+
+#-------------------------------------------------------------------------------
+
+# This script executes a test of the program ensure-db-indexes.py
+# in a Linux environment.
+#
+# This software has been developed by:
+#
+#    GI en Desarrollo de Especies y Comunidades Leñosas (WooSp)
+#    Dpto. Sistemas y Recursos Naturales
+#    ETSI Montes, Forestal y del Medio Natural
+#    Universidad Politecnica de Madrid
+#    https://github.com/ggfhf/
+#
+# Licence: GNU General Public Licence Version 3.
+
+#-------------------------------------------------------------------------------
+
+# Control parameters
+
+if [ -n "$*" ]; then echo 'This script does not have parameters'; exit 1; fi
+
+#-------------------------------------------------------------------------------
+
+# Set run environment
+
+APP_DIR=$QUERCUSTOA
+DATA_DIR=$APP_DIR/data
+OUTPUT_DIR=$APP_DIR/output
+
+if [ ! -d "$OUTPUT_DIR" ]; then mkdir --parents $OUTPUT_DIR; fi
+
+INITIAL_DIR=$(pwd)
+cd $APP_DIR
+
+#-------------------------------------------------------------------------------
+
+# Run the program ensure-db-indexes.py
+
+/usr/bin/time \
+    ./ensure-db-indexes.py \
+        --sequences-db=$DATA_DIR/sequences.db \
+        --annotations-db=$DATA_DIR/functional-annotations.db \
+        --comparative-db=$DATA_DIR/comparative-genomics.db \
+        --verbose=Y  \
+        --trace=N
+if [ $? -ne 0 ]; then echo 'Script ended with errors.'; exit 1; fi
+
+#-------------------------------------------------------------------------------
+
+# End
+
+cd $INITIAL_DIR
+
+exit 0
+
+#-------------------------------------------------------------------------------
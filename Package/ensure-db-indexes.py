@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# pylint: disable=broad-except
+# pylint: disable=invalid-name
+# pylint: disable=line-too-long
+# pylint: disable=multiple-statements
+# pylint: disable=too-many-lines
+# pylint: disable=unnecessary-pass
+
+#-------------------------------------------------------------------------------
+
+'''
+This program checks the query plans of the lookups on the quercusTOA (Quercus Taxonomy-oriented
+Annotation) databases, creates the covering indexes that are missing, gathers the statistics
+used by the query planner and reports the queries that still do a full scan of a table.
+
+This software has been developed by:
+
+    GI en Desarrollo de Especies y Comunidades Leñosas (WooSp)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+import genlib
+import sqllib
+
+#-------------------------------------------------------------------------------
+
+def main():
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    genlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # enable the SQL instrumentation
+    if args.profile_sql.upper() == 'Y':
+        sqllib.enable_sql_profiling(os.path.basename(__file__))
+
+    # ensure the indexes of each database
+    for database_path in [args.sequences_database, args.functional_annotations_database, args.comparative_genomics_database]:
+        if database_path != 'NONE':
+
+            # connect to the database
+            conn = sqllib.connect_database(database_path)
+
+            # ensure the indexes of the database
+            ensure_db_indexes(conn, database_path)
+
+            # close connection to the database
+            conn.close()
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program checks the query plans of the lookups on the databases, creates the missing\n' \
+       'covering indexes, gathers the statistics of the query planner and reports the queries that still do full scans.'
+    text = f'{genlib.get_app_short_name()} v{genlib.get_app_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'    #pylint: disable=protected-access
+    parser.add_argument('--sequences-db', dest='sequences_database', help=f'Path of the {genlib.get_app_short_name()} sequences database or NONE; default: NONE.')
+    parser.add_argument('--annotations-db', dest='functional_annotations_database', help=f'Path of the {genlib.get_app_short_name()} functional annotations database or NONE; default: NONE.')
+    parser.add_argument('--comparative-db', dest='comparative_genomics_database', help=f'Path of the {genlib.get_app_short_name()} comparative genomics database or NONE; default: NONE.')
+    parser.add_argument('--profile-sql', dest='profile_sql', help=f'Record the calls, latencies and rows of the database accesses, print a summary at exit and save it as JSON in the current directory: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_PROFILE_SQL} (Y when the environment variable {genlib.get_sql_profile_env_var()} is Y).')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {genlib.get_verbose_code_list_text()}; default: {genlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {genlib.get_trace_code_list_text()}; default: {genlib.Const.DEFAULT_TRACE}.')
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "sequences_database"
+    if args.sequences_database is None or args.sequences_database.upper() == 'NONE':
+        args.sequences_database = 'NONE'
+    elif not os.path.isfile(args.sequences_database):
+        genlib.Message.print('error', f'*** The file {args.sequences_database} does not exist.')
+        OK = False
+
+    # check "functional_annotations_database"
+    if args.functional_annotations_database is None or args.functional_annotations_database.upper() == 'NONE':
+        args.functional_annotations_database = 'NONE'
+    elif not os.path.isfile(args.functional_annotations_database):
+        genlib.Message.print('error', f'*** The file {args.functional_annotations_database} does not exist.')
+        OK = False
+
+    # check "comparative_genomics_database"
+    if args.comparative_genomics_database is None or args.comparative_genomics_database.upper() == 'NONE':
+        args.comparative_genomics_database = 'NONE'
+    elif not os.path.isfile(args.comparative_genomics_database):
+        genlib.Message.print('error', f'*** The file {args.comparative_genomics_database} does not exist.')
+        OK = False
+
+    # check that a database is indicated at least
+    if args.sequences_database == 'NONE' and args.functional_annotations_database == 'NONE' and args.comparative_genomics_database == 'NONE':
+        genlib.Message.print('error', '*** No database is indicated in the input arguments.')
+        OK = False
+
+    # check "profile_sql"
+    if args.profile_sql is None:
+        args.profile_sql = genlib.get_sql_profile_default()
+    elif not genlib.check_code(args.profile_sql, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** profile_sql has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = genlib.Const.DEFAULT_VERBOSE
+    elif not genlib.check_code(args.verbose, genlib.get_verbose_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** verbose has to be {genlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        genlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = genlib.Const.DEFAULT_TRACE
+    elif not genlib.check_code(args.trace, genlib.get_trace_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** trace has to be {genlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        genlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise genlib.ProgramException('', 'P001')
+
+#-------------------------------------------------------------------------------
+
+def ensure_db_indexes(conn, database_path):
+    '''
+    Check the query plans of the lookups whose tables are in a database, create the covering indexes
+    that are missing, gather the statistics of the query planner and report the queries that still
+    do a full scan.
+    '''
+
+    genlib.Message.print('info', f'Checking the indexes of the database {database_path} ...')
+
+    # get the lookups whose tables are in the database
+    query_check_list = []
+    for query_check in sqllib.get_query_check_list():
+        if all(sqllib.check_table_exists(conn, table_name) for table_name in set(sqllib.get_query_check_table_dict(query_check).values())):
+            query_check_list.append(query_check)
+    genlib.Message.print('info', f'{len(query_check_list)} queries are checked.')
+
+    # create the missing indexes of the lookups that do a full scan
+    created_index_counter = 0
+    for query_check in query_check_list:
+        full_scan_list = sqllib.get_full_scan_list(sqllib.get_query_plan_list(conn, query_check['sentence']), sqllib.get_query_check_table_dict(query_check))
+        genlib.Message.print('trace', f'{query_check["function"]}: {full_scan_list}')
+        if full_scan_list != []:
+            for (table_name, key_column_list, covered_column_list) in query_check['index_list']:
+                if not sqllib.check_index_exists(conn, table_name, key_column_list):
+                    genlib.Message.print('verbose', f'Creating the index of {table_name} ({", ".join(key_column_list)}) ...\n')
+                    index_name = sqllib.create_covering_index(conn, table_name, key_column_list, covered_column_list)
+                    genlib.Message.print('info', f'The index {index_name} is created.')
+                    created_index_counter += 1
+    genlib.Message.print('info', f'{created_index_counter} indexes are created.')
+
+    # gather the statistics used by the query planner
+    genlib.Message.print('info', 'Analyzing the database ...')
+    sqllib.analyze_database(conn)
+    genlib.Message.print('info', 'The database is analyzed.')
+
+    # report the lookups that still do a full scan
+    full_scan_counter = 0
+    for query_check in query_check_list:
+        full_scan_list = sqllib.get_full_scan_list(sqllib.get_query_plan_list(conn, query_check['sentence']), sqllib.get_query_check_table_dict(query_check))
+        if full_scan_list != []:
+            genlib.Message.print('info', f'*** WARNING: The query of {query_check["function"]} does a full scan: {"; ".join(full_scan_list)}.')
+            full_scan_counter += 1
+    genlib.Message.print('info', f'{full_scan_counter} of {len(query_check_list)} queries do a full scan.')
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main()
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
@@ -30,10 +30,15 @@ import collections
 import configparser
 import datetime
 import gzip
+import hashlib
+import heapq
+import json
+import mmap
 import os
 import re
 import subprocess
 import sys
+import tempfile
 
 from Bio import Entrez
 from Bio import SeqIO
@@ -826,6 +831,77 @@ def get_besthit_functional_annotation_file_name():
 
 #-------------------------------------------------------------------------------
 
+def get_sql_profile_env_var():
+    '''
+    Get the name of the environment variable that enables the SQL instrumentation when its value is Y.
+    '''
+
+    return 'QUERCUSTOA_PROFILE_SQL'
+
+#-------------------------------------------------------------------------------
+
+def get_sql_profile_default():
+    '''
+    Get the default value of "profile_sql" from the environment variable of the SQL instrumentation.
+    '''
+
+    return 'Y' if os.environ.get(get_sql_profile_env_var(), '').upper() in ['Y', 'YES', '1', 'TRUE'] else Const.DEFAULT_PROFILE_SQL
+
+#-------------------------------------------------------------------------------
+
+def get_sql_profile_file_name(program_name, process_id):
+    '''
+    Get the name of the JSON file with the SQL instrumentation report of a run of a program
+    (the process identification avoids that concurrent runs in the same directory overwrite
+    their reports).
+    '''
+
+    return f'{os.path.splitext(os.path.basename(program_name))[0]}-sql-profile-{process_id}.json'
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_results_db_name():
+    '''
+    Get the name of the database with the functional annotation results of a run.
+    '''
+
+    return 'annotations.db'
+
+#-------------------------------------------------------------------------------
+
+def get_background_cache_dir_name():
+    '''
+    Get the name of the directory where the species background term counts of the enrichment analysis are cached.
+    '''
+
+    return 'enrichment-background-cache'
+
+#-------------------------------------------------------------------------------
+
+def get_database_fingerprint(database_path):
+    '''
+    Get the fingerprint of a SQLite database built with its size, its modification time
+    and its header (that includes the file change counter).
+    '''
+
+    # get the size and the modification time of the database
+    try:
+        stat_result = os.stat(database_path)
+    except Exception as e:
+        raise ProgramException(e, 'F001', database_path) from e
+
+    # get the header of the database
+    try:
+        with open(database_path, mode='rb') as database_file_id:
+            header = database_file_id.read(100)
+    except Exception as e:
+        raise ProgramException(e, 'F001', database_path) from e
+
+    # return the fingerprint
+    return hashlib.sha256(f'{stat_result.st_size}|{stat_result.st_mtime_ns}|'.encode() + header).hexdigest()
+
+#-------------------------------------------------------------------------------
+
 def get_homology_relationships_file_name():
     '''
     Get the name of the homology relationships file with the best hit per sequence.
@@ -1665,6 +1741,31 @@ def get_all_species_name():
 
 #-------------------------------------------------------------------------------
 
+def get_every_species_code():
+    '''
+    Get the code used to identify the list of every species of the database.
+    '''
+
+    return 'all'
+
+#-------------------------------------------------------------------------------
+
+def get_species_file_path(file_path, species_name):
+    '''
+    Get the path of a file of a species inserting the species name before the file extension
+    (before the extension of the uncompressed file when the file is compressed by gzip).
+    '''
+
+    # split the gzip extension
+    (root, gz_extension) = (file_path[:-3], file_path[-3:]) if file_path.endswith('.gz') else (file_path, '')
+
+    # split the file extension
+    (root, extension) = os.path.splitext(root)
+
+    return f'{root}-{species_name.replace(" ", "_")}{extension}{gz_extension}'
+
+#-------------------------------------------------------------------------------
+
 def get_fdr_method_code_list():
     '''
     Get the code list of "fdr_method".
@@ -1884,8 +1985,8 @@ def get_fasta_seq_dict(fasta_seq_file, cutting_char=' '):
             blank_space_pos = record.find(cutting_char)
             seq_id = record[1:blank_space_pos].strip('\n')
 
-            # initialize the sequence
-            seq = ''
+            # initialize the sequence line list
+            seq_line_list = []
 
             # read the next record
             record = fasta_seq_file_id.readline()
@@ -1898,8 +1999,8 @@ def get_fasta_seq_dict(fasta_seq_file, cutting_char=' '):
         # while there are records and they are sequence
         while record != '' and not record.startswith('>'):
 
-            # concatenate the record to the sequence
-            seq += record.strip()
+            # add the record to the sequence line list
+            seq_line_list.append(record.strip())
 
             # read the next record of FASTA sequnece file
             record = fasta_seq_file_id.readline()
@@ -1908,7 +2009,7 @@ def get_fasta_seq_dict(fasta_seq_file, cutting_char=' '):
         fasta_seq_counter += 1
 
         # insert data in the FASTA sequence dictionary
-        fasta_seq_dict[seq_id] = seq
+        fasta_seq_dict[seq_id] = ''.join(seq_line_list)
 
         # print the counters
         Message.print('verbose', f'\r{os.path.basename(fasta_seq_file)} processed seqs ... {fasta_seq_counter:8d}')
@@ -1923,6 +2024,172 @@ def get_fasta_seq_dict(fasta_seq_file, cutting_char=' '):
 
 #-------------------------------------------------------------------------------
 
+def get_homologous_proteins_file_name():
+    '''
+    Get the name of the container file with the homologous protein FASTA sequences of every sequence identification.
+    '''
+
+    return 'homologous-proteins.fasta'
+
+#-------------------------------------------------------------------------------
+
+def get_homologous_genes_file_name():
+    '''
+    Get the name of the container file with the homologous gene FASTA sequences of every sequence identification.
+    '''
+
+    return 'homologous-genes.fasta'
+
+#-------------------------------------------------------------------------------
+
+def get_container_index_file(container_file):
+    '''
+    Get the path of the offset index file corresponding to a container file.
+    '''
+
+    return f'{container_file}.idx'
+
+#-------------------------------------------------------------------------------
+
+def is_container_file(container_file):
+    '''
+    Check if a file is a container file, i. e. it exists and it has offset index file.
+    '''
+
+    return os.path.isfile(container_file) and os.path.isfile(get_container_index_file(container_file))
+
+#-------------------------------------------------------------------------------
+
+def get_fasta_index_file(fasta_file):
+    '''
+    Get the path of the faidx index file corresponding to a FASTA file.
+    '''
+
+    return f'{fasta_file}.fai'
+
+#-------------------------------------------------------------------------------
+
+def build_fasta_index(fasta_file, index_file=None, cutting_char=' '):
+    '''
+    Build the index of a FASTA file with the faidx format (name, sequence length, offset of
+    the first base, bases per line and bytes per line) when it does not exist or it is older
+    than the FASTA file. Return the path of the index file, or None when the file can not be
+    indexed because the lines of a sequence have different lengths or there are blank lines
+    inside a sequence.
+    '''
+
+    # set the index file path
+    if index_file is None:
+        index_file = get_fasta_index_file(fasta_file)
+
+    # the compressed files can not be accessed randomly
+    if fasta_file.endswith('.gz'):
+        raise ProgramException('', 'F005', fasta_file)
+
+    # reuse the index file when it is up to date
+    if os.path.isfile(index_file) and os.path.getmtime(index_file) >= os.path.getmtime(fasta_file):
+        Message.print('verbose', f'The index {os.path.basename(index_file)} is up to date.\n')
+        return index_file
+
+    # open the FASTA file
+    try:
+        fasta_file_id = open(fasta_file, mode='rb')
+    except Exception as e:
+        raise ProgramException(e, 'F001', fasta_file) from e
+
+    # open the index file
+    try:
+        index_file_id = open(index_file, mode='w', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise ProgramException(e, 'F003', index_file) from e
+
+    # initialize record counters
+    fasta_seq_counter = 0
+
+    # initialize the current offset of the FASTA file
+    offset = 0
+
+    # read the first record of FASTA file
+    record = fasta_file_id.readline()
+
+    # while there are records in FASTA file
+    while record != b'':
+
+        # process the head record
+        if record.startswith(b'>'):
+
+            # extract the identification
+            head = record.decode('iso-8859-1')
+            blank_space_pos = head.find(cutting_char)
+            seq_id = head[1:blank_space_pos].strip('\n') if blank_space_pos > -1 else head[1:].strip('\r\n')
+
+            # update the offset
+            offset += len(record)
+
+            # initialize the sequence data
+            seq_offset = offset
+            seq_length = 0
+            seq_line_counter = 0
+            line_bases = 0
+            line_width = 0
+            short_line_found = False
+
+            # read the next record
+            record = fasta_file_id.readline()
+
+        else:
+
+            # control the FASTA format
+            raise ProgramException('', 'F006', fasta_file, 'FASTA')
+
+        # while there are records and they are sequence
+        while record != b'' and not record.startswith(b'>'):
+
+            # get the bases of the record
+            bases = len(record.rstrip(b'\r\n'))
+
+            # set the line sizes with the first line of the sequence and check that all lines, except the last ones, have the same length
+            # (when they have not, the file can not be indexed and the partial index file is removed)
+            if seq_line_counter == 0:
+                line_bases = bases
+                line_width = len(record)
+            elif (short_line_found and bases > 0) or bases > line_bases:
+                Message.print('verbose', '\n')
+                fasta_file_id.close()
+                index_file_id.close()
+                os.remove(index_file)
+                return None
+            elif bases < line_bases:
+                short_line_found = True
+            seq_line_counter += 1
+
+            # update the sequence length and the offset
+            seq_length += bases
+            offset += len(record)
+
+            # read the next record of FASTA file
+            record = fasta_file_id.readline()
+
+        # add 1 to the read sequence counter
+        fasta_seq_counter += 1
+
+        # write the index record
+        index_file_id.write(f'{seq_id}\t{seq_length}\t{seq_offset}\t{line_bases}\t{line_width}\n')
+
+        # print the counters
+        Message.print('verbose', f'\r{os.path.basename(fasta_file)} indexed seqs ... {fasta_seq_counter:8d}')
+
+    Message.print('verbose', '\n')
+
+    # close files
+    fasta_file_id.close()
+    index_file_id.close()
+
+    # return the index file path
+    return index_file
+
+#-------------------------------------------------------------------------------
+
 def read_alignment_outfmt6_record(file_name, file_id, record_counter):
     '''
     Read the next record of the alignment file with output format 6.
@@ -1978,6 +2245,116 @@ def read_alignment_outfmt6_record(file_name, file_id, record_counter):
 
 #-------------------------------------------------------------------------------
 
+def get_alignment_outfmt6_column_list():
+    '''
+    Get the list of columns of the alignment files with output format 6.
+    '''
+
+    return ['qseqid', 'sseqid', 'pident', 'length', 'mismatch', 'gapopen', 'qstart', 'qend', 'sstart', 'send', 'evalue', 'bitscore']
+
+#-------------------------------------------------------------------------------
+
+def get_alignment_outfmt6_column_dtype_dict():
+    '''
+    Get the dictionary of the NumPy data types of the columns of the alignment files with
+    output format 6.
+    '''
+
+    return {'qseqid': 'str', 'sseqid': 'str', 'pident': 'float64', 'length': 'int64', 'mismatch': 'int64', 'gapopen': 'int64', 'qstart': 'int64', 'qend': 'int64', 'sstart': 'int64', 'send': 'int64', 'evalue': 'float64', 'bitscore': 'float64'}
+
+#-------------------------------------------------------------------------------
+
+def read_alignment_outfmt6_batches(file_name, file_id, batch_size=None, column_list=None, numpy_arrays=False, size_limit=None):
+    '''
+    Read the records of the alignment file with output format 6 from the current position and yield
+    them in batches of "batch_size" records (default: Const.DEFAULT_ALIGNMENT_BATCH_SIZE) as lists of
+    tuples with the columns of "column_list" (default: all the columns). When "numpy_arrays" is True,
+    every batch is yielded as a dictionary of NumPy arrays per column. When "size_limit" is not None,
+    the reading stops when the records read reach this size in characters.
+    '''
+
+    # set the batch size
+    if batch_size is None:
+        batch_size = Const.DEFAULT_ALIGNMENT_BATCH_SIZE
+
+    # get the indexes of the columns
+    all_column_list = get_alignment_outfmt6_column_list()
+    if column_list is None:
+        column_list = all_column_list
+    try:
+        index_list = [all_column_list.index(column) for column in column_list]
+    except Exception as e:
+        raise ProgramException(e, 'P001') from e
+
+    # import NumPy when the batches are yielded as NumPy arrays
+    if numpy_arrays:
+        try:
+            import numpy    # pylint: disable=import-outside-toplevel
+        except Exception as e:
+            raise ProgramException(e, 'S002', 'numpy') from e
+        column_dtype_dict = get_alignment_outfmt6_column_dtype_dict()
+
+    # check if there are records to read
+    if size_limit is not None and size_limit <= 0:
+        return
+
+    # initialize the record counter and the size of the records read
+    record_counter = 0
+    size = 0
+
+    # initialize the batch
+    batch_list = []
+
+    # read the records
+    # record format: qseqid <field_sep> sseqid <field_sep> pident <field_sep> length <field_sep> mismatch <field_sep> gapopen <field_sep> qstart <field_sep> qend <field_sep> sstart <field_sep> send <field_sep> evalue <field_sep> bitscore <record_sep>
+    for record in iter(file_id.readline, ''):
+
+        # add 1 to the record counter
+        record_counter += 1
+
+        # extract the data of the columns
+        data_list = record.replace('\n', '').split('\t')
+        if len(data_list) < len(all_column_list):
+            raise ProgramException('', 'F006', os.path.basename(file_name), record_counter)
+        batch_list.append(tuple([data_list[i].strip() for i in index_list]))
+
+        # check the size limit
+        size += len(record)
+        limit_reached = size_limit is not None and size >= size_limit
+
+        # yield the batch when it is full or the size limit is reached
+        if len(batch_list) >= batch_size or limit_reached:
+            yield batch_list if not numpy_arrays else build_alignment_outfmt6_array_dict(numpy, batch_list, column_list, column_dtype_dict, file_name, record_counter)
+            batch_list = []
+        if limit_reached:
+            break
+
+    # yield the last batch
+    if batch_list:
+        yield batch_list if not numpy_arrays else build_alignment_outfmt6_array_dict(numpy, batch_list, column_list, column_dtype_dict, file_name, record_counter)
+
+#-------------------------------------------------------------------------------
+
+def build_alignment_outfmt6_array_dict(numpy, batch_list, column_list, column_dtype_dict, file_name, record_counter):
+    '''
+    Build the dictionary of NumPy arrays per column of a batch of alignment records.
+    '''
+
+    # initialize the dictionary
+    array_dict = {}
+
+    # transpose the batch and convert every column to an array
+    try:
+        for column, value_tuple in zip(column_list, zip(*batch_list)):
+            array_dict[column] = numpy.array(value_tuple, dtype=column_dtype_dict[column])
+    except Exception as e:
+        raise ProgramException(e, 'F006', os.path.basename(file_name), record_counter) from e
+
+    # return the dictionary
+    return array_dict
+
+#-------------------------------------------------------------------------------
+
 def read_functional_annotation_record(file_name, file_id, record_counter):
     '''
     Read the next record of the functional annotation file.
@@ -2061,6 +2438,47 @@ def read_functional_annotation_record(file_name, file_id, record_counter):
 
 #-------------------------------------------------------------------------------
 
+def read_functional_annotation_records(file_name, file_id, column_list=None):
+    '''
+    Read the data records of the functional annotation file (the head is skipped) and yield them
+    as FunctionalAnnotationRecord instances whose fields are decoded when they are accessed.
+    When "column_list" is not None, only its columns are split and can be accessed.
+    '''
+
+    # get the index of every column
+    head_column_list = get_functional_annotation_head().split(';')
+    if column_list is None:
+        column_list = head_column_list
+    try:
+        column_index_dict = {column: head_column_list.index(column) for column in column_list}
+    except Exception as e:
+        raise ProgramException(e, 'P001') from e
+
+    # set the number of splits needed to get the columns
+    max_split = max(column_index_dict.values()) + 1
+
+    # skip the head
+    file_id.readline()
+
+    # initialize the record counter
+    record_counter = 0
+
+    # read the records
+    for record in iter(file_id.readline, ''):
+
+        # add 1 to the record counter
+        record_counter += 1
+
+        # split the record until the last column used
+        field_list = record.split(';', max_split)
+        if len(field_list) < max_split:
+            raise ProgramException('', 'F006', os.path.basename(file_name), record_counter)
+
+        # yield the record
+        yield FunctionalAnnotationRecord(field_list, column_index_dict)
+
+#-------------------------------------------------------------------------------
+
 def read_homology_relationships_record(file_name, file_id, record_counter):
     '''
     Read the next record of the homology relationships file.
@@ -2108,6 +2526,75 @@ def read_homology_relationships_record(file_name, file_id, record_counter):
 
 #-------------------------------------------------------------------------------
 
+def sort_text_file(input_file, output_file, key_function, temp_dir, buffer_size=None, head_number=0):
+    '''
+    Sort the records of a text file with an external merge sort using chunks of "buffer_size" MiB
+    saved in temporal files of "temp_dir". The sort is stable and the first "head_number" records
+    are not sorted.
+    '''
+
+    # open the input file
+    if input_file.endswith('.gz'):
+        try:
+            input_file_id = gzip.open(input_file, mode='rt', encoding='iso-8859-1', newline='')
+        except Exception as e:
+            raise ProgramException(e, 'F002', input_file)
+    else:
+        try:
+            input_file_id = open(input_file, mode='r', encoding='iso-8859-1', newline='')
+        except Exception as e:
+            raise ProgramException(e, 'F001', input_file)
+
+    # read the head records
+    head_record_list = []
+    while len(head_record_list) < head_number:
+        record = input_file_id.readline()
+        if record == '':
+            break
+        head_record_list.append(record if record.endswith('\n') else f'{record}\n')
+
+    # create the writer of the output file
+    output_file_writer = SortedTextFileWriter(output_file, temp_dir, buffer_size=buffer_size, key_function=key_function, head_record_list=head_record_list)
+
+    # write the records
+    for record in input_file_id:
+        output_file_writer.write(record if record.endswith('\n') else f'{record}\n')
+
+    # close files
+    input_file_id.close()
+    output_file_writer.close()
+
+#-------------------------------------------------------------------------------
+
+def get_functional_annotation_head():
+    '''
+    Get the head of the functional annotation files.
+    '''
+
+    # -- return 'qseqid;sseqid;pident;length;mismatch;gapopen;qstart;qend;sstart;send;evalue;bitscore;algorithm;protein_description;protein_species;tair10_ortholog_seq_id;tair10_description;qlobata_gene_id;interpro_goterms;panther_goterms;metacyc_pathways;reactome_pathways;eggnog_ortholog_seq_id;eggnog_ortholog_species;eggnog_ogs;cog_category;eggnog_description;eggnog_goterms;ec;kegg_kos;kegg_pathways;kegg_modules;kegg_reactions;kegg_rclasses;brite;kegg_tc;cazy;pfams'
+    return 'qseqid;sseqid;pident;length;mismatch;gapopen;qstart;qend;sstart;send;evalue;bitscore;algorithm;protein_description;protein_species;tair10_ortholog_seq_id;tair10_description;qlobata_gene_id;interpro_goterms;panther_goterms;metacyc_pathways;eggnog_ortholog_seq_id;eggnog_ortholog_species;eggnog_ogs;cog_category;eggnog_description;eggnog_goterms;ec;kegg_kos;kegg_pathways;kegg_modules;kegg_reactions;kegg_rclasses;brite;kegg_tc;cazy;pfams'
+
+#-------------------------------------------------------------------------------
+
+def get_functional_annotation_term_id_list(data_dict, column_list):
+    '''
+    Get the sorted list of the unique term identifications of the columns of a column list of
+    a functional annotation record (terms format: "term_id1|term_id2|...|term_idn").
+    '''
+
+    # initialize the set of term identifications
+    term_id_set = set()
+
+    # extract the term identifications of every column
+    for column in column_list:
+        if data_dict[column] != '' and data_dict[column] != '-':
+            term_id_set.update(data_dict[column].split('|'))
+
+    # return the sorted list of term identifications
+    return sorted(term_id_set)
+
+#-------------------------------------------------------------------------------
+
 def get_ncbi_protein_seq(protein_id):
     '''
     Get the protein sequence of the NCBI.
@@ -2132,9 +2619,24 @@ class Const():
 
     #---------------
 
+    DEFAULT_ALIGNMENT_BATCH_SIZE = 10000
+    DEFAULT_ANNOTATION_BATCH_SIZE = 5000
+    DEFAULT_BACKGROUND_CACHE_SIZE = 200
+    DEFAULT_BACKGROUND_ONLY = 'N'
+    DEFAULT_CLUSTER_CACHE_SIZE = 10000
+    DEFAULT_CONTAINER = 'N'
+    DEFAULT_DB_CACHE_SIZE = 64
+    DEFAULT_DB_MMAP_SIZE = 1024
     DEFAULT_FDR_METHOD = 'by'
+    DEFAULT_HOMOLOGY_CACHE_SIZE = 10000
     DEFAULT_MIN_SEQNUM_ANNOTATIONS = 5
     DEFAULT_MIN_SEQNUM_SPECIES = 10
+    DEFAULT_PROFILE_SQL = 'N'
+    DEFAULT_SORT_BUFFER_SIZE = 512
+    DEFAULT_SORTED_INPUTS = 'N'
+    DEFAULT_SQL_ID_CHUNK_SIZE = 5000
+    DEFAULT_STREAMING = 'N'
+    DEFAULT_THREADS = 1
     DEFAULT_TRACE = 'N'
     DEFAULT_TREE_GENERATION = 'N'
     DEFAULT_VERBOSE = 'N'
@@ -2277,6 +2779,779 @@ class NestedDefaultDict(collections.defaultdict):
 
 #-------------------------------------------------------------------------------
 
+class LRUCache():
+    '''
+    This class implements a bounded cache with LRU (least recently used) eviction
+    and hit/miss counters.
+    '''
+
+    #---------------
+
+    def __init__(self, max_size):
+        '''
+        Create a class instance. A maximum size of 0 disables the cache.
+        '''
+
+        self.max_size = max_size
+        self.data_dict = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    #---------------
+
+    def get(self, key, default=None):
+        '''
+        Get the value of a key and mark it as the most recently used.
+        '''
+
+        try:
+            value = self.data_dict[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.data_dict.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    #---------------
+
+    def put(self, key, value):
+        '''
+        Save the value of a key evicting the least recently used one when the cache is full.
+        '''
+
+        if self.max_size <= 0:
+            return
+
+        self.data_dict[key] = value
+        self.data_dict.move_to_end(key)
+
+        if len(self.data_dict) > self.max_size:
+            self.data_dict.popitem(last=False)
+            self.evictions += 1
+
+    #---------------
+
+    def get_stats_text(self):
+        '''
+        Get a text with the cache statistics.
+        '''
+
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups > 0 else 0.
+
+        return f'{self.hits} hits, {self.misses} misses ({hit_rate:.2f}% hit rate), {self.evictions} evictions, {len(self.data_dict)}/{self.max_size} entries'
+
+    #---------------
+
+    def __contains__(self, key):
+
+        return key in self.data_dict
+
+    #---------------
+
+    def __len__(self):
+
+        return len(self.data_dict)
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class DiskCache():
+    '''
+    This class implements a bounded cache of JSON values saved in a directory, one file per entry,
+    with LRU (least recently used) eviction, invalidation of entries and hit/miss counters. The key
+    of an entry is a dictionary whose values are text or numbers.
+    '''
+
+    #---------------
+
+    def __init__(self, cache_dir, max_size):
+        '''
+        Create a class instance. A maximum size of 0 disables the cache. When the cache directory
+        can not be created or written, a warning is printed and the cache is disabled.
+        '''
+
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        # create the cache directory
+        if self.max_size > 0:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                if not os.access(self.cache_dir, os.W_OK):
+                    raise PermissionError(f'The directory {self.cache_dir} is not writable.')
+            except Exception as e:
+                Message.print('info', f'*** WARNING: The cache directory {self.cache_dir} can not be used ({e}), so the cache is disabled.')
+                self.max_size = 0
+
+    #---------------
+
+    def get_entry_file(self, key_dict):
+        '''
+        Get the path of the file of the entry of a key.
+        '''
+
+        key_text = json.dumps(key_dict, sort_keys=True)
+
+        return f'{self.cache_dir}{os.sep}{hashlib.sha256(key_text.encode()).hexdigest()}.json'
+
+    #---------------
+
+    def get_entry_file_list(self):
+        '''
+        Get the paths of the files of the entries.
+        '''
+
+        try:
+            return [f'{self.cache_dir}{os.sep}{file_name}' for file_name in os.listdir(self.cache_dir) if file_name.endswith('.json')]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+
+    #---------------
+
+    def read_entry_file(self, entry_file):
+        '''
+        Read the file of an entry and return its key dictionary and value; None when the file
+        is not found or it is corrupted (then it is removed).
+        '''
+
+        try:
+            with open(entry_file, mode='r', encoding='utf-8') as entry_file_id:
+                entry_dict = json.load(entry_file_id)
+            return entry_dict['key'], entry_dict['value']
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.remove_entry_file(entry_file)
+            return None
+
+    #---------------
+
+    @staticmethod
+    def remove_entry_file(entry_file):
+        '''
+        Remove the file of an entry (when it is already removed by another process, nothing is done).
+        '''
+
+        try:
+            os.remove(entry_file)
+        except FileNotFoundError:
+            pass
+
+    #---------------
+
+    def get(self, key_dict, default=None):
+        '''
+        Get the value of a key and mark it as the most recently used.
+        '''
+
+        entry = self.read_entry_file(self.get_entry_file(key_dict)) if self.max_size > 0 else None
+        if entry is None or entry[0] != key_dict:
+            self.misses += 1
+            return default
+
+        try:
+            os.utime(self.get_entry_file(key_dict))
+        except OSError:
+            pass
+        self.hits += 1
+
+        return entry[1]
+
+    #---------------
+
+    def put(self, key_dict, value):
+        '''
+        Save the value of a key evicting the least recently used entries when the cache is full.
+        The file is written in a temporal file and then renamed to be safe with concurrent processes.
+        '''
+
+        if self.max_size <= 0:
+            return
+
+        # write the entry file
+        entry_file = self.get_entry_file(key_dict)
+        temp_entry_file = f'{entry_file}.{os.getpid()}.tmp'
+        try:
+            with open(temp_entry_file, mode='w', encoding='utf-8', newline='\n') as temp_entry_file_id:
+                json.dump({'key': key_dict, 'value': value}, temp_entry_file_id)
+            os.replace(temp_entry_file, entry_file)
+        except Exception as e:
+            raise ProgramException(e, 'F003', entry_file) from e
+
+        # evict the least recently used entries
+        entry_file_list = self.get_entry_file_list()
+        if len(entry_file_list) > self.max_size:
+            mtime_list = []
+            for file in entry_file_list:
+                try:
+                    mtime_list.append((os.path.getmtime(file), file))
+                except OSError:
+                    pass
+            for (_, file) in sorted(mtime_list)[:len(mtime_list) - self.max_size]:
+                if file != entry_file:
+                    self.remove_entry_file(file)
+                    self.evictions += 1
+
+    #---------------
+
+    def invalidate(self, predicate):
+        '''
+        Remove the entries whose key dictionary fulfills a predicate.
+        '''
+
+        if self.max_size <= 0:
+            return
+
+        for entry_file in self.get_entry_file_list():
+            entry = self.read_entry_file(entry_file)
+            if entry is not None and predicate(entry[0]):
+                self.remove_entry_file(entry_file)
+                self.invalidations += 1
+
+    #---------------
+
+    def get_stats_text(self):
+        '''
+        Get a text with the cache statistics.
+        '''
+
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups > 0 else 0.
+
+        return f'{self.hits} hits, {self.misses} misses ({hit_rate:.2f}% hit rate), {self.evictions} evictions, {self.invalidations} invalidations, {len(self.get_entry_file_list())}/{self.max_size} entries'
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class FunctionalAnnotationRecord():
+    '''
+    This class represents a record of the functional annotation files whose fields are
+    decoded only when they are accessed with the column name as key.
+    '''
+
+    #---------------
+
+    __slots__ = ('field_list', 'column_index_dict')
+
+    #---------------
+
+    def __init__(self, field_list, column_index_dict):
+        '''
+        Create a class instance from the list of fields of the record and the dictionary of
+        the indexes of the columns that can be accessed.
+        '''
+
+        self.field_list = field_list
+        self.column_index_dict = column_index_dict
+
+    #---------------
+
+    def __getitem__(self, column):
+        '''
+        Get the value of a column.
+        '''
+
+        return self.field_list[self.column_index_dict[column]].strip()
+
+    #---------------
+
+    def get_key(self):
+        '''
+        Get the key of the record.
+        '''
+
+        return f'{self["qseqid"]}-{self["sseqid"]}'
+
+    #---------------
+
+    def to_dict(self):
+        '''
+        Get a data dictionary with the columns that can be accessed.
+        '''
+
+        return {column: self[column] for column in self.column_index_dict}
+
+   #---------------
+
+#-------------------------------------------------------------------------------
+
+class IndexedFastaFile():
+    '''
+    This class gives a dictionary-like read-only access to the sequences of a FASTA file through
+    its faidx index and a memory map of the file, so only the sequences that are looked up are
+    read. The index is built when it does not exist or it is out of date.
+    '''
+
+    #---------------
+
+    def __init__(self, fasta_file, index_file=None, cutting_char=' '):
+        '''
+        Create a class instance.
+        '''
+
+        self.fasta_file = fasta_file
+        self.index_file = build_fasta_index(fasta_file, index_file, cutting_char)
+        if self.index_file is None:
+            raise ProgramException('', 'F006', fasta_file, 'FASTA')
+
+        # load the index dictionary: sequence identification -> (length, offset, bases per line, bytes per line)
+        self.index_dict = {}
+        try:
+            with open(self.index_file, mode='r', encoding='iso-8859-1') as index_file_id:
+                for record in index_file_id:
+                    field_list = record.rstrip('\n').split('\t')
+                    if len(field_list) < 5:
+                        raise ProgramException('', 'F006', self.index_file, record)
+                    self.index_dict[field_list[0]] = (int(field_list[1]), int(field_list[2]), int(field_list[3]), int(field_list[4]))
+        except ProgramException:
+            raise
+        except Exception as e:
+            raise ProgramException(e, 'F001', self.index_file) from e
+
+        # map the FASTA file in memory
+        try:
+            self.file_id = open(fasta_file, mode='rb')
+        except Exception as e:
+            raise ProgramException(e, 'F001', fasta_file) from e
+        self.mmap = mmap.mmap(self.file_id.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(fasta_file) > 0 else None
+
+    #---------------
+
+    def get(self, seq_id, default=None):
+        '''
+        Get the sequence of an identification or the default value when it does not exist.
+        '''
+
+        try:
+            return self[seq_id]
+        except KeyError:
+            return default
+
+    #---------------
+
+    def keys(self):
+        '''
+        Get the sequence identifications.
+        '''
+
+        return self.index_dict.keys()
+
+    #---------------
+
+    def close(self):
+        '''
+        Release the memory map and close the FASTA file.
+        '''
+
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+        self.file_id.close()
+
+    #---------------
+
+    def __getitem__(self, seq_id):
+        '''
+        Get the sequence of an identification.
+        '''
+
+        (length, offset, line_bases, line_width) = self.index_dict[seq_id]
+
+        # calculate the end offset of the sequence skipping the line ends
+        if line_bases > 0:
+            end_offset = offset + (length // line_bases) * line_width + length % line_bases
+        else:
+            end_offset = offset
+
+        return self.mmap[offset:end_offset].translate(None, b'\r\n').decode('iso-8859-1')
+
+    #---------------
+
+    def __contains__(self, seq_id):
+
+        return seq_id in self.index_dict
+
+    #---------------
+
+    def __len__(self):
+
+        return len(self.index_dict)
+
+    #---------------
+
+    def __enter__(self):
+
+        return self
+
+    #---------------
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class ContainerWriter():
+    '''
+    This class writes a container file: a text file with the concatenation of several entries
+    (for example, FASTA files) and an offset index file with the identification, the offset
+    and the length of each entry. The index record of an entry is written after its data,
+    so an interrupted run leaves a valid container with the entries completely written and
+    the run can be restarted in append mode adding only the missing entries.
+    '''
+
+    #---------------
+
+    def __init__(self, container_file, append=False):
+        '''
+        Create a class instance and open the container and index files.
+        '''
+
+        self.container_file = container_file
+        self.index_file = get_container_index_file(container_file)
+
+        # load the identifications of the entries already written when the container is appended
+        # and truncate a malformed last index record
+        self.entry_id_set = set()
+        if append and is_container_file(container_file):
+            with IndexedContainer(container_file) as container:
+                self.entry_id_set = set(container.keys())
+                index_size = container.index_size
+            try:
+                if os.path.getsize(self.index_file) > index_size:
+                    os.truncate(self.index_file, index_size)
+            except Exception as e:
+                raise ProgramException(e, 'F003', self.index_file) from e
+        else:
+            append = False
+
+        # open the container and index files
+        try:
+            self.file_id = open(container_file, mode='ab' if append else 'wb')
+        except Exception as e:
+            raise ProgramException(e, 'F003', container_file) from e
+        try:
+            self.index_file_id = open(self.index_file, mode='a' if append else 'w', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise ProgramException(e, 'F003', self.index_file) from e
+
+    #---------------
+
+    def write_entry(self, entry_id, text):
+        '''
+        Write the text of an entry and its index record.
+        '''
+
+        data = text.encode('iso-8859-1')
+        offset = self.file_id.seek(0, os.SEEK_END)
+        try:
+            self.file_id.write(data)
+            self.file_id.flush()
+            self.index_file_id.write(f'{entry_id}\t{offset}\t{len(data)}\n')
+            self.index_file_id.flush()
+        except Exception as e:
+            raise ProgramException(e, 'F003', self.container_file) from e
+        self.entry_id_set.add(entry_id)
+
+    #---------------
+
+    def close(self):
+        '''
+        Close the container and index files.
+        '''
+
+        self.file_id.close()
+        self.index_file_id.close()
+
+    #---------------
+
+    def __contains__(self, entry_id):
+
+        return entry_id in self.entry_id_set
+
+    #---------------
+
+    def __enter__(self):
+
+        return self
+
+    #---------------
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class IndexedContainer():
+    '''
+    This class gives a dictionary-like read-only access to the entries of a container file
+    written by ContainerWriter through its offset index and a memory map of the file, so only
+    the entries that are looked up are read. When an entry is written several times, the last
+    one is got.
+    '''
+
+    #---------------
+
+    def __init__(self, container_file):
+        '''
+        Create a class instance.
+        '''
+
+        self.container_file = container_file
+        self.index_file = get_container_index_file(container_file)
+
+        # get the size of the container file
+        try:
+            container_size = os.path.getsize(container_file)
+        except Exception as e:
+            raise ProgramException(e, 'F001', container_file) from e
+
+        # load the index dictionary: entry identification -> (offset, length)
+        # (the records of entries whose data were not completely written are ignored, and so is
+        # a malformed last record, which is left by a run interrupted while writing it)
+        self.index_dict = {}
+        self.index_size = 0
+        malformed_record = None
+        try:
+            with open(self.index_file, mode='r', encoding='iso-8859-1', newline='\n') as index_file_id:
+                for record in index_file_id:
+                    if malformed_record is not None:
+                        raise ProgramException('', 'F006', self.index_file, malformed_record)
+                    field_list = record.rstrip('\n').split('\t')
+                    try:
+                        (offset, length) = (int(field_list[1]), int(field_list[2]))
+                    except (IndexError, ValueError):
+                        (offset, length) = (None, None)
+                    if not record.endswith('\n') or len(field_list) != 3 or offset is None:
+                        malformed_record = record
+                        continue
+                    if offset + length <= container_size:
+                        self.index_dict[field_list[0]] = (offset, length)
+                    self.index_size += len(record)
+        except ProgramException:
+            raise
+        except Exception as e:
+            raise ProgramException(e, 'F001', self.index_file) from e
+
+        # map the container file in memory
+        try:
+            self.file_id = open(container_file, mode='rb')
+        except Exception as e:
+            raise ProgramException(e, 'F001', container_file) from e
+        self.mmap = mmap.mmap(self.file_id.fileno(), 0, access=mmap.ACCESS_READ) if container_size > 0 else None
+
+    #---------------
+
+    def get(self, entry_id, default=None):
+        '''
+        Get the text of an entry or the default value when it does not exist.
+        '''
+
+        try:
+            return self[entry_id]
+        except KeyError:
+            return default
+
+    #---------------
+
+    def keys(self):
+        '''
+        Get the entry identifications.
+        '''
+
+        return self.index_dict.keys()
+
+    #---------------
+
+    def extract(self, entry_id, file_path):
+        '''
+        Save the text of an entry in a file.
+        '''
+
+        try:
+            with open(file_path, mode='w', encoding='iso-8859-1', newline='\n') as file_id:
+                file_id.write(self[entry_id])
+        except KeyError:
+            raise
+        except Exception as e:
+            raise ProgramException(e, 'F003', file_path) from e
+
+    #---------------
+
+    def close(self):
+        '''
+        Release the memory map and close the container file.
+        '''
+
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+        self.file_id.close()
+
+    #---------------
+
+    def __getitem__(self, entry_id):
+        '''
+        Get the text of an entry.
+        '''
+
+        (offset, length) = self.index_dict[entry_id]
+
+        return self.mmap[offset:offset + length].decode('iso-8859-1') if length > 0 else ''
+
+    #---------------
+
+    def __contains__(self, entry_id):
+
+        return entry_id in self.index_dict
+
+    #---------------
+
+    def __len__(self):
+
+        return len(self.index_dict)
+
+    #---------------
+
+    def __enter__(self):
+
+        return self
+
+    #---------------
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class SortedTextFileWriter():
+    '''
+    This class writes a text file whose records are sorted with an external merge sort: the records
+    are kept in memory up to "buffer_size" MiB, then they are sorted and saved in a temporal chunk
+    file, and when the writer is closed, the chunks are merged in the file after the head records.
+    The sort is stable and the records are sorted by "key_function" or by the whole record.
+    '''
+
+    #---------------
+
+    def __init__(self, file_name, temp_dir, buffer_size=None, key_function=None, head_record_list=None):
+        '''
+        Create a class instance and open the file.
+        '''
+
+        self.file_name = file_name
+        self.temp_dir = temp_dir
+        self.max_chunk_size = (Const.DEFAULT_SORT_BUFFER_SIZE if buffer_size is None else buffer_size) * 1024 * 1024
+        self.key_function = key_function
+        self.head_record_list = [] if head_record_list is None else head_record_list
+        self.record_list = []
+        self.chunk_size = 0
+        self.chunk_file_list = []
+
+        # open the file
+        if file_name.endswith('.gz'):
+            try:
+                self.file_id = gzip.open(file_name, mode='wt', encoding='iso-8859-1', newline='')
+            except Exception as e:
+                raise ProgramException(e, 'F004', file_name)
+        else:
+            try:
+                self.file_id = open(file_name, mode='w', encoding='iso-8859-1', newline='')
+            except Exception as e:
+                raise ProgramException(e, 'F003', file_name)
+
+    #---------------
+
+    def write(self, record):
+        '''
+        Add a record ended by a new line.
+        '''
+
+        self.record_list.append(record)
+        self.chunk_size += len(record)
+
+        if self.chunk_size >= self.max_chunk_size:
+            self.write_chunk()
+
+    #---------------
+
+    def write_chunk(self):
+        '''
+        Sort the records in memory and save them in a temporal chunk file.
+        '''
+
+        self.record_list.sort(key=self.key_function)
+
+        (chunk_file_handle, chunk_file) = tempfile.mkstemp(prefix='sort-chunk-', suffix='.txt', dir=self.temp_dir)
+        try:
+            with open(chunk_file_handle, mode='w', encoding='iso-8859-1', newline='') as chunk_file_id:
+                chunk_file_id.writelines(self.record_list)
+        except Exception as e:
+            raise ProgramException(e, 'F003', chunk_file)
+
+        self.chunk_file_list.append(chunk_file)
+        self.record_list = []
+        self.chunk_size = 0
+
+    #---------------
+
+    def close(self):
+        '''
+        Write the head records and the sorted records, and close the file.
+        '''
+
+        # write the head records
+        self.file_id.writelines(self.head_record_list)
+
+        # when all records are in memory, write them sorted
+        if not self.chunk_file_list:
+            self.record_list.sort(key=self.key_function)
+            self.file_id.writelines(self.record_list)
+            self.record_list = []
+
+        # otherwise, merge the chunk files
+        else:
+            if self.record_list:
+                self.write_chunk()
+            chunk_file_id_list = []
+            for chunk_file in self.chunk_file_list:
+                try:
+                    chunk_file_id_list.append(open(chunk_file, mode='r', encoding='iso-8859-1', newline=''))
+                except Exception as e:
+                    raise ProgramException(e, 'F001', chunk_file)
+            self.file_id.writelines(heapq.merge(*chunk_file_id_list, key=self.key_function))
+            for chunk_file_id in chunk_file_id_list:
+                chunk_file_id.close()
+            for chunk_file in self.chunk_file_list:
+                os.remove(chunk_file)
+            self.chunk_file_list = []
+
+        # close the file
+        self.file_id.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
 class BreakAllLoops(Exception):
     '''
     This class is used to break out of nested loops.
@@ -52,14 +52,18 @@ def main():
     args = parser.parse_args()
     check_args(args)
 
+    # enable the SQL instrumentation
+    if args.profile_sql.upper() == 'Y':
+        sqllib.enable_sql_profiling(os.path.basename(__file__))
+
     # connect to the quercusTOA comparative genomics database
-    conn = sqllib.connect_database(args.comparative_genomics_database)
+    conn = sqllib.connect_database(args.comparative_genomics_database, read_only=True)
 
     # attach to the quercusTOA functional annotations database
     sqllib.attach_database(conn, 'functional_annotations_database', args.functional_annotations_database)
 
     # get the homology relationships corresponding to set of sequence clusters yielded by the alignment process
-    get_cluster_homology_relationships(conn, args.blastp_alignment_file, args.homology_relationships_file)
+    get_cluster_homology_relationships(conn, args.blastp_alignment_file, args.homology_relationships_file, args.homology_cache_size)
 
     # close connection to quercusTOA comparative genomics database
     conn.close()
@@ -83,6 +87,8 @@ def build_parser():
     parser.add_argument('--annotations-db', dest='functional_annotations_database', help=f'Path of the {genlib.get_app_short_name} functional annotations database (mandatory).')
     parser.add_argument('--blastp-alignments', dest='blastp_alignment_file', help='Path of the alignment file yielded by blastp (mandatory).')
     parser.add_argument('--homology', dest='homology_relationships_file', help='Path of the homology relationships file (mandatory).')
+    parser.add_argument('--cache-size', dest='homology_cache_size', help=f'Maximum number of reference proteins whose homology relationships are cached (0 disables the cache); default: {genlib.Const.DEFAULT_HOMOLOGY_CACHE_SIZE}.')
+    parser.add_argument('--profile-sql', dest='profile_sql', help=f'Record the calls, latencies and rows of the database accesses, print a summary at exit and save it as JSON in the current directory: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_PROFILE_SQL} (Y when the environment variable {genlib.get_sql_profile_env_var()} is Y).')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {genlib.get_verbose_code_list_text()}; default: {genlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {genlib.get_trace_code_list_text()}; default: {genlib.Const.DEFAULT_TRACE}.')
 
@@ -128,6 +134,22 @@ def check_args(args):
         genlib.Message.print('error', '*** The homology relationships file is not indicated in the input arguments.')
         OK = False
 
+    # check "homology_cache_size"
+    if args.homology_cache_size is None:
+        args.homology_cache_size = genlib.Const.DEFAULT_HOMOLOGY_CACHE_SIZE
+    elif not genlib.check_int(args.homology_cache_size, minimum=0):
+        genlib.Message.print('error', 'The maximum number of reference proteins whose homology relationships are cached has to be an integer number greater than or equal to 0.')
+        OK = False
+    else:
+        args.homology_cache_size = int(args.homology_cache_size)
+
+    # check "profile_sql"
+    if args.profile_sql is None:
+        args.profile_sql = genlib.get_sql_profile_default()
+    elif not genlib.check_code(args.profile_sql, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** profile_sql has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = genlib.Const.DEFAULT_VERBOSE
@@ -152,12 +174,19 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def get_cluster_homology_relationships(conn, blastp_alignment_file, homology_relationships_file):
+def get_cluster_homology_relationships(conn, blastp_alignment_file, homology_relationships_file, homology_cache_size):
     '''
     Get the homology relationships corresponding to set of sequence clusters yielded by the alignment process.
     WARNING: The alignment file should contain only one record per query sequence.
     '''
 
+    # initialize the cache of the homology relationships of each reference protein
+    # (the query sequences that hit the same cluster share the reference protein)
+    homology_relationships_cache = genlib.LRUCache(homology_cache_size)
+
+    # initialize the counter of reference proteins whose homology relationships are got from the database
+    resolved_reference_protein_counter = 0
+
     # open the alignment file yielded by blastp
     if blastp_alignment_file.endswith('.gz'):
         try:
@@ -189,43 +218,62 @@ def get_cluster_homology_relationships(conn, blastp_alignment_file, homology_rel
     homology_relationships_record = 'Sequence id;Species id;Homologous gene id;Homologous protein isoforms'
     homology_relationships_file_id.write(f'{homology_relationships_record}\n')
 
-    # read the first record of alignment file yielded by blastp
-    (blastp_alignment_record, _, blastp_alignment_data_dict) = genlib.read_alignment_outfmt6_record(blastp_alignment_file, blastp_alignment_file_id, blastp_alignment_record_counter)
-
-    # while there are records in the alignment file yielded by blastp
-    while blastp_alignment_record != '':
-
-        # get alignment data
-        qseqid = blastp_alignment_data_dict['qseqid']
-        sseqid = blastp_alignment_data_dict['sseqid']
-
-        # get the reference protein identification
-        relationships_dict = sqllib.get_mmseqs2_protein_clusters_dict(conn, sseqid)
-        for key, data in relationships_dict.items():
-            reference_protein_id = data['seq_id']
-
-        # get homology relationships dictionary
-        (homology_relationships_dict) = get_homology_relationships(conn, reference_protein_id)
-
-        # write the homology relationships in the homology relationships file
-        homology_relationships_record = ''
-        if homology_relationships_dict:
-            for key in sorted(homology_relationships_dict):
-                data = homology_relationships_dict[key]
-                species_id = data['species_id']
-                gene_id = data['gene_id']
-                protein_isoform_ids = data['protein_isoform_ids']
-                homology_relationships_record = f'{qseqid};{species_id};{gene_id};{protein_isoform_ids}'
+    # read the alignment file yielded by blastp in batches of sequence identification pairs
+    for batch_list in genlib.read_alignment_outfmt6_batches(blastp_alignment_file, blastp_alignment_file_id, column_list=['qseqid', 'sseqid']):
+
+        # get the relationships of the clusters of the batch
+        relationships_per_cluster_dict = sqllib.get_mmseqs2_protein_clusters_dict_many(conn, [sseqid for (_, sseqid) in batch_list])
+
+        # get the reference protein identification of each record of the batch
+        reference_protein_id_list = []
+        for (_, sseqid) in batch_list:
+            for key, data in relationships_per_cluster_dict.get(sseqid, {}).items():
+                reference_protein_id = data['seq_id']
+            reference_protein_id_list.append(reference_protein_id)
+
+        # get the homology relationships of the reference proteins of the batch from the cache
+        homology_relationships_per_protein_dict = {}
+        uncached_reference_protein_id_list = []
+        for reference_protein_id in dict.fromkeys(reference_protein_id_list):
+            homology_relationships_dict = homology_relationships_cache.get(reference_protein_id)
+            if homology_relationships_dict is not None:
+                homology_relationships_per_protein_dict[reference_protein_id] = homology_relationships_dict
+            else:
+                uncached_reference_protein_id_list.append(reference_protein_id)
+
+        # get the homology relationships of the reference proteins that are not cached from their homology graphs and save them in the cache
+        if uncached_reference_protein_id_list:
+            homology_graph_per_protein_dict = sqllib.get_protein_homology_graph_dict_many(conn, uncached_reference_protein_id_list)
+            for reference_protein_id in uncached_reference_protein_id_list:
+                homology_relationships_dict = get_homology_relationships(homology_graph_per_protein_dict.get(reference_protein_id, []))
+                homology_relationships_cache.put(reference_protein_id, homology_relationships_dict)
+                homology_relationships_per_protein_dict[reference_protein_id] = homology_relationships_dict
+            resolved_reference_protein_counter += len(uncached_reference_protein_id_list)
+
+        for ((qseqid, sseqid), reference_protein_id) in zip(batch_list, reference_protein_id_list):
+
+            # add 1 to the record counter
+            blastp_alignment_record_counter += 1
+
+            # get homology relationships dictionary
+            homology_relationships_dict = homology_relationships_per_protein_dict[reference_protein_id]
+
+            # write the homology relationships in the homology relationships file
+            homology_relationships_record = ''
+            if homology_relationships_dict:
+                for key in sorted(homology_relationships_dict):
+                    data = homology_relationships_dict[key]
+                    species_id = data['species_id']
+                    gene_id = data['gene_id']
+                    protein_isoform_ids = data['protein_isoform_ids']
+                    homology_relationships_record = f'{qseqid};{species_id};{gene_id};{protein_isoform_ids}'
+                    homology_relationships_file_id.write(f'{homology_relationships_record}\n')
+            else:
+                homology_relationships_record = f'{qseqid};-;-;-'
                 homology_relationships_file_id.write(f'{homology_relationships_record}\n')
-        else:
-            homology_relationships_record = f'{qseqid};-;-;-'
-            homology_relationships_file_id.write(f'{homology_relationships_record}\n')
-
-        # print counters
-        genlib.Message.print('verbose', f'\rblastp clade alignment file: {blastp_alignment_record_counter} processed records')
 
-        # read the next record of clade alignment file yielded by blastp
-        (blastp_alignment_record, _, blastp_alignment_data_dict) = genlib.read_alignment_outfmt6_record(blastp_alignment_file, blastp_alignment_file_id, blastp_alignment_record_counter)
+            # print counters
+            genlib.Message.print('verbose', f'\rblastp clade alignment file: {blastp_alignment_record_counter} processed records')
 
     genlib.Message.print('verbose', '\n')
 
@@ -235,20 +283,20 @@ def get_cluster_homology_relationships(conn, blastp_alignment_file, homology_rel
 
     genlib.Message.print('verbose', '\n')
     genlib.Message.print('info', f'The file {homology_relationships_file} is created.')
+    genlib.Message.print('info', f'The homology relationships of {blastp_alignment_record_counter} records are got resolving {resolved_reference_protein_counter} reference proteins.')
+    genlib.Message.print('info', f'Homology relationships cache: {homology_relationships_cache.get_stats_text()}.')
 
 #-------------------------------------------------------------------------------
 
-def get_homology_relationships(conn, reference_protein_id):
+def get_homology_relationships(mmseqs2_protein_isoforms_list):
     '''
-    Get the homology relationships of a protein identification.
+    Get the homology relationships of a protein identification from its homology graph (the list of
+    its protein isoforms with the data of their orthologous proteins).
     '''
 
     # initialize the homology relationhips dictionary
     homology_relationships_dict = genlib.NestedDefaultDict()
 
-    # get the list of protein isoforms corresponding to the reference protein identification
-    mmseqs2_protein_isoforms_list = sqllib.get_mmseqs2_protein_isoforms_list(conn, '', [reference_protein_id])
-
     # build the list of protein isoforms identification corresponding to the reference protein identification
     reference_protein_isoform_ids_list = []
     for _, protein_isoform_data in enumerate(mmseqs2_protein_isoforms_list):
@@ -264,11 +312,11 @@ def get_homology_relationships(conn, reference_protein_id):
         protein_isoform_ids = '|'.join(sorted(reference_protein_isoform_ids_list))
         homology_relationships_dict[f'{species_id}-{gene_id}'] = {'species_id': species_id, 'species_name': species_name, 'gene_id':gene_id, 'protein_isoform_ids': protein_isoform_ids}
 
-        # for each identification in the list of protein isoforms corresponding to the reference protein identification
-        for reference_protein_isoform_id in reference_protein_isoform_ids_list:
+        # for each protein isoform corresponding to the reference protein identification
+        for protein_isoform_data in mmseqs2_protein_isoforms_list:
 
             # get data of the orthologous proteins
-            orthologous_protein_data_list = sqllib.get_orthologous_protein_data_list(conn, reference_protein_isoform_id)
+            orthologous_protein_data_list = protein_isoform_data['orthologous_protein_data_list']
 
             # check if there are data of orthologous proteins:
             if orthologous_protein_data_list:
@@ -29,6 +29,7 @@ Licence: GNU General Public Licence Version 3.
 
 import argparse
 import gzip
+import io
 import os
 import sys
 
@@ -50,11 +51,15 @@ def main():
     args = parser.parse_args()
     check_args(args)
 
+    # enable the SQL instrumentation
+    if args.profile_sql.upper() == 'Y':
+        sqllib.enable_sql_profiling(os.path.basename(__file__))
+
     # connect to the quercusTOA sequences database
-    conn = sqllib.connect_database(args.sequences_database)
+    conn = sqllib.connect_database(args.sequences_database, read_only=True)
 
     # get the protein FASTA files corresponding to homology relationships yielded by process of searching for sequence homology
-    get_protein_fasta_files(conn, args.homology_relationships_file, args.blastp_alignment_file, args.analysis_fasta_file, args.consensus_seqs_file, args.output_dir)
+    get_protein_fasta_files(conn, args.homology_relationships_file, args.blastp_alignment_file, args.analysis_fasta_file, args.consensus_seqs_file, args.output_dir, args.container)
 
     # close connection to quercusTOA comparative genomics database
     conn.close()
@@ -79,6 +84,8 @@ def build_parser():
     parser.add_argument('--analysis', dest='analysis_fasta_file', help='Path of the FASTA file with analysis protein sequences or NONE; default: NONE.')
     parser.add_argument('--consensus', dest='consensus_seqs_file', help='Path of the FASTA file with consensus sequences (mandatory).')
     parser.add_argument('--outdir', dest='output_dir', help='Path of output directoty where files with selected variant data are saved (mandatory).')
+    parser.add_argument('--container', dest='container', help=f'Save the FASTA sequences of all sequence identifications in two indexed container files ({genlib.get_homologous_proteins_file_name()} and {genlib.get_homologous_genes_file_name()}) instead of two files per sequence identification: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_CONTAINER}.')
+    parser.add_argument('--profile-sql', dest='profile_sql', help=f'Record the calls, latencies and rows of the database accesses, print a summary at exit and save it as JSON in the current directory: {genlib.get_yn_code_list_text()}; default: {genlib.Const.DEFAULT_PROFILE_SQL} (Y when the environment variable {genlib.get_sql_profile_env_var()} is Y).')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {genlib.get_verbose_code_list_text()}; default: {genlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {genlib.get_trace_code_list_text()}; default: {genlib.Const.DEFAULT_TRACE}.')
 
@@ -134,6 +141,21 @@ def check_args(args):
         genlib.Message.print('error', f'*** The file {args.consensus_seqs_file} does not exist.')
         OK = False
 
+    # check "container"
+    if args.container is None:
+        args.container = genlib.Const.DEFAULT_CONTAINER
+    elif not genlib.check_code(args.container, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** container has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+    args.container = args.container.upper()
+
+    # check "profile_sql"
+    if args.profile_sql is None:
+        args.profile_sql = genlib.get_sql_profile_default()
+    elif not genlib.check_code(args.profile_sql, genlib.get_yn_code_list(), case_sensitive=False):
+        genlib.Message.print('error', f'*** profile_sql has to be {genlib.get_yn_code_list_text()}.')
+        OK = False
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = genlib.Const.DEFAULT_VERBOSE
@@ -158,10 +180,11 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def get_protein_fasta_files(conn, homology_relationships_file, blastp_alignments_file, analysis_fasta_file, consensus_seqs_file, output_dir):
+def get_protein_fasta_files(conn, homology_relationships_file, blastp_alignments_file, analysis_fasta_file, consensus_seqs_file, output_dir, container='N'):
     '''
     Get the protein FASTA files corresponding to homology relationships yielded by process
-    of searching for sequence homology.
+    of searching for sequence homology. When "container" is Y, the FASTA sequences of each
+    sequence identification are saved as an entry of two indexed container files.
     '''
 
     # get the blastp alingments dictionary
@@ -172,20 +195,31 @@ def get_protein_fasta_files(conn, homology_relationships_file, blastp_alignments
     if analysis_fasta_file != 'NONE':
         analysis_fasta_dict = genlib.get_fasta_seq_dict(analysis_fasta_file, cutting_char=' ')
 
-    # get the consensus sequences dictionary
-    consensus_seqs_dict = genlib.get_fasta_seq_dict(consensus_seqs_file, cutting_char=' ')
+    # get the consensus sequences dictionary (indexed when the file is not compressed and it can be indexed, so only the looked up sequences are read)
+    # (the index file is saved in the output directory because the directory of the consensus sequences file can be read-only)
+    consensus_seqs_index_file = f'{output_dir}{os.sep}{os.path.basename(genlib.get_fasta_index_file(consensus_seqs_file))}'
+    if not consensus_seqs_file.endswith('.gz') and genlib.build_fasta_index(consensus_seqs_file, consensus_seqs_index_file, cutting_char=' ') is not None:
+        consensus_seqs_dict = genlib.IndexedFastaFile(consensus_seqs_file, consensus_seqs_index_file, cutting_char=' ')
+    else:
+        if not consensus_seqs_file.endswith('.gz'):
+            genlib.Message.print('info', f'The file {consensus_seqs_file} can not be indexed, so all its sequences are loaded.')
+        consensus_seqs_dict = genlib.get_fasta_seq_dict(consensus_seqs_file, cutting_char=' ')
+
+    # get the distinct protein and gene identifications of the homology relationships file
+    (protein_id_list, gene_id_list) = get_homology_relationships_seq_ids(homology_relationships_file)
+
+    # get the sequences of the proteins and genes fetching each distinct sequence once in batched queries
+    protein_seq_per_protein_dict = sqllib.get_protein_seq_dict_many(conn, protein_id_list)
+    gene_seq_per_gene_dict = sqllib.get_gene_seq_dict_many(conn, gene_id_list)
+    genlib.Message.print('info', f'{len(protein_seq_per_protein_dict)} protein sequences and {len(gene_seq_per_gene_dict)} gene sequences are got.')
+
+    # open the container files
+    if container == 'Y':
+        protein_container = genlib.ContainerWriter(f'{output_dir}{os.sep}{genlib.get_homologous_proteins_file_name()}')
+        gene_container = genlib.ContainerWriter(f'{output_dir}{os.sep}{genlib.get_homologous_genes_file_name()}')
 
     # open the homology relationships file
-    if homology_relationships_file.endswith('.gz'):
-        try:
-            homology_relationships_file_id = gzip.open(homology_relationships_file, mode='rt', encoding='iso-8859-1')
-        except Exception as e:
-            raise genlib.ProgramException(e, 'F002', homology_relationships_file)
-    else:
-        try:
-            homology_relationships_file_id = open(homology_relationships_file, mode='r', encoding='iso-8859-1')
-        except Exception as e:
-            raise genlib.ProgramException(e, 'F001', homology_relationships_file)
+    homology_relationships_file_id = open_homology_relationships_file(homology_relationships_file)
 
     # set the header indicator
     is_header = True
@@ -220,8 +254,10 @@ def get_protein_fasta_files(conn, homology_relationships_file, blastp_alignments
             # set the file path of homologous protein FASTA sequences corresponding to the current sequence identification
             protein_sequence_fasta_file = f'{output_dir}{os.sep}{homology_relationships_data_dict['seq_id']}-homologous-proteins.fasta'
 
-            # open the protein FASTA sequence file
-            if protein_sequence_fasta_file.endswith('.gz'):
+            # open the protein FASTA sequence file (a buffer of the container entry when there is container)
+            if container == 'Y':
+                protein_sequence_fasta_file_id = io.StringIO()
+            elif protein_sequence_fasta_file.endswith('.gz'):
                 try:
                     protein_sequence_fasta_file_id = gzip.open(protein_sequence_fasta_file, mode='wt', encoding='iso-8859-1', newline='\n')
                 except Exception as e:
@@ -235,8 +271,10 @@ def get_protein_fasta_files(conn, homology_relationships_file, blastp_alignments
             # set the file path of homologous gene FASTA sequences corresponding to the current sequence identification
             gene_sequence_fasta_file = f'{output_dir}{os.sep}{homology_relationships_data_dict['seq_id']}-homologous-genes.fasta'
 
-            # open the gene sequence FASTA file
-            if gene_sequence_fasta_file.endswith('.gz'):
+            # open the gene sequence FASTA file (a buffer of the container entry when there is container)
+            if container == 'Y':
+                gene_sequence_fasta_file_id = io.StringIO()
+            elif gene_sequence_fasta_file.endswith('.gz'):
                 try:
                     gene_sequence_fasta_file_id = gzip.open(gene_sequence_fasta_file, mode='wt', encoding='iso-8859-1', newline='\n')
                 except Exception as e:
@@ -274,19 +312,21 @@ def get_protein_fasta_files(conn, homology_relationships_file, blastp_alignments
                 # set the protein isoform identification list
                 protein_isoform_id_list = homology_relationships_data_dict['protein_isoform_ids'].split('|')
 
+                # get the gene sequence data of the protein isoforms
+                gene_seq_dict = gene_seq_per_gene_dict[homology_relationships_data_dict['gene_id']]
+
                 # for each protein isoform identification
                 for protein_isoform_id in protein_isoform_id_list:
 
                     # get the protein isoform sequence data
-                    protein_isoform_seq_dict = sqllib.get_protein_seq_dict(conn, protein_isoform_id)
+                    protein_isoform_seq_dict = protein_seq_per_protein_dict[protein_isoform_id]
                     protein_isoform_seq = protein_isoform_seq_dict['seq']
 
                     # write the protein isoform sequence in the  the protein FASTA sequence file
                     protein_sequence_fasta_file_id.write(f'>{protein_isoform_id}[{homology_relationships_data_dict['species_id']}]\n')
                     protein_sequence_fasta_file_id.write(f'{protein_isoform_seq}\n')
 
-                    # get the gene sequence data of protein isoform
-                    gene_seq_dict = sqllib.get_gene_seq_dict(conn, homology_relationships_data_dict['gene_id'])
+                    # get the gene sequence of protein isoform
                     gene_isoform_seq = gene_seq_dict['seq']
 
                     # write the gene sequence of the protein isoform in the the gene FASTA sequence file
@@ -299,6 +339,11 @@ def get_protein_fasta_files(conn, homology_relationships_file, blastp_alignments
                 # read the next record of the homology relationships file
                 (homology_relationships_record, _, homology_relationships_data_dict) = genlib.read_homology_relationships_record(homology_relationships_file, homology_relationships_file_id, homology_relationships_record_counter)
 
+            # write the FASTA sequences of the current sequence identification in the container files
+            if container == 'Y':
+                protein_container.write_entry(old_seq_id, protein_sequence_fasta_file_id.getvalue())
+                gene_container.write_entry(old_seq_id, gene_sequence_fasta_file_id.getvalue())
+
             # close protein FASTA sequence file of the current sequence identification
             protein_sequence_fasta_file_id.close()
 
@@ -310,11 +355,81 @@ def get_protein_fasta_files(conn, homology_relationships_file, blastp_alignments
     # close the homology relationships file
     homology_relationships_file_id.close()
 
+    # close the container files
+    if container == 'Y':
+        protein_container.close()
+        gene_container.close()
+
+    # close the consensus sequences file when it is indexed
+    if isinstance(consensus_seqs_dict, genlib.IndexedFastaFile):
+        consensus_seqs_dict.close()
+
     genlib.Message.print('verbose', '\n')
     genlib.Message.print('info', 'The protein FASTA files corresponding to homology relationships are created.')
 
 #-------------------------------------------------------------------------------
 
+def open_homology_relationships_file(homology_relationships_file):
+    '''
+    Open the homology relationships file to read it.
+    '''
+
+    if homology_relationships_file.endswith('.gz'):
+        try:
+            homology_relationships_file_id = gzip.open(homology_relationships_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F002', homology_relationships_file)
+    else:
+        try:
+            homology_relationships_file_id = open(homology_relationships_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise genlib.ProgramException(e, 'F001', homology_relationships_file)
+
+    # return the homology relationships file identification
+    return homology_relationships_file_id
+
+#-------------------------------------------------------------------------------
+
+def get_homology_relationships_seq_ids(homology_relationships_file):
+    '''
+    Get the lists of the distinct protein isoform identifications and gene identifications
+    of the homology relationships file.
+    '''
+
+    # initialize the dictionaries of protein and gene identifications (used as ordered sets)
+    protein_id_dict = {}
+    gene_id_dict = {}
+
+    # open the homology relationships file
+    homology_relationships_file_id = open_homology_relationships_file(homology_relationships_file)
+
+    # initialize the counter of records corresponding to the homology relationships file
+    homology_relationships_record_counter = 0
+
+    # read the first record of the homology relationships file
+    (homology_relationships_record, _, homology_relationships_data_dict) = genlib.read_homology_relationships_record(homology_relationships_file, homology_relationships_file_id, homology_relationships_record_counter)
+
+    # while there are records in the homology relationships file
+    while homology_relationships_record != '':
+
+        # add the identifications of the data records
+        if homology_relationships_record_counter > 0:
+            protein_id_dict.update(dict.fromkeys(homology_relationships_data_dict['protein_isoform_ids'].split('|')))
+            gene_id_dict[homology_relationships_data_dict['gene_id']] = None
+
+        # add 1 to the counter of records corresponding to the homology relationships file
+        homology_relationships_record_counter += 1
+
+        # read the next record of the homology relationships file
+        (homology_relationships_record, _, homology_relationships_data_dict) = genlib.read_homology_relationships_record(homology_relationships_file, homology_relationships_file_id, homology_relationships_record_counter)
+
+    # close the homology relationships file
+    homology_relationships_file_id.close()
+
+    # return the lists of protein and gene identifications
+    return list(protein_id_dict), list(gene_id_dict)
+
+#-------------------------------------------------------------------------------
 
 def get_blaspt_alignment_dict(file_path):
     '''
@@ -340,25 +455,18 @@ def get_blaspt_alignment_dict(file_path):
     # initialize the counter of records corresponding to the alignment file
     alignment_record_counter = 0
 
-    # read the first record of alignment file
-    (blastp_alignment_record, _, blastp_alignment_data_dict) = genlib.read_alignment_outfmt6_record(file_path, file_id, alignment_record_counter)
-
-    # while there are records in the alignment file
-    while blastp_alignment_record != '':
-
-        # get alignment data
-        qseqid = blastp_alignment_data_dict['qseqid']
-        sseqid = blastp_alignment_data_dict['sseqid']
+    # read the alignment file in batches of sequence identification pairs
+    for batch_list in genlib.read_alignment_outfmt6_batches(file_path, file_id, column_list=['qseqid', 'sseqid']):
 
         # insert data in the alignment dictionary
-        alignments_dict[qseqid] = sseqid
+        alignments_dict.update(batch_list)
+
+        # add the records of the batch to the record counter
+        alignment_record_counter += len(batch_list)
 
         # print counters
         genlib.Message.print('verbose', f'\rblastp clade alignment file: {alignment_record_counter} processed records')
 
-        # read the next record of alignment file
-        (blastp_alignment_record, _, blastp_alignment_data_dict) = genlib.read_alignment_outfmt6_record(file_path, file_id, alignment_record_counter)
-
     genlib.Message.print('verbose', '\n')
 
     # close files
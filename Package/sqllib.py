@@ -26,24 +26,60 @@ Licence: GNU General Public Licence Version 3.
 
 #-------------------------------------------------------------------------------
 
+import array
+import atexit
+import datetime
+import functools
+import inspect
+import itertools
+import json
+import math
+import os
+import pathlib
+import re
 import sqlite3
 import sys
+import time
 
 import genlib
 
 #-------------------------------------------------------------------------------
 
-def connect_database(database_path):
+def connect_database(database_path, read_only=False, immutable=False, mmap_size=None, cache_size=None):
     '''
-    Connect to the database.
+    Connect to the database. When "read_only" is True, the database is opened in read-only
+    mode and it is memory-mapped up to "mmap_size" MiB with a page cache of "cache_size" MiB
+    (default: Const.DEFAULT_DB_MMAP_SIZE and Const.DEFAULT_DB_CACHE_SIZE). When "immutable"
+    is also True, the database is opened as immutable, so several processes can share its pages
+    without locks; it has to be used only with the shared reference database, which is never
+    changed while it is read, and not with the databases written by the runs.
     '''
 
     # connect to the database
     try:
-        conn = sqlite3.connect(database_path)
+        factory = sqlite3.Connection if sql_profile_dict is None else _ProfiledConnection
+        if read_only:
+            conn = sqlite3.connect(f'{pathlib.Path(os.path.abspath(database_path)).as_uri()}?mode=ro{"&immutable=1" if immutable else ""}', uri=True, factory=factory)
+        else:
+            conn = sqlite3.connect(database_path, factory=factory)
     except Exception as e:
         raise genlib.ProgramException(e, 'B001', database_path)
 
+    # set the read-only profile
+    if read_only:
+        mmap_size = genlib.Const.DEFAULT_DB_MMAP_SIZE if mmap_size is None else mmap_size
+        cache_size = genlib.Const.DEFAULT_DB_CACHE_SIZE if cache_size is None else cache_size
+        sentence = f'''
+                   PRAGMA mmap_size = {mmap_size * 1024 * 1024};
+                   PRAGMA cache_size = -{cache_size * 1024};
+                   PRAGMA temp_store = MEMORY;
+                   PRAGMA query_only = ON;
+                   '''
+        try:
+            conn.executescript(sentence)
+        except Exception as e:
+            raise genlib.ProgramException(e, 'B002', sentence, conn)
+
     # return connection
     return conn
 
@@ -62,6 +98,456 @@ def attach_database(conn, database_id, database_path):
     except Exception as e:
         raise genlib.ProgramException(e, 'B002', sentence, conn)
 
+#-------------------------------------------------------------------------------
+
+def get_table_column_list(conn, table_name):
+    '''
+    Get the column list of a table (empty when the table does not exist).
+    '''
+
+    sentence = f'PRAGMA table_info({table_name});'
+    try:
+        return [row[1] for row in conn.execute(sentence)]
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def check_table_exists(conn, table_name):
+    '''
+    Check if a table exists in the database.
+    '''
+
+    # initialize the control variable
+    OK = False
+
+    # select rows from the table "sqlite_master"
+    sentence = f'''
+                SELECT name
+                    FROM sqlite_master
+                    WHERE type = 'table'
+                      AND name = '{table_name}';
+                '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # check if there is a row
+    for _ in rows:
+        OK = True
+
+    # return the control variable
+    return OK
+
+#-------------------------------------------------------------------------------
+
+def get_id_json_chunk_list(id_list, chunk_size=None):
+    '''
+    Get the distinct identifications of a list as JSON arrays of "chunk_size" identifications
+    at most (default: Const.DEFAULT_SQL_ID_CHUNK_SIZE) to be bound to "json_each(?)".
+    '''
+
+    # set the chunk size
+    chunk_size = genlib.Const.DEFAULT_SQL_ID_CHUNK_SIZE if chunk_size is None else chunk_size
+
+    # get the distinct identifications keeping their order
+    distinct_id_list = list(dict.fromkeys(id_list))
+
+    # return the JSON array list
+    return [json.dumps(distinct_id_list[i:i + chunk_size]) for i in range(0, len(distinct_id_list), chunk_size)]
+
+#-------------------------------------------------------------------------------
+
+def select_rows_by_ids(conn, sentence, id_list, chunk_size=None):
+    '''
+    Get the rows of a sentence whose only parameter is bound to "json_each(?)" executing it
+    for each chunk of the distinct identifications of a list.
+    '''
+
+    for id_json_chunk in get_id_json_chunk_list(id_list, chunk_size):
+        try:
+            rows = conn.execute(sentence, (id_json_chunk,)).fetchall()
+        except Exception as e:
+            raise genlib.ProgramException(e, 'B002', sentence, conn)
+        yield from rows
+
+#-------------------------------------------------------------------------------
+# SQL instrumentation
+#-------------------------------------------------------------------------------
+
+# statistics of the instrumented functions and query shapes (None when the instrumentation is disabled)
+sql_profile_dict = None
+
+#-------------------------------------------------------------------------------
+
+def enable_sql_profiling(program_name, output_dir=None, report_at_exit=True):
+    '''
+    Enable the instrumentation of the functions of this module and of the sentences executed
+    by the connections got with connect_database, recording call counts, latencies and rows
+    returned. At exit, the summary is printed and saved as JSON in "output_dir" (default: the
+    current directory) when "report_at_exit" is True. Only the calls of the current process
+    are recorded; the statistics of other processes have to be got with pop_sql_profile_dict
+    and added with merge_sql_profile_dict.
+    '''
+
+    global sql_profile_dict    #pylint: disable=global-statement
+
+    # the instrumentation is enabled only once
+    if sql_profile_dict is not None:
+        return
+
+    # initialize the statistics
+    sql_profile_dict = {'function': {}, 'query': {}}
+
+    # wrap the public functions of this module
+    for (name, value) in list(globals().items()):
+        if inspect.isfunction(value) and value.__module__ == __name__ and not name.startswith('_') and name not in ['enable_sql_profiling', 'pop_sql_profile_dict', 'merge_sql_profile_dict', 'get_sql_profile_result_rows', 'record_sql_profile_call', 'get_sql_query_shape', 'get_sql_profile_report', 'print_sql_profile_summary', 'write_sql_profile_file', 'report_sql_profile', 'get_id_json_chunk_list', 'select_rows_by_ids']:
+            globals()[name] = _build_profiled_function(value)
+
+    # print and save the report at exit
+    if report_at_exit:
+        output_dir = os.getcwd() if output_dir is None else output_dir
+        atexit.register(report_sql_profile, program_name, output_dir)
+
+#-------------------------------------------------------------------------------
+
+def pop_sql_profile_dict():
+    '''
+    Get the statistics recorded since the last call and reset them, so the statistics of a
+    process of a pool can be sent to the main process (None when the instrumentation is disabled).
+    '''
+
+    global sql_profile_dict    #pylint: disable=global-statement
+
+    # the instrumentation is disabled
+    if sql_profile_dict is None:
+        return None
+
+    # get the statistics and reset them
+    profile_dict = sql_profile_dict
+    sql_profile_dict = {'function': {}, 'query': {}}
+
+    # return the statistics
+    return profile_dict
+
+#-------------------------------------------------------------------------------
+
+def merge_sql_profile_dict(profile_dict):
+    '''
+    Add the statistics got with pop_sql_profile_dict in other process to the statistics of the
+    current process.
+    '''
+
+    if sql_profile_dict is None or profile_dict is None:
+        return
+
+    for kind in ['function', 'query']:
+        for (key, item_dict) in profile_dict[kind].items():
+            current_item_dict = sql_profile_dict[kind].get(key)
+            if current_item_dict is None:
+                sql_profile_dict[kind][key] = item_dict
+            else:
+                current_item_dict['latencies'].extend(item_dict['latencies'])
+                current_item_dict['rows'] += item_dict['rows']
+
+#-------------------------------------------------------------------------------
+
+def _build_profiled_function(function):
+    '''
+    Build a wrapper of a function that records its calls.
+    '''
+
+    @functools.wraps(function)
+    def profiled_function(*args, **kwargs):
+        start_time = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed_time = time.perf_counter() - start_time
+        rows = get_sql_profile_result_rows(result)
+        record_sql_profile_call('function', function.__name__, elapsed_time, rows)
+        return result
+
+    return profiled_function
+
+#-------------------------------------------------------------------------------
+
+def get_sql_profile_result_rows(result):
+    '''
+    Get the rows of the result of a function: the items of a list or a set, the records of
+    a dictionary of records, 1 for a non-empty data dictionary or None for other results.
+    '''
+
+    if isinstance(result, (list, set)):
+        rows = len(result)
+    elif isinstance(result, dict):
+        rows = len(result) if all(isinstance(value, (dict, list, set)) for value in itertools.islice(result.values(), 1)) else 1
+        rows = 0 if result == {} else rows
+    else:
+        rows = None
+
+    return rows
+
+#-------------------------------------------------------------------------------
+
+def record_sql_profile_call(kind, key, elapsed_time, rows):
+    '''
+    Record a call of a function ("kind" is "function") or the execution of a query shape
+    ("kind" is "query").
+    '''
+
+    if sql_profile_dict is None:
+        return
+
+    profile_dict = sql_profile_dict[kind].get(key)
+    if profile_dict is None:
+        profile_dict = {'latencies': array.array('d'), 'rows': 0}
+        sql_profile_dict[kind][key] = profile_dict
+    profile_dict['latencies'].append(elapsed_time)
+    if rows is not None:
+        profile_dict['rows'] += rows
+
+#-------------------------------------------------------------------------------
+
+def get_sql_query_shape(sentence):
+    '''
+    Get the shape of a sentence: the literals are replaced by "?", the lists of parameters
+    are collapsed and the blank spaces are normalized.
+    '''
+
+    shape = re.sub(r"'(?:[^']|'')*'", '?', sentence)
+    shape = re.sub(r'\b\d+(?:\.\d+)?\b', '?', shape)
+    shape = re.sub(r'\(\s*\?(?:\s*,\s*\?)+\s*\)', '(?, ...)', shape)
+
+    return ' '.join(shape.split())
+
+#-------------------------------------------------------------------------------
+
+class _ProfiledCursor():
+    '''
+    This class wraps a cursor to add the time spent fetching rows and the number of rows
+    fetched to the statistics of its query shape.
+    '''
+
+    #---------------
+
+    def __init__(self, cursor, shape, elapsed_time):
+        '''
+        Create a class instance.
+        '''
+
+        self.cursor = cursor
+        self.shape = shape
+        self.elapsed_time = elapsed_time
+        self.rows = 0
+        self.recorded = False
+
+    #---------------
+
+    def fetchone(self):
+        '''
+        Fetch the next row.
+        '''
+
+        start_time = time.perf_counter()
+        row = self.cursor.fetchone()
+        self.elapsed_time += time.perf_counter() - start_time
+        if row is None:
+            self.record()
+        else:
+            self.rows += 1
+        return row
+
+    #---------------
+
+    def fetchmany(self, size=None):
+        '''
+        Fetch the next rows.
+        '''
+
+        start_time = time.perf_counter()
+        row_list = self.cursor.fetchmany(self.cursor.arraysize if size is None else size)
+        self.elapsed_time += time.perf_counter() - start_time
+        self.rows += len(row_list)
+        if row_list == []:
+            self.record()
+        return row_list
+
+    #---------------
+
+    def fetchall(self):
+        '''
+        Fetch the remaining rows.
+        '''
+
+        start_time = time.perf_counter()
+        row_list = self.cursor.fetchall()
+        self.elapsed_time += time.perf_counter() - start_time
+        self.rows += len(row_list)
+        self.record()
+        return row_list
+
+    #---------------
+
+    def record(self):
+        '''
+        Record the execution of the query shape once.
+        '''
+
+        if not self.recorded:
+            record_sql_profile_call('query', self.shape, self.elapsed_time, self.rows)
+            self.recorded = True
+
+    #---------------
+
+    def __iter__(self):
+
+        return self
+
+    #---------------
+
+    def __next__(self):
+
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    #---------------
+
+    def __getattr__(self, name):
+
+        return getattr(self.cursor, name)
+
+    #---------------
+
+    def __del__(self):
+
+        self.record()
+
+   #---------------
+
+#-------------------------------------------------------------------------------
+
+class _ProfiledConnection(sqlite3.Connection):
+    '''
+    This class is a connection that records the query shapes of the executed sentences.
+    '''
+
+    #---------------
+
+    def execute(self, sql, parameters=(), /):
+        '''
+        Execute a sentence.
+        '''
+
+        start_time = time.perf_counter()
+        cursor = super().execute(sql, parameters)
+        return _ProfiledCursor(cursor, get_sql_query_shape(sql), time.perf_counter() - start_time)
+
+    #---------------
+
+    def executemany(self, sql, parameters, /):
+        '''
+        Execute a sentence for each item of a parameter sequence.
+        '''
+
+        start_time = time.perf_counter()
+        cursor = super().executemany(sql, parameters)
+        record_sql_profile_call('query', get_sql_query_shape(sql), time.perf_counter() - start_time, max(cursor.rowcount, 0))
+        return cursor
+
+    #---------------
+
+    def executescript(self, sql_script, /):
+        '''
+        Execute a script of sentences.
+        '''
+
+        start_time = time.perf_counter()
+        cursor = super().executescript(sql_script)
+        record_sql_profile_call('query', get_sql_query_shape(sql_script), time.perf_counter() - start_time, 0)
+        return cursor
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+def get_sql_profile_report(program_name):
+    '''
+    Get the report of the instrumentation with the statistics of each function and query shape
+    sorted by total time.
+    '''
+
+    # initialize the report
+    report_dict = {'program': program_name, 'datetime': datetime.datetime.now().isoformat(timespec='seconds'), 'functions': [], 'queries': []}
+
+    # calculate the statistics of each function and query shape
+    for (kind, report_key) in [('function', 'functions'), ('query', 'queries')]:
+        for (key, profile_dict) in (sql_profile_dict or {}).get(kind, {}).items():
+            latency_list = sorted(profile_dict['latencies'])
+            calls = len(latency_list)
+            total_time = sum(latency_list)
+            report_dict[report_key].append({
+                'name': key,
+                'calls': calls,
+                'total_time': total_time,
+                'mean_time': total_time / calls,
+                'p50_time': latency_list[max(math.ceil(calls * 0.50) - 1, 0)],
+                'p95_time': latency_list[max(math.ceil(calls * 0.95) - 1, 0)],
+                'p99_time': latency_list[max(math.ceil(calls * 0.99) - 1, 0)],
+                'max_time': latency_list[-1],
+                'rows': profile_dict['rows'],
+            })
+        report_dict[report_key].sort(key=lambda x: x['total_time'], reverse=True)
+
+    # return the report
+    return report_dict
+
+#-------------------------------------------------------------------------------
+
+def print_sql_profile_summary(report_dict):
+    '''
+    Print the summary table of a report of the instrumentation (times in milliseconds).
+    '''
+
+    for (report_key, title) in [('functions', 'function'), ('queries', 'query shape')]:
+        genlib.Message.print('info', f'SQL profile by {title}:')
+        genlib.Message.print('info', f'{"calls":>9} {"total":>11} {"mean":>9} {"p50":>9} {"p95":>9} {"p99":>9} {"max":>9} {"rows":>11}  {title}')
+        for item in report_dict[report_key]:
+            name = item['name'] if len(item['name']) <= 100 else f'{item["name"][:97]}...'
+            genlib.Message.print('info', f'{item["calls"]:9d} {1000 * item["total_time"]:11.1f} {1000 * item["mean_time"]:9.3f} {1000 * item["p50_time"]:9.3f} {1000 * item["p95_time"]:9.3f} {1000 * item["p99_time"]:9.3f} {1000 * item["max_time"]:9.3f} {item["rows"]:11d}  {name}')
+
+#-------------------------------------------------------------------------------
+
+def write_sql_profile_file(report_dict, sql_profile_file):
+    '''
+    Write a report of the instrumentation in a JSON file.
+    '''
+
+    try:
+        with open(sql_profile_file, mode='w', encoding='iso-8859-1', newline='\n') as file_id:
+            json.dump(report_dict, file_id, indent=2)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'F003', sql_profile_file)
+
+#-------------------------------------------------------------------------------
+
+def report_sql_profile(program_name, output_dir):
+    '''
+    Print the summary of the instrumentation and save it in the JSON file of the program.
+    '''
+
+    # get the report
+    report_dict = get_sql_profile_report(program_name)
+
+    # print the summary table
+    print_sql_profile_summary(report_dict)
+
+    # save the report
+    sql_profile_file = f'{output_dir}/{genlib.get_sql_profile_file_name(program_name, os.getpid())}'
+    write_sql_profile_file(report_dict, sql_profile_file)
+    genlib.Message.print('info', f'The SQL profile is saved in the file {sql_profile_file}.')
+
 #-------------------------------------------------------------------------------
 # table "interproscan_annotations"
 #-------------------------------------------------------------------------------
@@ -114,9 +600,7 @@ def get_metacyc_pathways_per_cluster_dict(conn, species_name):
         sentence = f'''
                     SELECT cluster_id, metacyc_pathways
                         FROM interproscan_annotations
-                        WHERE cluster_id in (SELECT DISTINCT cluster_id
-                                                FROM mmseqs2_protein_clusters
-                                                where species like '%{species_name}%');
+                        WHERE cluster_id in ({get_species_cluster_ids_query(conn, species_name)});
                     '''
     try:
         rows = conn.execute(sentence)
@@ -182,9 +666,7 @@ def get_kegg_kos_per_cluster_dict(conn, species_name):
         sentence = f'''
                     SELECT cluster_id, kegg_kos
                         FROM emapper_annotations
-                        WHERE cluster_id in (SELECT DISTINCT cluster_id
-                                                FROM mmseqs2_protein_clusters
-                                                where species like '%{species_name}%');
+                        WHERE cluster_id in ({get_species_cluster_ids_query(conn, species_name)});
                     '''
     try:
         rows = conn.execute(sentence)
@@ -218,9 +700,7 @@ def get_kegg_pathways_per_cluster_dict(conn, species_name):
         sentence = f'''
                     SELECT cluster_id, kegg_pathways
                         FROM emapper_annotations
-                        WHERE cluster_id in (SELECT DISTINCT cluster_id
-                                                FROM mmseqs2_protein_clusters
-                                                where species like '%{species_name}%');
+                        WHERE cluster_id in ({get_species_cluster_ids_query(conn, species_name)});
                     '''
     try:
         rows = conn.execute(sentence)
@@ -268,6 +748,32 @@ def get_mmseqs2_protein_clusters_dict(conn, cluster_id):
 
 #-------------------------------------------------------------------------------
 
+def get_mmseqs2_protein_clusters_dict_many(conn, cluster_id_list):
+    '''
+    Get rows data from the table "mmseqs2_protein_clusters" corresponding to a cluster
+    identification list as a dictionary keyed by cluster identification.
+    '''
+
+    # initialize the dictionary
+    relationships_per_cluster_dict = {}
+
+    # select rows from the table "mmseqs2_protein_clusters"
+    sentence = '''
+               SELECT cluster_id, seq_id, description, species
+                   FROM mmseqs2_protein_clusters
+                   WHERE cluster_id IN (SELECT value FROM json_each(?));
+               '''
+
+    # add row data to the dictionary
+    for row in select_rows_by_ids(conn, sentence, cluster_id_list):
+        key = f'{row[0]}-{row[1]}'
+        relationships_per_cluster_dict.setdefault(row[0], {})[key] = {'cluster_id': row[0], 'seq_id': row[1], 'description': row[2], 'species': row[3]}
+
+    # return the dictionary
+    return relationships_per_cluster_dict
+
+#-------------------------------------------------------------------------------
+
 def get_mmseqs2_seq_mf_data(conn, cluster_id):
     '''
     Get the most frequent description and species from the table "mmseqs2_protein_clusters"
@@ -329,12 +835,19 @@ def get_mmseqs2_species_list(conn):
     # initialize the species names list
     species_names_list = []
 
-    # select rows from the table "mmseqs2_protein_clusters"
-    sentence = '''
-               SELECT DISTINCT species
-                   FROM mmseqs2_protein_clusters
-                   ORDER by 1;
-               '''
+    # select rows from the table "cluster_species_names" when it exists or from the table "mmseqs2_protein_clusters" otherwise
+    if check_table_exists(conn, 'cluster_species_names'):
+        sentence = '''
+                   SELECT species
+                       FROM cluster_species_names
+                       ORDER by 1;
+                   '''
+    else:
+        sentence = '''
+                   SELECT DISTINCT species
+                       FROM mmseqs2_protein_clusters
+                       ORDER by 1;
+                   '''
     try:
         rows = conn.execute(sentence)
     except Exception as e:
@@ -375,9 +888,7 @@ def get_goterms_per_cluster_dict(conn, species_name):
     else:
         sentence = f'''
                     WITH cluster_identifications AS (
-                        SELECT DISTINCT cluster_id
-                        FROM mmseqs2_protein_clusters
-                        WHERE species LIKE '%{species_name}%'
+                        {get_species_cluster_ids_query(conn, species_name)}
                     )
                     SELECT a.cluster_id, COALESCE(b.interpro_goterms, '-'), COALESCE(b.panther_goterms, '-'), COALESCE(c.goterms, '-')
                     FROM cluster_identifications a
@@ -460,69 +971,827 @@ def get_tair10_ortholog_seq_id(conn, cluster_id):
     return ortholog_seq_id
 
 #-------------------------------------------------------------------------------
-# table "go_ontology"
+# tables "mmseqs2_protein_clusters", "tair10_orthologs", "tair10_info",
+# "interproscan_annotations" and "emapper_annotations"
 #-------------------------------------------------------------------------------
 
-def get_go_ontology_dict(conn, goterm_id_list):
+def build_cluster_annotation_query(cluster_ids_source):
     '''
-    Get a dictionary of ontology from the table "go_ontology".
+    Build the query that joins the functional annotation data of the clusters whose identifications
+    are got from a table or subquery with a column "cluster_id".
     '''
 
-    # initialize the ontology dictionary
-    go_onlology_dict = {}
+    # the most frequent description and species of each cluster are ranked by their counter
+    # and, in case of a tie, by their first appearance, as done in get_mmseqs2_seq_mf_data;
+    # the first row of "tair10_orthologs" and "tair10_info" and the last row of "interproscan_annotations"
+    # and "emapper_annotations" are joined, and the NULL values are kept, as done by the functions
+    # that get the data of a cluster identification; the defaults are only used when there is not row
+    query = f'''
+            WITH cluster_ids AS (
+                SELECT cluster_id FROM {cluster_ids_source}
+            ),
+            description_counters AS (
+                SELECT a.cluster_id, a.description, COUNT(*) AS counter, MIN(a.rowid) AS first_rowid
+                FROM mmseqs2_protein_clusters a
+                JOIN cluster_ids t ON a.cluster_id = t.cluster_id
+                GROUP BY a.cluster_id, a.description
+            ),
+            mf_descriptions AS (
+                SELECT cluster_id, description, ROW_NUMBER() OVER (PARTITION BY cluster_id ORDER BY counter DESC, first_rowid) AS position
+                FROM description_counters
+            ),
+            species_counters AS (
+                SELECT a.cluster_id, a.species, COUNT(*) AS counter, MIN(a.rowid) AS first_rowid
+                FROM mmseqs2_protein_clusters a
+                JOIN cluster_ids t ON a.cluster_id = t.cluster_id
+                GROUP BY a.cluster_id, a.species
+            ),
+            mf_species AS (
+                SELECT cluster_id, species, ROW_NUMBER() OVER (PARTITION BY cluster_id ORDER BY counter DESC, first_rowid) AS position
+                FROM species_counters
+            ),
+            tair10_ortholog_rows AS (
+                SELECT a.cluster_id, MIN(a.rowid) AS row_id
+                FROM tair10_orthologs a
+                JOIN cluster_ids t ON a.cluster_id = t.cluster_id
+                GROUP BY a.cluster_id
+            ),
+            interproscan_rows AS (
+                SELECT a.cluster_id, MAX(a.rowid) AS row_id
+                FROM interproscan_annotations a
+                JOIN cluster_ids t ON a.cluster_id = t.cluster_id
+                GROUP BY a.cluster_id
+            ),
+            emapper_rows AS (
+                SELECT a.cluster_id, MAX(a.rowid) AS row_id
+                FROM emapper_annotations a
+                JOIN cluster_ids t ON a.cluster_id = t.cluster_id
+                GROUP BY a.cluster_id
+            )
+            SELECT t.cluster_id, {get_cluster_annotation_default_text('d', 'description', "''")}, {get_cluster_annotation_default_text('s', 'species', "''")},
+                   {get_cluster_annotation_default_text('o', 'ortholog_seq_id', "'-'")},
+                   COALESCE((SELECT REPLACE(i.description, ';', '') FROM tair10_info i WHERE i.tair10_peptide_id = CASE WHEN o.cluster_id IS NULL THEN '-' ELSE COALESCE(o.ortholog_seq_id, 'None') END ORDER BY i.rowid LIMIT 1), '-'),
+                   {', '.join(get_cluster_annotation_default_text('p', column, "'-'") for column in ['interpro_goterms', 'panther_goterms', 'metacyc_pathways'])},
+                   {', '.join(get_cluster_annotation_default_text('e', column, "'-'") for column in ['ortholog_seq_id', 'ortholog_species', 'eggnog_ogs', 'cog_category', 'description', 'goterms', 'ec', 'kegg_kos', 'kegg_pathways', 'kegg_modules', 'kegg_reactions', 'kegg_rclasses', 'brite', 'kegg_tc', 'cazy', 'pfams'])}
+            FROM cluster_ids t
+            LEFT JOIN mf_descriptions d ON d.cluster_id = t.cluster_id AND d.position = 1
+            LEFT JOIN mf_species s ON s.cluster_id = t.cluster_id AND s.position = 1
+            LEFT JOIN tair10_ortholog_rows ro ON ro.cluster_id = t.cluster_id
+            LEFT JOIN tair10_orthologs o ON o.rowid = ro.row_id
+            LEFT JOIN interproscan_rows rp ON rp.cluster_id = t.cluster_id
+            LEFT JOIN interproscan_annotations p ON p.rowid = rp.row_id
+            LEFT JOIN emapper_rows re ON re.cluster_id = t.cluster_id
+            LEFT JOIN emapper_annotations e ON e.rowid = re.row_id
+            '''
+
+    # return the query
+    return query
 
-    # select rows from the table "go_ontology"
-    if goterm_id_list == []:
-        sentence = '''
-                   SELECT DISTINCT go_id, go_name, namespace
-                       FROM go_ontology;
-                   '''
-    else:
+#-------------------------------------------------------------------------------
+
+def get_cluster_annotation_data_dict(conn, cluster_id_list):
+    '''
+    Get the functional annotation data of a cluster identifications list. The identifications
+    are bound as a JSON array and the data are fetched with only one query, which reads
+    the table "cluster_annotation_summary" when it exists or joins the source tables otherwise.
+    '''
+
+    # initialize the dictionary
+    cluster_annotation_data_dict = {}
+
+    # set the subquery that gets the cluster identifications from a JSON array, so the connection can be read-only
+    cluster_ids_source = '(SELECT DISTINCT value AS cluster_id FROM json_each(?))'
+
+    # select rows corresponding to the clusters of the identifications list
+    if check_table_exists(conn, 'cluster_annotation_summary'):
         sentence = f'''
-                    SELECT DISTINCT go_id, go_name, namespace
-                        FROM go_ontology
-                        WHERE go_id in ({genlib.join_text_list_to_literal(goterm_id_list)});
+                    SELECT t.cluster_id, {get_cluster_annotation_summary_columns_text('s')}
+                    FROM {cluster_ids_source} t
+                    LEFT JOIN cluster_annotation_summary s ON s.cluster_id = t.cluster_id;
                     '''
+    else:
+        sentence = f'{build_cluster_annotation_query(cluster_ids_source)};'
     try:
-        rows = conn.execute(sentence)
+        rows = conn.execute(sentence, (json.dumps(list(cluster_id_list)),))
     except Exception as e:
-        raise genlib.ProgramException('B002', e, sentence, conn)
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
 
-    # add ontology data to the dictionary
+    # add row data to the dictionary (only the first row of each cluster is considered)
     for row in rows:
-        go_onlology_dict[row[0]] = {'goterm_id':row[0], 'goterm_name':row[1], 'namespace':row[2]}
+        if row[0] not in cluster_annotation_data_dict:
+            cluster_annotation_data_dict[row[0]] = get_cluster_annotation_row_dict(row)
 
-    # return the ontology dictionary
-    return go_onlology_dict
+    # return the dictionary
+    return cluster_annotation_data_dict
 
 #-------------------------------------------------------------------------------
-# table "species_gene_seqs"
+# table "cluster_annotation_summary"
 #-------------------------------------------------------------------------------
 
-def get_gene_seq_dict(conn, gene_id):
+def build_cluster_annotation_summary(conn):
     '''
-    Get the sequence corresponding to a gene identification.
+    Build the table "cluster_annotation_summary" with one denormalized row per cluster
+    containing the functional annotation data of the cluster.
     '''
 
-    # select rows from the table "species_gene_seqs"
+    # recreate the table "cluster_annotation_summary"
+    sentence = '''
+               DROP TABLE IF EXISTS cluster_annotation_summary;
+               CREATE TABLE cluster_annotation_summary (
+                   cluster_id TEXT NOT NULL PRIMARY KEY,
+                   protein_description TEXT,
+                   protein_species TEXT,
+                   tair10_ortholog_seq_id TEXT,
+                   tair10_description TEXT,
+                   interpro_goterms TEXT,
+                   panther_goterms TEXT,
+                   metacyc_pathways TEXT,
+                   eggnog_ortholog_seq_id TEXT,
+                   eggnog_ortholog_species TEXT,
+                   eggnog_ogs TEXT,
+                   cog_category TEXT,
+                   eggnog_description TEXT,
+                   eggnog_goterms TEXT,
+                   ec TEXT,
+                   kegg_kos TEXT,
+                   kegg_pathways TEXT,
+                   kegg_modules TEXT,
+                   kegg_reactions TEXT,
+                   kegg_rclasses TEXT,
+                   brite TEXT,
+                   kegg_tc TEXT,
+                   cazy TEXT,
+                   pfams TEXT
+               );
+               '''
+    try:
+        conn.executescript(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # insert the rows (only the first row of each cluster is considered)
     sentence = f'''
-                SELECT species_id, seq
-                    FROM species_gene_seqs
-                    WHERE gene_id = '{gene_id}';
+                INSERT OR IGNORE INTO cluster_annotation_summary
+                {build_cluster_annotation_query("(SELECT cluster_id FROM mmseqs2_protein_clusters UNION SELECT cluster_id FROM tair10_orthologs UNION SELECT cluster_id FROM interproscan_annotations UNION SELECT cluster_id FROM emapper_annotations)")};
                 '''
     try:
-        rows = conn.execute(sentence)
+        conn.execute(sentence)
+        conn.commit()
     except Exception as e:
         raise genlib.ProgramException(e, 'B002', sentence, conn)
 
-    # get the gene data
-    for row in rows:
-        gene_seq_dict = {'species_id': row[0], 'seq': row[1]}
-        break
+    # get the row number
+    sentence = '''
+               SELECT COUNT(*)
+                   FROM cluster_annotation_summary;
+               '''
+    try:
+        row_count = conn.execute(sentence).fetchone()[0]
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # return the row number
+    return row_count
+
+#-------------------------------------------------------------------------------
+
+def get_cluster_annotation_summary_dict(conn, cluster_id):
+    '''
+    Get the row data from the table "cluster_annotation_summary" corresponding to
+    a cluster identification.
+    '''
+
+    # initialize the dictionary
+    annotations_dict = {}
+
+    # select rows from the table "cluster_annotation_summary"
+    sentence = f'''
+                SELECT cluster_id, {get_cluster_annotation_summary_columns_text('')}
+                    FROM cluster_annotation_summary
+                    WHERE cluster_id = '{cluster_id}';
+                '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # add row data to the dictionary
+    for row in rows:
+        annotations_dict = get_cluster_annotation_row_dict(row)
+
+    # return the dictionary
+    return annotations_dict
+
+#-------------------------------------------------------------------------------
+
+def get_cluster_annotation_summary_columns_text(alias):
+    '''
+    Get the text of the columns of the table "cluster_annotation_summary" with the default
+    values used when a cluster has not data.
+    '''
+
+    # build the columns text
+    columns_text = f"{get_cluster_annotation_default_text(alias, 'protein_description', "''")}, {get_cluster_annotation_default_text(alias, 'protein_species', "''")}"
+    for column in ['tair10_ortholog_seq_id', 'tair10_description', 'interpro_goterms', 'panther_goterms', 'metacyc_pathways', 'eggnog_ortholog_seq_id', 'eggnog_ortholog_species', 'eggnog_ogs', 'cog_category', 'eggnog_description', 'eggnog_goterms', 'ec', 'kegg_kos', 'kegg_pathways', 'kegg_modules', 'kegg_reactions', 'kegg_rclasses', 'brite', 'kegg_tc', 'cazy', 'pfams']:
+        columns_text = f"{columns_text}, {get_cluster_annotation_default_text(alias, column, "'-'")}"
+
+    # return the columns text
+    return columns_text
+
+#-------------------------------------------------------------------------------
+
+def get_cluster_annotation_default_text(alias, column, default):
+    '''
+    Get the text of a column of a left joined table with the default value used when the table
+    has not row (the NULL values of an existing row are kept).
+    '''
+
+    # set the prefix of the columns
+    prefix = f'{alias}.' if alias != '' else ''
+
+    # return the column text
+    return f'CASE WHEN {prefix}cluster_id IS NULL THEN {default} ELSE {prefix}{column} END'
+
+#-------------------------------------------------------------------------------
+
+def get_cluster_annotation_row_dict(row):
+    '''
+    Get the cluster annotation data dictionary from a row whose first column is the cluster
+    identification and the next ones are the columns of the table "cluster_annotation_summary".
+    '''
+
+    return {'protein_description': row[1], 'protein_species': row[2], 'tair10_ortholog_seq_id': row[3], 'tair10_description': row[4], 'interpro_goterms': row[5], 'panther_goterms': row[6], 'metacyc_pathways': row[7], 'eggnog_ortholog_seq_id': row[8], 'eggnog_ortholog_species': row[9], 'eggnog_ogs': row[10], 'cog_category': row[11], 'eggnog_description': row[12], 'eggnog_goterms': row[13], 'ec': row[14], 'kegg_kos': row[15], 'kegg_pathways': row[16], 'kegg_modules': row[17], 'kegg_reactions': row[18], 'kegg_rclasses': row[19], 'brite': row[20], 'kegg_tc': row[21], 'cazy': row[22], 'pfams': row[23]}
+
+#-------------------------------------------------------------------------------
+# tables "cluster_species_names" and "cluster_species"
+#-------------------------------------------------------------------------------
+
+def build_cluster_species(conn):
+    '''
+    Build the table "cluster_species_names" with the distinct species names of the table
+    "mmseqs2_protein_clusters" and the table "cluster_species" with the distinct pairs of
+    species identification and cluster identification, indexed by species.
+    '''
+
+    # recreate the tables "cluster_species_names" and "cluster_species"
+    sentence = '''
+               DROP TABLE IF EXISTS cluster_species;
+               DROP TABLE IF EXISTS cluster_species_names;
+               CREATE TABLE cluster_species_names (
+                   species_id INTEGER PRIMARY KEY,
+                   species TEXT NOT NULL UNIQUE
+               );
+               CREATE TABLE cluster_species (
+                   species_id INTEGER NOT NULL,
+                   cluster_id TEXT NOT NULL,
+                   PRIMARY KEY (species_id, cluster_id)
+               ) WITHOUT ROWID;
+               '''
+    try:
+        conn.executescript(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # insert the rows
+    sentence = '''
+               INSERT INTO cluster_species_names (species)
+                   SELECT DISTINCT species
+                       FROM mmseqs2_protein_clusters
+                       WHERE species IS NOT NULL
+                       ORDER BY species;
+               INSERT INTO cluster_species (species_id, cluster_id)
+                   SELECT DISTINCT b.species_id, a.cluster_id
+                       FROM mmseqs2_protein_clusters a
+                       JOIN cluster_species_names b ON b.species = a.species
+                       WHERE a.cluster_id IS NOT NULL;
+               '''
+    try:
+        conn.executescript(sentence)
+        conn.commit()
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # get the row number
+    sentence = '''
+               SELECT COUNT(*)
+                   FROM cluster_species;
+               '''
+    try:
+        row_count = conn.execute(sentence).fetchone()[0]
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # return the row number
+    return row_count
+
+#-------------------------------------------------------------------------------
+
+def build_species_cluster_ids_query(species_name, cluster_species_exists):
+    '''
+    Build the query that gets the distinct cluster identifications whose species name contains
+    "species_name". When the table "cluster_species" exists, the name is only matched against
+    the distinct species names and the clusters are got with an index range lookup; otherwise,
+    the table "mmseqs2_protein_clusters" is fully scanned.
+    '''
+
+    if cluster_species_exists:
+        query = f'''
+                SELECT DISTINCT b.cluster_id
+                    FROM cluster_species_names a
+                    JOIN cluster_species b ON b.species_id = a.species_id
+                    WHERE a.species LIKE '%{species_name}%'
+                '''
+    else:
+        query = f'''
+                SELECT DISTINCT cluster_id
+                    FROM mmseqs2_protein_clusters
+                    WHERE species LIKE '%{species_name}%'
+                '''
+
+    # return the query
+    return query
+
+#-------------------------------------------------------------------------------
+
+def get_species_cluster_ids_query(conn, species_name):
+    '''
+    Get the query that gets the distinct cluster identifications whose species name contains
+    "species_name" in the database of a connection.
+    '''
+
+    return build_species_cluster_ids_query(species_name, check_table_exists(conn, 'cluster_species'))
+
+#-------------------------------------------------------------------------------
+
+def get_species_cluster_id_list(conn, species_name):
+    '''
+    Get the list of the distinct cluster identifications whose species name contains "species_name".
+    '''
+
+    # select the cluster identifications
+    sentence = f'{get_species_cluster_ids_query(conn, species_name)};'
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # return the cluster identifications list
+    return [row[0] for row in rows]
+
+#-------------------------------------------------------------------------------
+
+def get_species_cluster_ids_dict(conn, species_name_list):
+    '''
+    Get the dictionary of the sets of the distinct cluster identifications whose species name contains
+    each species name of a list with one query (the species names are bound as a JSON array).
+    '''
+
+    # initialize the dictionary
+    species_cluster_ids_dict = {species_name: set() for species_name in species_name_list}
+
+    # select rows from the tables "cluster_species_names" and "cluster_species" when they exist or from the table "mmseqs2_protein_clusters" otherwise
+    if check_table_exists(conn, 'cluster_species'):
+        sentence = '''
+                   SELECT DISTINCT n.value, b.cluster_id
+                       FROM json_each(?) n
+                       JOIN cluster_species_names a ON a.species LIKE '%' || n.value || '%'
+                       JOIN cluster_species b ON b.species_id = a.species_id;
+                   '''
+    else:
+        sentence = '''
+                   SELECT DISTINCT n.value, a.cluster_id
+                       FROM json_each(?) n
+                       JOIN mmseqs2_protein_clusters a ON a.species LIKE '%' || n.value || '%';
+                   '''
+    try:
+        rows = conn.execute(sentence, (json.dumps(list(species_name_list)),))
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # add row data to the dictionary
+    for row in rows:
+        species_cluster_ids_dict[row[0]].add(row[1])
+
+    # return the dictionary
+    return species_cluster_ids_dict
+
+#-------------------------------------------------------------------------------
+# per-run annotation results database: tables "annotation_results_files",
+# "annotation_hits", "annotation_goterms", "annotation_metacyc_pathways",
+# "annotation_kegg_kos" and "annotation_kegg_pathways"
+#-------------------------------------------------------------------------------
+
+def get_annotation_term_column_dict():
+    '''
+    Get the dictionary of the tables of the annotation results database with the terms of
+    every hit exploded in rows and the functional annotation columns where the terms are.
+    '''
+
+    return {'annotation_goterms': ['interpro_goterms', 'panther_goterms', 'eggnog_goterms'], 'annotation_metacyc_pathways': ['metacyc_pathways'], 'annotation_kegg_kos': ['kegg_kos'], 'annotation_kegg_pathways': ['kegg_pathways']}
+
+#-------------------------------------------------------------------------------
+
+def build_annotation_results_tables(conn):
+    '''
+    Create the tables of the annotation results database and their indexes when they
+    do not exist.
+    '''
+
+    # create the tables "annotation_results_files" and "annotation_hits"
+    sentence = f'''
+                CREATE TABLE IF NOT EXISTS annotation_results_files (
+                    dataset TEXT NOT NULL PRIMARY KEY,
+                    file_name TEXT NOT NULL,
+                    file_size INTEGER NOT NULL,
+                    file_path TEXT,
+                    file_mtime INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS annotation_hits (
+                    dataset TEXT NOT NULL,
+                    hit_id INTEGER NOT NULL,
+                    {', '.join([f'{column} TEXT' for column in genlib.get_functional_annotation_head().split(';')])},
+                    PRIMARY KEY (dataset, hit_id)
+                );
+                CREATE INDEX IF NOT EXISTS annotation_hits_index_1 ON annotation_hits (dataset, qseqid, sseqid, algorithm);
+                CREATE INDEX IF NOT EXISTS annotation_hits_index_2 ON annotation_hits (dataset, sseqid);
+                CREATE INDEX IF NOT EXISTS annotation_hits_index_3 ON annotation_hits (dataset, algorithm);
+                '''
+    try:
+        conn.executescript(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # add the columns of the file path and modification time to a table "annotation_results_files" created by a previous version
+    # (its datasets are not found until they are loaded again)
+    table_column_list = get_table_column_list(conn, 'annotation_results_files')
+    for (column, column_type) in [('file_path', 'TEXT'), ('file_mtime', 'INTEGER')]:
+        if column not in table_column_list:
+            sentence = f'ALTER TABLE annotation_results_files ADD COLUMN {column} {column_type};'
+            try:
+                conn.execute(sentence)
+            except Exception as e:
+                raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # create the tables of the terms exploded in rows
+    for table_name in get_annotation_term_column_dict():
+        sentence = f'''
+                    CREATE TABLE IF NOT EXISTS {table_name} (
+                        dataset TEXT NOT NULL,
+                        hit_id INTEGER NOT NULL,
+                        qseqid TEXT NOT NULL,
+                        term_id TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS {table_name}_index_1 ON {table_name} (dataset, term_id, qseqid);
+                    CREATE INDEX IF NOT EXISTS {table_name}_index_2 ON {table_name} (dataset, qseqid, term_id);
+                    '''
+        try:
+            conn.executescript(sentence)
+        except Exception as e:
+            raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def delete_annotation_results(conn, dataset):
+    '''
+    Delete the rows of a dataset from the tables of the annotation results database.
+    '''
+
+    for table_name in ['annotation_results_files', 'annotation_hits'] + list(get_annotation_term_column_dict()):
+        sentence = f'''
+                    DELETE FROM {table_name}
+                        WHERE dataset = '{dataset}';
+                    '''
+        try:
+            conn.execute(sentence)
+        except Exception as e:
+            raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def insert_annotation_hit_rows(conn, dataset, hit_row_list, term_row_list_dict):
+    '''
+    Insert rows into the table "annotation_hits" (hit identification followed by the columns
+    of the functional annotation file) and into the tables of the terms (hit identification,
+    sequence identification and term identification) of a dataset.
+    '''
+
+    # insert the hit rows
+    column_list = genlib.get_functional_annotation_head().split(';')
+    sentence = f'''
+                INSERT INTO annotation_hits (dataset, hit_id, {', '.join(column_list)})
+                    VALUES ('{dataset}', {', '.join(['?'] * (len(column_list) + 1))});
+                '''
+    try:
+        conn.executemany(sentence, hit_row_list)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # insert the term rows
+    for table_name, term_row_list in term_row_list_dict.items():
+        sentence = f'''
+                    INSERT INTO {table_name} (dataset, hit_id, qseqid, term_id)
+                        VALUES ('{dataset}', ?, ?, ?);
+                    '''
+        try:
+            conn.executemany(sentence, term_row_list)
+        except Exception as e:
+            raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_results_file_data(annotation_file):
+    '''
+    Get the data that identify a version of a functional annotation file: its normalized path,
+    its size and its modification time in nanoseconds.
+    '''
+
+    try:
+        stat_result = os.stat(annotation_file)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'F001', annotation_file) from e
+
+    return os.path.realpath(annotation_file), stat_result.st_size, stat_result.st_mtime_ns
+
+#-------------------------------------------------------------------------------
+
+def insert_annotation_results_file(conn, dataset, annotation_file):
+    '''
+    Insert the data of the functional annotation file loaded in a dataset into the table
+    "annotation_results_files".
+    '''
+
+    (file_path, file_size, file_mtime) = get_annotation_results_file_data(annotation_file)
+    sentence = '''
+               INSERT INTO annotation_results_files (dataset, file_name, file_size, file_path, file_mtime)
+                   VALUES (?, ?, ?, ?, ?);
+               '''
+    try:
+        conn.execute(sentence, (dataset, os.path.basename(annotation_file), file_size, file_path, file_mtime))
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_results_dataset(conn, annotation_file):
+    '''
+    Get the dataset of the annotation results database loaded from a functional annotation
+    file; an empty string is returned when the file is not loaded or it has been changed.
+    '''
+
+    # initialize the dataset
+    dataset = ''
+
+    # check if the table "annotation_results_files" exists with the columns of the file path and modification time
+    if 'file_mtime' not in get_table_column_list(conn, 'annotation_results_files'):
+        return dataset
+
+    # select the row of the file from the table "annotation_results_files"
+    (file_path, file_size, file_mtime) = get_annotation_results_file_data(annotation_file)
+    sentence = '''
+               SELECT dataset, file_size, file_mtime
+                   FROM annotation_results_files
+                   WHERE file_path = ?;
+               '''
+    try:
+        rows = conn.execute(sentence, (file_path,))
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # get the dataset when the file size and modification time have not been changed
+    for row in rows:
+        if row[1] == file_size and row[2] == file_mtime:
+            dataset = row[0]
+
+    # return the dataset
+    return dataset
+
+#-------------------------------------------------------------------------------
+
+def connect_annotation_results_db(annotation_results_db, annotation_file):
+    '''
+    Connect to the annotation results database and get the dataset where the annotation
+    file is loaded (an empty string when the database is not indicated or the file is not loaded).
+    '''
+
+    # initialize the connection and the dataset
+    annotation_results_conn = None
+    dataset = ''
+
+    # get the dataset where the annotation file is loaded
+    if annotation_results_db is not None:
+        annotation_results_conn = connect_database(annotation_results_db, read_only=True)
+        dataset = get_annotation_results_dataset(annotation_results_conn, annotation_file)
+        if dataset == '':
+            genlib.Message.print('info', f'The file {annotation_file} is not loaded in the database {annotation_results_db}, so it is read.')
+
+    # return the connection and the dataset
+    return annotation_results_conn, dataset
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_hit_data_dicts(conn, dataset, column_list):
+    '''
+    Get the data dictionaries with the columns of a column list of the hits of a dataset
+    from the table "annotation_hits" in the order of the functional annotation file.
+    '''
+
+    # select rows from the table "annotation_hits"
+    sentence = f'''
+                SELECT {', '.join(column_list)}
+                    FROM annotation_hits
+                    WHERE dataset = '{dataset}'
+                    ORDER BY hit_id;
+                '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # yield the data dictionary of every row
+    for row in rows:
+        yield dict(zip(column_list, row))
+
+#-------------------------------------------------------------------------------
+
+def read_annotation_hit_record(hit_data_dict_iterator):
+    '''
+    Read the next hit of an iterator of hit data dictionaries (with the columns "qseqid" and
+    "sseqid" at least) of the annotation results database returning the same data as
+    genlib.read_functional_annotation_record.
+    '''
+
+    # get the next hit data dictionary
+    data_dict = next(hit_data_dict_iterator, None)
+
+    # if there is not hit
+    if data_dict is None:
+        return '', bytes.fromhex('7E').decode('utf-8'), {}
+
+    # return the record, key and data dictionary
+    return ';'.join(data_dict.values()), f'{data_dict["qseqid"]}-{data_dict["sseqid"]}', data_dict
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_term_seqnum_dict(conn, dataset, table_name):
+    '''
+    Get a dictionary with the number of sequences with every term from a term table of
+    the annotation results database and the number of sequences with any term.
+    '''
+
+    # initialize the dictionary
+    term_seqnum_dict = {}
+
+    # select the number of sequences per term
+    sentence = f'''
+                SELECT term_id, COUNT(DISTINCT qseqid)
+                    FROM {table_name}
+                    WHERE dataset = '{dataset}'
+                    GROUP BY term_id;
+                '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # add row data to the dictionary
+    for row in rows:
+        term_seqnum_dict[row[0]] = row[1]
+
+    # select the number of sequences with any term
+    sentence = f'''
+                SELECT COUNT(DISTINCT qseqid)
+                    FROM {table_name}
+                    WHERE dataset = '{dataset}';
+                '''
+    try:
+        seqnum = conn.execute(sentence).fetchone()[0]
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # return the dictionary and the number of sequences with any term
+    return term_seqnum_dict, seqnum
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_seq_term_dict(conn, dataset, table_name):
+    '''
+    Get a dictionary with the set of terms of every sequence from a term table of the
+    annotation results database.
+    '''
+
+    # initialize the dictionary
+    seq_term_dict = {}
+
+    # select the distinct terms of every sequence
+    sentence = f'''
+                SELECT DISTINCT qseqid, term_id
+                    FROM {table_name}
+                    WHERE dataset = '{dataset}';
+                '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # add row data to the dictionary
+    for row in rows:
+        seq_term_dict.setdefault(row[0], set()).add(row[1])
+
+    # return the dictionary
+    return seq_term_dict
+
+#-------------------------------------------------------------------------------
+# table "go_ontology"
+#-------------------------------------------------------------------------------
+
+def get_go_ontology_dict(conn, goterm_id_list):
+    '''
+    Get a dictionary of ontology from the table "go_ontology".
+    '''
+
+    # initialize the ontology dictionary
+    go_onlology_dict = {}
+
+    # select rows from the table "go_ontology"
+    if goterm_id_list == []:
+        sentence = '''
+                   SELECT DISTINCT go_id, go_name, namespace
+                       FROM go_ontology;
+                   '''
+        parameters = ()
+    else:
+        sentence = '''
+                   SELECT DISTINCT go_id, go_name, namespace
+                       FROM go_ontology
+                       WHERE go_id in (SELECT value FROM json_each(?));
+                   '''
+        parameters = (json.dumps(list(goterm_id_list)),)
+    try:
+        rows = conn.execute(sentence, parameters)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # add ontology data to the dictionary
+    for row in rows:
+        go_onlology_dict[row[0]] = {'goterm_id':row[0], 'goterm_name':row[1], 'namespace':row[2]}
+
+    # return the ontology dictionary
+    return go_onlology_dict
+
+#-------------------------------------------------------------------------------
+# table "species_gene_seqs"
+#-------------------------------------------------------------------------------
+
+def get_gene_seq_dict(conn, gene_id):
+    '''
+    Get the sequence corresponding to a gene identification.
+    '''
+
+    # select rows from the table "species_gene_seqs"
+    sentence = f'''
+                SELECT species_id, seq
+                    FROM species_gene_seqs
+                    WHERE gene_id = '{gene_id}';
+                '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # get the gene data
+    for row in rows:
+        gene_seq_dict = {'species_id': row[0], 'seq': row[1]}
+        break
 
     # return the gene data
     return gene_seq_dict
 
+#-------------------------------------------------------------------------------
+
+def get_gene_seq_dict_many(conn, gene_id_list):
+    '''
+    Get the sequences corresponding to a gene identification list as a dictionary keyed by
+    gene identification.
+    '''
+
+    # initialize the dictionary
+    gene_seq_per_gene_dict = {}
+
+    # select rows from the table "species_gene_seqs"
+    sentence = '''
+               SELECT gene_id, species_id, seq
+                   FROM species_gene_seqs
+                   WHERE gene_id IN (SELECT value FROM json_each(?));
+               '''
+
+    # add the first sequence of each gene to the dictionary
+    for row in select_rows_by_ids(conn, sentence, gene_id_list):
+        if row[0] not in gene_seq_per_gene_dict:
+            gene_seq_per_gene_dict[row[0]] = {'species_id': row[1], 'seq': row[2]}
+
+    # return the dictionary
+    return gene_seq_per_gene_dict
+
 #-------------------------------------------------------------------------------
 # table "species_protein_seqs"
 #-------------------------------------------------------------------------------
@@ -551,6 +1820,32 @@ def get_protein_seq_dict(conn, protein_id):
     # return the protein data
     return protein_seq_dict
 
+#-------------------------------------------------------------------------------
+
+def get_protein_seq_dict_many(conn, protein_id_list):
+    '''
+    Get the sequences corresponding to a protein identification list as a dictionary keyed by
+    protein identification.
+    '''
+
+    # initialize the dictionary
+    protein_seq_per_protein_dict = {}
+
+    # select rows from the table "species_protein_seqs"
+    sentence = '''
+               SELECT protein_id, species_id, seq
+                   FROM species_protein_seqs
+                   WHERE protein_id IN (SELECT value FROM json_each(?));
+               '''
+
+    # add the first sequence of each protein to the dictionary
+    for row in select_rows_by_ids(conn, sentence, protein_id_list):
+        if row[0] not in protein_seq_per_protein_dict:
+            protein_seq_per_protein_dict[row[0]] = {'species_id': row[1], 'seq': row[2]}
+
+    # return the dictionary
+    return protein_seq_per_protein_dict
+
 #-------------------------------------------------------------------------------
 # table "liftoff_homologous_proteins"
 #-------------------------------------------------------------------------------
@@ -561,20 +1856,17 @@ def get_liftoff_homologous_proteins_list(conn, reference_protein_ids_list):
     list from the table "liftoff_homologous_proteins".
     '''
 
-    # get text literals of reference protein identifications with simple quote and separated by comma
-    reference_protein_ids_list_text = genlib.join_text_list_to_literal(reference_protein_ids_list)
-
     # initialize the list
     liftoff_homologous_proteins_list = []
 
-    # select rows from the table "liftoff_gff_gene_data"
-    sentence = f'''
-                SELECT target_species_id, target_protein_id
-                    FROM liftoff_homologous_proteins
-                    WHERE reference_protein_id in ({reference_protein_ids_list_text});
-                '''
+    # select rows from the table "liftoff_gff_gene_data" (the reference protein identifications are bound as a JSON array)
+    sentence = '''
+               SELECT target_species_id, target_protein_id
+                   FROM liftoff_homologous_proteins
+                   WHERE reference_protein_id in (SELECT value FROM json_each(?));
+               '''
     try:
-        rows = conn.execute(sentence)
+        rows = conn.execute(sentence, (json.dumps(list(reference_protein_ids_list)),))
     except Exception as e:
         raise genlib.ProgramException(e, 'B002', sentence, conn)
 
@@ -595,21 +1887,18 @@ def get_mmseqs2_protein_isoforms_list(conn, species_id, protein_ids_list):
     "mmseqs2_concatenated_cds_clusters".
     '''
 
-    # get text literals of protein identifications with simple quote and separated by comma
-    protein_ids_list_text = genlib.join_text_list_to_literal(protein_ids_list)
-
     # initialize the list
     protein_isoforms_list = []
 
-    # select rows from the table "mmseqs2_concatenated_cds_clusters"
+    # select rows from the table "mmseqs2_concatenated_cds_clusters" (the protein identifications are bound as a JSON array)
     if species_id == '':
-        sentence = f'''
-                    SELECT species_id, cluster_id, gene_id, protein_id
-                        FROM mmseqs2_concatenated_cds_clusters
-                        WHERE gene_id IN (SELECT gene_id
-                                            FROM mmseqs2_concatenated_cds_clusters
-                                            WHERE protein_id in ({protein_ids_list_text}));
-                    '''
+        sentence = '''
+                   SELECT species_id, cluster_id, gene_id, protein_id
+                       FROM mmseqs2_concatenated_cds_clusters
+                       WHERE gene_id IN (SELECT gene_id
+                                           FROM mmseqs2_concatenated_cds_clusters
+                                           WHERE protein_id in (SELECT value FROM json_each(?)));
+                   '''
     else:
         sentence = f'''
                     SELECT species_id, cluster_id, gene_id, protein_id
@@ -618,10 +1907,10 @@ def get_mmseqs2_protein_isoforms_list(conn, species_id, protein_ids_list):
                           AND gene_id IN (SELECT gene_id
                                             FROM mmseqs2_concatenated_cds_clusters
                                             WHERE species_id = '{species_id}'
-                                              AND protein_id in ({protein_ids_list_text}));
+                                              AND protein_id in (SELECT value FROM json_each(?)));
                     '''
     try:
-        rows = conn.execute(sentence)
+        rows = conn.execute(sentence, (json.dumps(list(protein_ids_list)),))
     except Exception as e:
         raise genlib.ProgramException(e, 'B002', sentence, conn)
 
@@ -661,6 +1950,31 @@ def get_mmseqs2_protein_data_dict(conn, protein_id):
     # return the dictionary
     return protein_data_dict
 
+#-------------------------------------------------------------------------------
+
+def get_mmseqs2_protein_data_dict_many(conn, protein_id_list):
+    '''
+    Get the protein data dictionary corresponding to a protein identification list from the table
+    "mmseqs2_concatenated_cds_clusters" as a dictionary keyed by protein identification.
+    '''
+
+    # initialize the dictionary
+    protein_data_per_protein_dict = {}
+
+    # select rows from the table "mmseqs2_concatenated_cds_clusters"
+    sentence = '''
+               SELECT protein_id, species_id, cluster_id, seq_id, gene_id
+                   FROM mmseqs2_concatenated_cds_clusters
+                   WHERE protein_id IN (SELECT value FROM json_each(?));
+               '''
+
+    # add row data to the dictionary (the last row of each protein is considered)
+    for row in select_rows_by_ids(conn, sentence, protein_id_list):
+        protein_data_per_protein_dict[row[0]] = {'species_id': row[1], 'cluster_id': row[2], 'seq_id': row[3], 'gene_id': row[4]}
+
+    # return the dictionary
+    return protein_data_per_protein_dict
+
 #-------------------------------------------------------------------------------
 # table "xxx"
 #-------------------------------------------------------------------------------
@@ -695,6 +2009,290 @@ def get_orthologous_protein_data_list(conn, reference_protein_id):
 
 #-------------------------------------------------------------------------------
 
+def get_protein_homology_graph_dict_many(conn, reference_protein_id_list):
+    '''
+    Get the homology graph of each protein identification of a list, i.e. the list of its protein
+    isoforms from the table "mmseqs2_concatenated_cds_clusters" where each isoform has the list of
+    the data of its orthologous proteins from the tables "liftoff_homologous_proteins" and
+    "mmseqs2_concatenated_cds_clusters", with one query as a dictionary keyed by protein identification.
+    '''
+
+    # initialize the dictionary
+    homology_graph_per_protein_dict = {}
+
+    # select rows expanding the protein isoforms of the gene of each protein and their Liftoff orthologous proteins
+    # (the rows are sorted by isoform and ortholog order in the tables; the isoforms without orthologous proteins have a row with nulls)
+    sentence = '''
+               WITH reference_genes AS (
+                   SELECT DISTINCT p.value AS reference_protein_id, b.gene_id
+                       FROM json_each(?) p
+                       CROSS JOIN mmseqs2_concatenated_cds_clusters b
+                       WHERE b.protein_id = p.value
+               ),
+               protein_isoforms AS (
+                   SELECT r.reference_protein_id, a.rowid AS isoform_order, a.species_id, a.cluster_id, a.gene_id, a.protein_id
+                       FROM reference_genes r
+                       JOIN mmseqs2_concatenated_cds_clusters a ON a.gene_id = r.gene_id
+               )
+               SELECT i.reference_protein_id, i.isoform_order, i.species_id, i.cluster_id, i.gene_id, i.protein_id, l.reference_species_id, l.target_species_id, t.protein_id, t.cluster_id, t.gene_id
+                   FROM protein_isoforms i
+                   LEFT JOIN liftoff_homologous_proteins l ON l.reference_protein_id = i.protein_id
+                   LEFT JOIN mmseqs2_concatenated_cds_clusters t ON t.protein_id = l.target_protein_id
+                   ORDER BY i.reference_protein_id, i.isoform_order, l.rowid, t.rowid;
+               '''
+
+    # add row data to the dictionary
+    isoform_data_dict = {}
+    for row in select_rows_by_ids(conn, sentence, reference_protein_id_list):
+
+        # add the protein isoform to the homology graph of the protein
+        isoform_key = (row[0], row[1])
+        if isoform_key not in isoform_data_dict:
+            isoform_data_dict[isoform_key] = {'species_id': row[2], 'cluster_id': row[3], 'gene_id': row[4], 'protein_id': row[5], 'orthologous_protein_data_list': []}
+            homology_graph_per_protein_dict.setdefault(row[0], []).append(isoform_data_dict[isoform_key])
+
+        # add the orthologous protein to the protein isoform when it is in the table "mmseqs2_concatenated_cds_clusters"
+        if row[8] is not None:
+            isoform_data_dict[isoform_key]['orthologous_protein_data_list'].append({'reference_species_id': row[6], 'reference_protein_id': row[5], 'target_species_id': row[7], 'target_protein_id': row[8], 'cluster_id': row[9], 'gene_id': row[10]})
+
+    # return the dictionary
+    return homology_graph_per_protein_dict
+
+#-------------------------------------------------------------------------------
+# index verification
+#-------------------------------------------------------------------------------
+
+def get_query_check_list():
+    '''
+    Get the list of the lookups of this module to be checked with EXPLAIN QUERY PLAN. Each item
+    has the function name, a sentence with the shape of its query and the indexes (table, key
+    columns and covered columns) that avoid a full scan of its tables and, optionally, the small
+    tables whose full scan is expected.
+    '''
+
+    # set the query of the clusters of a species in one line
+    species_cluster_ids_query = ' '.join(build_species_cluster_ids_query('', True).split())
+
+    query_check_list = [
+        {'function': 'get_interproscan_annotation_dict',
+         'sentence': "SELECT cluster_id, interpro_goterms, panther_goterms, x_goterms, metacyc_pathways, reactome_pathways, x_pathways FROM interproscan_annotations WHERE cluster_id = '';",
+         'index_list': [('interproscan_annotations', ['cluster_id'], [])]},
+        {'function': 'get_emapper_annotation_dict',
+         'sentence': "SELECT cluster_id, ortholog_seq_id, ortholog_species, eggnog_ogs, cog_category, description, goterms, ec, kegg_kos, kegg_pathways FROM emapper_annotations WHERE cluster_id = '';",
+         'index_list': [('emapper_annotations', ['cluster_id'], [])]},
+        {'function': 'get_metacyc_pathways_per_cluster_dict',
+         'sentence': f"SELECT cluster_id, metacyc_pathways FROM interproscan_annotations WHERE cluster_id in ({species_cluster_ids_query});",
+         'index_list': [('interproscan_annotations', ['cluster_id'], ['metacyc_pathways']), ('cluster_species', ['species_id', 'cluster_id'], [])],
+         'scanned_table_list': ['cluster_species_names']},
+        {'function': 'get_kegg_kos_per_cluster_dict',
+         'sentence': f"SELECT cluster_id, kegg_kos FROM emapper_annotations WHERE cluster_id in ({species_cluster_ids_query});",
+         'index_list': [('emapper_annotations', ['cluster_id'], ['kegg_kos']), ('cluster_species', ['species_id', 'cluster_id'], [])],
+         'scanned_table_list': ['cluster_species_names']},
+        {'function': 'get_kegg_pathways_per_cluster_dict',
+         'sentence': f"SELECT cluster_id, kegg_pathways FROM emapper_annotations WHERE cluster_id in ({species_cluster_ids_query});",
+         'index_list': [('emapper_annotations', ['cluster_id'], ['kegg_pathways']), ('cluster_species', ['species_id', 'cluster_id'], [])],
+         'scanned_table_list': ['cluster_species_names']},
+        {'function': 'get_goterms_per_cluster_dict',
+         'sentence': f"WITH cluster_identifications AS ({species_cluster_ids_query}) SELECT a.cluster_id, b.interpro_goterms, b.panther_goterms, c.goterms FROM cluster_identifications a LEFT JOIN interproscan_annotations b USING (cluster_id) LEFT JOIN emapper_annotations c USING (cluster_id);",
+         'index_list': [('interproscan_annotations', ['cluster_id'], []), ('emapper_annotations', ['cluster_id'], []), ('cluster_species', ['species_id', 'cluster_id'], [])],
+         'scanned_table_list': ['cluster_species_names']},
+        {'function': 'get_mmseqs2_protein_clusters_dict',
+         'sentence': "SELECT cluster_id, seq_id, description, species FROM mmseqs2_protein_clusters WHERE cluster_id = '';",
+         'index_list': [('mmseqs2_protein_clusters', ['cluster_id'], ['seq_id', 'description', 'species'])]},
+        {'function': 'get_mmseqs2_protein_clusters_dict_many',
+         'sentence': "SELECT cluster_id, seq_id, description, species FROM mmseqs2_protein_clusters WHERE cluster_id IN (SELECT value FROM json_each('[]'));",
+         'scanned_table_list': ['json_each'],
+         'index_list': [('mmseqs2_protein_clusters', ['cluster_id'], ['seq_id', 'description', 'species'])]},
+        {'function': 'get_mmseqs2_seq_mf_data',
+         'sentence': "SELECT description, species FROM mmseqs2_protein_clusters WHERE cluster_id = '';",
+         'index_list': [('mmseqs2_protein_clusters', ['cluster_id'], ['seq_id', 'description', 'species'])]},
+        {'function': 'get_tair10_peptide_description',
+         'sentence': "SELECT description FROM tair10_info where tair10_peptide_id = '';",
+         'index_list': [('tair10_info', ['tair10_peptide_id'], ['description'])]},
+        {'function': 'get_tair10_ortholog_seq_id',
+         'sentence': "SELECT ortholog_seq_id FROM tair10_orthologs where cluster_id = '';",
+         'index_list': [('tair10_orthologs', ['cluster_id'], ['ortholog_seq_id'])]},
+        {'function': 'get_cluster_annotation_summary_dict',
+         'sentence': f"SELECT {get_cluster_annotation_summary_columns_text('s')} FROM cluster_annotation_summary s WHERE s.cluster_id = '';",
+         'index_list': [('cluster_annotation_summary', ['cluster_id'], [])]},
+        {'function': 'get_go_ontology_dict',
+         'sentence': "SELECT DISTINCT go_id, go_name, namespace FROM go_ontology WHERE go_id in ('', '');",
+         'index_list': [('go_ontology', ['go_id'], ['go_name', 'namespace'])]},
+        {'function': 'get_gene_seq_dict',
+         'sentence': "SELECT species_id, seq FROM species_gene_seqs WHERE gene_id = '';",
+         'index_list': [('species_gene_seqs', ['gene_id'], [])]},
+        {'function': 'get_protein_seq_dict',
+         'sentence': "SELECT species_id, seq FROM species_protein_seqs WHERE protein_id = '';",
+         'index_list': [('species_protein_seqs', ['protein_id'], [])]},
+        {'function': 'get_gene_seq_dict_many',
+         'sentence': "SELECT gene_id, species_id, seq FROM species_gene_seqs WHERE gene_id IN (SELECT value FROM json_each('[]'));",
+         'scanned_table_list': ['json_each'],
+         'index_list': [('species_gene_seqs', ['gene_id'], [])]},
+        {'function': 'get_protein_seq_dict_many',
+         'sentence': "SELECT protein_id, species_id, seq FROM species_protein_seqs WHERE protein_id IN (SELECT value FROM json_each('[]'));",
+         'scanned_table_list': ['json_each'],
+         'index_list': [('species_protein_seqs', ['protein_id'], [])]},
+        {'function': 'get_liftoff_homologous_proteins_list',
+         'sentence': "SELECT target_species_id, target_protein_id FROM liftoff_homologous_proteins WHERE reference_protein_id in ('', '');",
+         'index_list': [('liftoff_homologous_proteins', ['reference_protein_id'], ['target_species_id', 'target_protein_id'])]},
+        {'function': 'get_mmseqs2_protein_isoforms_list',
+         'sentence': "SELECT species_id, cluster_id, gene_id, protein_id FROM mmseqs2_concatenated_cds_clusters WHERE gene_id IN (SELECT gene_id FROM mmseqs2_concatenated_cds_clusters WHERE protein_id in ('', ''));",
+         'index_list': [('mmseqs2_concatenated_cds_clusters', ['protein_id'], ['species_id', 'cluster_id', 'seq_id', 'gene_id']), ('mmseqs2_concatenated_cds_clusters', ['gene_id'], ['species_id', 'cluster_id', 'protein_id'])]},
+        {'function': 'get_mmseqs2_protein_isoforms_list (species)',
+         'sentence': "SELECT species_id, cluster_id, gene_id, protein_id FROM mmseqs2_concatenated_cds_clusters WHERE species_id = '' AND gene_id IN (SELECT gene_id FROM mmseqs2_concatenated_cds_clusters WHERE species_id = '' AND protein_id in ('', ''));",
+         'index_list': [('mmseqs2_concatenated_cds_clusters', ['protein_id'], ['species_id', 'cluster_id', 'seq_id', 'gene_id']), ('mmseqs2_concatenated_cds_clusters', ['gene_id'], ['species_id', 'cluster_id', 'protein_id'])]},
+        {'function': 'get_mmseqs2_protein_data_dict',
+         'sentence': "SELECT species_id, cluster_id, seq_id, gene_id FROM mmseqs2_concatenated_cds_clusters WHERE protein_id = '';",
+         'index_list': [('mmseqs2_concatenated_cds_clusters', ['protein_id'], ['species_id', 'cluster_id', 'seq_id', 'gene_id'])]},
+        {'function': 'get_mmseqs2_protein_data_dict_many',
+         'sentence': "SELECT protein_id, species_id, cluster_id, seq_id, gene_id FROM mmseqs2_concatenated_cds_clusters WHERE protein_id IN (SELECT value FROM json_each('[]'));",
+         'scanned_table_list': ['json_each'],
+         'index_list': [('mmseqs2_concatenated_cds_clusters', ['protein_id'], ['species_id', 'cluster_id', 'seq_id', 'gene_id'])]},
+        {'function': 'get_orthologous_protein_data_list',
+         'sentence': "SELECT a.reference_species_id, a.reference_protein_id, a.target_species_id, a.target_protein_id, b.cluster_id, b.gene_id FROM liftoff_homologous_proteins a JOIN mmseqs2_concatenated_cds_clusters b ON a.target_protein_id = b.protein_id WHERE reference_protein_id = '';",
+         'index_list': [('liftoff_homologous_proteins', ['reference_protein_id'], ['target_species_id', 'target_protein_id']), ('mmseqs2_concatenated_cds_clusters', ['protein_id'], ['species_id', 'cluster_id', 'seq_id', 'gene_id'])]},
+        {'function': 'get_protein_homology_graph_dict_many',
+         'sentence': "WITH reference_genes AS (SELECT DISTINCT p.value AS reference_protein_id, b.gene_id FROM json_each('[]') p CROSS JOIN mmseqs2_concatenated_cds_clusters b WHERE b.protein_id = p.value), protein_isoforms AS (SELECT r.reference_protein_id, a.rowid AS isoform_order, a.species_id, a.cluster_id, a.gene_id, a.protein_id FROM reference_genes r JOIN mmseqs2_concatenated_cds_clusters a ON a.gene_id = r.gene_id) SELECT i.reference_protein_id, i.isoform_order, i.species_id, i.cluster_id, i.gene_id, i.protein_id, l.reference_species_id, l.target_species_id, t.protein_id, t.cluster_id, t.gene_id FROM protein_isoforms i LEFT JOIN liftoff_homologous_proteins l ON l.reference_protein_id = i.protein_id LEFT JOIN mmseqs2_concatenated_cds_clusters t ON t.protein_id = l.target_protein_id ORDER BY i.reference_protein_id, i.isoform_order, l.rowid, t.rowid;",
+         'scanned_table_list': ['json_each'],
+         'index_list': [('mmseqs2_concatenated_cds_clusters', ['protein_id'], ['species_id', 'cluster_id', 'seq_id', 'gene_id']), ('mmseqs2_concatenated_cds_clusters', ['gene_id'], ['species_id', 'cluster_id', 'protein_id']), ('liftoff_homologous_proteins', ['reference_protein_id'], ['target_species_id', 'target_protein_id'])]},
+    ]
+
+    # return the query check list
+    return query_check_list
+
+#-------------------------------------------------------------------------------
+
+def get_query_check_table_dict(query_check):
+    '''
+    Get the dictionary of the tables read by the query of a query check by their name or alias
+    in the sentence (the common table expressions and the tables whose full scan is expected are
+    not included).
+    '''
+
+    # initialize the table dictionary with the tables of the indexes
+    table_dict = {table_name: table_name for (table_name, _, _) in query_check['index_list']}
+
+    # get the names of the common table expressions
+    cte_name_list = re.findall(r'(\w+)\s+AS\s+\(', query_check['sentence'], flags=re.IGNORECASE)
+
+    # add the tables of the sentence
+    for (table_name, alias) in re.findall(r'(?:FROM|JOIN)\s+(\w+)(?:\s+(?!(?:WHERE|LEFT|JOIN|ON|USING)\b)(\w+))?', query_check['sentence'], flags=re.IGNORECASE):
+        if table_name not in cte_name_list and table_name not in query_check.get('scanned_table_list', []):
+            table_dict[table_name] = table_name
+            if alias != '':
+                table_dict[alias] = table_name
+
+    # return the table dictionary
+    return table_dict
+
+#-------------------------------------------------------------------------------
+
+def get_query_plan_list(conn, sentence):
+    '''
+    Get the detail list of the query plan of a sentence.
+    '''
+
+    # get the query plan
+    explain_sentence = f'EXPLAIN QUERY PLAN {sentence}'
+    try:
+        rows = conn.execute(explain_sentence)
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', explain_sentence, conn)
+
+    # return the detail list
+    return [row[3] for row in rows]
+
+#-------------------------------------------------------------------------------
+
+def get_full_scan_list(query_plan_list, table_dict):
+    '''
+    Get the full scans of tables of a query plan using the dictionary of the tables by their
+    name or alias.
+    '''
+
+    return [detail for detail in query_plan_list if detail.startswith('SCAN ') and detail.split()[1] in table_dict]
+
+#-------------------------------------------------------------------------------
+
+def check_index_exists(conn, table_name, key_column_list):
+    '''
+    Check if a table has an index whose first columns are the key columns.
+    '''
+
+    # initialize the control variable
+    OK = False
+
+    # get the indexes of the table
+    sentence = f'PRAGMA index_list({table_name});'
+    try:
+        index_row_list = conn.execute(sentence).fetchall()
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # check the first columns of each index
+    for index_row in index_row_list:
+        sentence = f"PRAGMA index_info('{index_row[1]}');"
+        try:
+            column_list = [row[2] for row in sorted(conn.execute(sentence).fetchall())]
+        except Exception as e:
+            raise genlib.ProgramException(e, 'B002', sentence, conn)
+        if column_list[:len(key_column_list)] == key_column_list:
+            OK = True
+            break
+
+    # return the control variable
+    return OK
+
+#-------------------------------------------------------------------------------
+
+def create_covering_index(conn, table_name, key_column_list, covered_column_list):
+    '''
+    Create an index of a table with the key columns followed by the covered columns
+    that exist in the table. Return the index name.
+    '''
+
+    # get the columns of the table
+    sentence = f'PRAGMA table_info({table_name});'
+    try:
+        table_column_list = [row[1] for row in conn.execute(sentence)]
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # set the index columns
+    column_list = key_column_list + [column for column in covered_column_list if column in table_column_list and column not in key_column_list]
+
+    # create the index
+    index_name = f'{table_name}_{"_".join(key_column_list)}_index'
+    sentence = f'''
+                CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(column_list)});
+                '''
+    try:
+        conn.execute(sentence)
+        conn.commit()
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+    # return the index name
+    return index_name
+
+#-------------------------------------------------------------------------------
+
+def analyze_database(conn):
+    '''
+    Gather the statistics of the tables and indexes used by the query planner.
+    '''
+
+    sentence = '''
+               ANALYZE;
+               '''
+    try:
+        conn.execute(sentence)
+        conn.commit()
+    except Exception as e:
+        raise genlib.ProgramException(e, 'B002', sentence, conn)
+
+#-------------------------------------------------------------------------------
+
 if __name__ == '__main__':
     print('This source contains general functions for the maintenance of the TOA SQLite database in both console mode and gui mode.')
     sys.exit(0)
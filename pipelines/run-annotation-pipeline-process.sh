@@ -315,6 +315,8 @@ function concat_functional_annotations
             --transcripts_geneid=$TEMP/transcripts-geneid.csv \
             --complete_annotations=$ANNOTATION_DIR/functional-annotations-complete.csv \
             --besthit_annotations=$ANNOTATION_DIR/functional-annotations-besthit.csv \
+            --annotations-db=$ANNOTATION_DIR/annotations.db \
+            --threads=$THREADS \
             --verbose=N \
             --trace=N
     RC=$?
@@ -325,53 +327,6 @@ function concat_functional_annotations
 
 #-------------------------------------------------------------------------------
 
-function sort_functional_annotations
-{
-    echo "$SEP"
-    echo "Sorting functional annotations files ..."
-    cd $ANNOTATION_DIR
-    /usr/bin/time \
-        sort \
-            --output=$ANNOTATION_DIR/functional-annotations-complete.csv \
-            $ANNOTATION_DIR/functional-annotations-complete.csv
-    RC=$?
-    if [ $RC -ne 0 ]; then manage_error sort $RC; fi
-    /usr/bin/time \
-        sort \
-            --output=$ANNOTATION_DIR/functional-annotations-besthit.csv \
-            $ANNOTATION_DIR/functional-annotations-besthit.csv
-    RC=$?
-    if [ $RC -ne 0 ]; then manage_error sort $RC; fi
-    echo "Files are sorted."
-}
-
-#-------------------------------------------------------------------------------
-
-function add_heads
-{
-
-    echo "$SEP"
-    echo "Adding head to annotations files ..."
-    cd $ANNOTATION_DIR
-    /usr/bin/time \
-        sed \
-            --in-place \
-            "1i qseqid;sseqid;pident;length;mismatch;gapopen;qstart;qend;sstart;send;evalue;bitscore;algorithm;protein_description;protein_species;tair10_ortholog_seq_id;tair10_description;qlobata_gene_id;interpro_goterms;panther_goterms;metacyc_pathways;eggnog_ortholog_seq_id;eggnog_ortholog_species;eggnog_ogs;cog_category;eggnog_description;eggnog_goterms;ec;kegg_kos;kegg_pathways;kegg_modules;kegg_reactions;kegg_rclasses;brite;kegg_tc;cazy;pfams" \
-            ./functional-annotations-complete.csv
-    RC=$?
-    if [ $RC -ne 0 ]; then manage_error sed $RC; fi
-    /usr/bin/time \
-        sed \
-            --in-place \
-            "1i qseqid;sseqid;pident;length;mismatch;gapopen;qstart;qend;sstart;send;evalue;bitscore;algorithm;protein_description;protein_species;tair10_ortholog_seq_id;tair10_description;qlobata_gene_id;interpro_goterms;panther_goterms;metacyc_pathways;eggnog_ortholog_seq_id;eggnog_ortholog_species;eggnog_ogs;cog_category;eggnog_description;eggnog_goterms;ec;kegg_kos;kegg_pathways;kegg_modules;kegg_reactions;kegg_rclasses;brite;kegg_tc;cazy;pfams" \
-            ./functional-annotations-besthit.csv
-    RC=$?
-    if [ $RC -ne 0 ]; then manage_error sed $RC; fi
-    echo "Heads are added."
-}
-
-#-------------------------------------------------------------------------------
-
 function calculate_functional_annotation_stats
 {
     echo "$SEP"
@@ -382,6 +337,7 @@ function calculate_functional_annotation_stats
         $QUERCUSTOA_APP_DIR/calculate-functional-annotation-stats.py \
             --db=$QUERCUSTOA_DB_DIR/functional-annotations.db \
             --annotations=$ANNOTATION_DIR/functional-annotations-complete.csv \
+            --annotations-db=$ANNOTATION_DIR/annotations.db \
             --outdir=$ANNOTATION_DIR \
             --verbose=N \
             --trace=N
@@ -402,6 +358,7 @@ function build_external_inputs
     /usr/bin/time \
         $QUERCUSTOA_APP_DIR/build-external-inputs.py \
             --annotations=./functional-annotations-complete.csv \
+            --annotations-db=./annotations.db \
             --outdir=$ANNOTATION_DIR \
             --verbose=N \
             --trace=N
@@ -458,8 +415,6 @@ align_transcriptome_2_blastplus_lncrna_db
 align_transcriptome_2_qlobata_genes
 get_transcripts_geneid
 concat_functional_annotations
-sort_functional_annotations
-add_heads
 calculate_functional_annotation_stats
 build_external_inputs
 end